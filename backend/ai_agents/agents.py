@@ -2,12 +2,12 @@ import os
 import json
 import numpy as np
 import faiss
-from math import radians, sin, cos, sqrt, atan2
 from sentence_transformers import SentenceTransformer
 from PIL import Image
 import pytesseract
 import google.generativeai as genai
 from groq import Groq
+from ai_agents.distance import haversine_many
 
 # Initialize Clients
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
@@ -20,13 +20,17 @@ emb = embedding_model.encode(docs)
 index = faiss.IndexFlatL2(len(emb[0]))
 index.add(np.array(emb))
 
-def haversine(lat1, lon1, lat2, lon2):
-    R = 6371
-    dlat = radians(lat2 - lat1)
-    dlon = radians(lon2 - lon1)
-    a = sin(dlat/2)**2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon/2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1-a))
-    return R * c
+# Fixed reference landmarks used for LLM context
+LANDMARKS = {
+    "school": (13.0850, 80.2100),
+    "hospital": (13.0827, 80.2707),
+    "college": (13.0102, 80.2359),
+    "shopping_mall": (12.9840, 80.2229),
+    "bus_stand": (13.0674, 80.1791)
+}
+_LANDMARK_NAMES = list(LANDMARKS)
+_LANDMARK_LATS = np.array([LANDMARKS[n][0] for n in _LANDMARK_NAMES])
+_LANDMARK_LONS = np.array([LANDMARKS[n][1] for n in _LANDMARK_NAMES])
 
 def transcription_agent(state):
     if state.get("text"): return state
@@ -78,17 +82,8 @@ def geo_agent(state):
         return state
     try:
         lat, lon = map(float, state["gps"].split(","))
-        landmarks = {
-            "school": (13.0850, 80.2100),
-            "hospital": (13.0827, 80.2707),
-            "college": (13.0102, 80.2359),
-            "shopping_mall": (12.9840, 80.2229),
-            "bus_stand": (13.0674, 80.1791)
-        }
-        geo_data = {}
-        for name, coords in landmarks.items():
-            geo_data[name] = haversine(lat, lon, *coords)
-        state["geo"] = geo_data
+        dists = haversine_many(lat, lon, _LANDMARK_LATS, _LANDMARK_LONS)
+        state["geo"] = {name: float(d) for name, d in zip(_LANDMARK_NAMES, dists)}
     except Exception as e:
         print(f"Geo Agent Error: {e}")
         state["geo"] = default_geo
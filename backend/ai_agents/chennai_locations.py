@@ -52,3 +52,6 @@ CHENNAI_IMPORTANT_LOCATIONS = {
         {"name": "Ritchie Street (Electronics Hub)", "lat": 13.0680, "lon": 80.2680, "radius": 0.3, "type": "Market"}
     ]
 }
+
+# (south, west, north, east) covering Greater Chennai Corporation and its fringe
+CHENNAI_BBOX = (12.80, 80.05, 13.25, 80.35)
@@ -0,0 +1,38 @@
+"""
+distance.py
+Shared haversine kernels (scalar, one-to-many and many-to-many)
+"""
+
+from math import radians, sin, cos, sqrt, atan2
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+def haversine(lat1, lon1, lat2, lon2) -> float:
+    """Great-circle distance in km between two points."""
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+    c = 2 * atan2(sqrt(a), sqrt(1-a))
+    return EARTH_RADIUS_KM * c
+
+def _haversine_rad(lat1, lon1, lat2, lon2) -> np.ndarray:
+    # Inputs in radians, broadcastable; returns km
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    a = np.clip(a, 0.0, 1.0)
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+def haversine_many(lat: float, lon: float, lats, lons) -> np.ndarray:
+    """Distances in km from one point to N points, as a length-N array."""
+    lats = np.radians(np.asarray(lats, dtype=np.float64))
+    lons = np.radians(np.asarray(lons, dtype=np.float64))
+    return _haversine_rad(radians(lat), radians(lon), lats, lons)
+
+def haversine_matrix(lats1, lons1, lats2, lons2) -> np.ndarray:
+    """N x M matrix of distances in km between two point sets."""
+    lats1 = np.radians(np.asarray(lats1, dtype=np.float64))[:, None]
+    lons1 = np.radians(np.asarray(lons1, dtype=np.float64))[:, None]
+    lats2 = np.radians(np.asarray(lats2, dtype=np.float64))[None, :]
+    lons2 = np.radians(np.asarray(lons2, dtype=np.float64))[None, :]
+    return _haversine_rad(lats1, lons1, lats2, lons2)
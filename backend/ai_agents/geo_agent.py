@@ -1,10 +1,17 @@
 import logging
 import json
 import os
-from math import radians, sin, cos, sqrt, atan2
 from typing import Dict, List, Optional, Any
+import numpy as np
 from geopy.geocoders import Nominatim
 from ai_agents.chennai_locations import CHENNAI_IMPORTANT_LOCATIONS
+from ai_agents.keyword_matcher import KeywordMatcher
+from ai_agents.overpass import point_query, fetch_elements, fetch_elements_async
+from ai_agents.overpass_cache import OverpassTileCache
+from ai_agents.poi_features import FeatureSet
+from ai_agents.poi_snapshot import POISnapshot
+from ai_agents.priority_engine import PriorityEngine, priority_engine
+from ai_agents.zone_resolver import ZoneResolver
 
 logger = logging.getLogger(__name__)
 
@@ -26,75 +33,88 @@ CHENNAI_ZONE_MAPPING = {
     "Perungudi": ["perungudi", "kottivakkam", "palavakkam"],
     "Sholinganallur": ["sholinganallur", "karapakkam", "injambakkam", "neelankarai"]
 }
+ZONE_MATCHER = KeywordMatcher(CHENNAI_ZONE_MAPPING)
+
+# A pin this close to a hospital / school takes that location type
+HOSPITAL_ZONE_KM = 0.5
+SCHOOL_ZONE_KM = 0.4
 
 class FeatureExtractionAgent:
     def __init__(self):
         self.locations_db = CHENNAI_IMPORTANT_LOCATIONS
-        self._overpass_cache = {}
-
-    def calculate_distance(self, lat1, lon1, lat2, lon2):
-        R = 6371
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
-        return R * c
+        self.poi_snapshot = POISnapshot.from_env()
+        # Live Overpass (through the tile cache) is only used when no offline snapshot exists
+        self.overpass_cache = None if self.poi_snapshot else OverpassTileCache.from_env()
+        self.zone_resolver = ZoneResolver.from_env(known_zones=CHENNAI_ZONE_MAPPING)
 
     def detect_location_type_from_gps(self, gps_coordinates: str) -> tuple[str, Optional[str], Dict[str, Any]]:
-        metrics = {"hospital_dist": 10.0, "major_road_dist": 10.0, "nearby_hospital": None, "nearby_road": None}
-        if not gps_coordinates: return "Residential", None, metrics
+        pin = self._parse_gps(gps_coordinates)
+        if not pin: return self._location_type(None)
+        return self._location_type(self._features_near(*pin).nearest(*pin))
+
+    async def detect_location_type_from_gps_async(self, gps_coordinates: str) -> tuple[str, Optional[str], Dict[str, Any]]:
+        """Same as detect_location_type_from_gps, but never blocks the event loop on Overpass."""
+        pin = self._parse_gps(gps_coordinates)
+        if not pin: return self._location_type(None)
+        return self._location_type((await self._features_near_async(*pin)).nearest(*pin))
+
+    @staticmethod
+    def _parse_gps(gps_coordinates: Optional[str]) -> Optional[tuple]:
+        if not gps_coordinates: return None
         try:
             coords = gps_coordinates.replace(" ", "").split(',')
-            lat, lon = float(coords[0]), float(coords[1])
-        except: return "Residential", None, metrics
-
-        query = f"""
-[out:json][timeout:10];
-(
-  node["amenity"~"hospital|school|college|university|bus_station"](around:2000,{lat},{lon});
-  way["amenity"~"hospital|school|college|university|bus_station"](around:2000,{lat},{lon});
-  node["shop"="mall"](around:2000,{lat},{lon});
-  way["shop"="mall"](around:2000,{lat},{lon});
-  way["highway"~"^(primary|secondary|trunk|motorway)$"](around:1000,{lat},{lon});
-);
-out center;
-"""
-        import urllib.request
-        import urllib.parse
-        try:
-            url = "https://overpass-api.de/api/interpreter"
-            data = urllib.parse.urlencode({"data": query}).encode()
-            req = urllib.request.Request(url, data=data, method="POST")
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                result = json.loads(resp.read().decode())
-                elements = result.get("elements", [])
-        except: elements = []
-
-        nearest = {"Hospital": (10.0, None), "School": (10.0, None), "Major Road": (10.0, None)}
-        for el in elements:
-            el_lat = el.get("lat") or (el.get("center") or {}).get("lat")
-            el_lon = el.get("lon") or (el.get("center") or {}).get("lon")
-            if not el_lat or not el_lon: continue
-            dist = self.calculate_distance(lat, lon, float(el_lat), float(el_lon))
-            tags = el.get("tags", {})
-            m_type = None
-            if tags.get("amenity") == "hospital": m_type = "Hospital"
-            elif tags.get("amenity") == "school": m_type = "School"
-            elif tags.get("highway") in ["primary", "secondary", "trunk", "motorway"]: m_type = "Major Road"
-            if m_type and dist < nearest[m_type][0]: nearest[m_type] = (dist, tags.get("name") or m_type)
+            return float(coords[0]), float(coords[1])
+        except: return None
 
+    @staticmethod
+    def _location_type(nearest: Optional[Dict[str, tuple]]) -> tuple[str, Optional[str], Dict[str, Any]]:
+        metrics = {"hospital_dist": 10.0, "major_road_dist": 10.0, "nearby_hospital": None, "nearby_road": None}
+        if not nearest: return "Residential", None, metrics
         metrics["hospital_dist"] = nearest["Hospital"][0]
         metrics["major_road_dist"] = nearest["Major Road"][0]
         metrics["nearby_hospital"] = nearest["Hospital"][1]
         metrics["nearby_road"] = nearest["Major Road"][1]
 
-        if nearest["Hospital"][0] < 0.5: return "Hospital", nearest["Hospital"][1], metrics
-        if nearest["School"][0] < 0.4: return "School", nearest["School"][1], metrics
+        if nearest["Hospital"][0] < HOSPITAL_ZONE_KM: return "Hospital", nearest["Hospital"][1], metrics
+        if nearest["School"][0] < SCHOOL_ZONE_KM: return "School", nearest["School"][1], metrics
         return "Residential", None, metrics
 
+    @staticmethod
+    def location_types(hospital_dists, school_dists) -> np.ndarray:
+        """Vectorized _location_type over arrays of nearest hospital / school distances."""
+        hospital, school = np.asarray(hospital_dists), np.asarray(school_dists)
+        return np.where(hospital < HOSPITAL_ZONE_KM, "Hospital", np.where(school < SCHOOL_ZONE_KM, "School", "Residential"))
+
+    def _features_near(self, lat: float, lon: float) -> FeatureSet:
+        """POIs around a pin: offline snapshot, else the Overpass tile cache, else a live point query."""
+        if self.poi_snapshot:
+            return self.poi_snapshot.features_for(lat, lon)
+        if self.overpass_cache:
+            return self.overpass_cache.features_for(lat, lon)
+        try:
+            elements = fetch_elements(point_query(lat, lon))
+        except Exception: elements = []
+        return FeatureSet(elements, prefiltered=True)
+
+    async def _features_near_async(self, lat: float, lon: float) -> FeatureSet:
+        if self.poi_snapshot:
+            return self.poi_snapshot.features_for(lat, lon)  # in-memory, no I/O
+        if self.overpass_cache:
+            return await self.overpass_cache.features_for_async(lat, lon)
+        try:
+            elements = await fetch_elements_async(point_query(lat, lon))
+        except Exception: elements = []
+        return FeatureSet(elements, prefiltered=True)
+
     def resolve_zone(self, gps_coordinates: Optional[str], text: str) -> Optional[str]:
-        if gps_coordinates:
+        if gps_coordinates and self.zone_resolver:
+            try:
+                coords = gps_coordinates.replace(" ", "").split(',')
+                zone = self.zone_resolver.resolve(float(coords[0]), float(coords[1]))
+                if zone: return zone
+            except: pass
+        elif gps_coordinates:
+            # Legacy online path, only used when no boundary file is configured
             try:
                 coords = gps_coordinates.replace(" ", "").split(',')
                 lat, lon = float(coords[0]), float(coords[1])
@@ -105,38 +125,20 @@ out center;
                     for key in ['suburb', 'neighbourhood', 'residential']:
                         locality = addr.get(key)
                         if locality:
-                            for zone, localities in CHENNAI_ZONE_MAPPING.items():
-                                if any(l.lower() in locality.lower() for l in localities): return zone
+                            zone = ZONE_MATCHER.classify(locality)
+                            if zone: return zone
             except: pass
-        text_lower = text.lower()
-        for zone, localities in CHENNAI_ZONE_MAPPING.items():
-            if any(l.lower() in text_lower for l in localities): return zone
-        return None
+        return ZONE_MATCHER.classify(text)
 
 class SmartPriorityBooster:
+    """Scalar front-end of the table-driven PriorityEngine (issue_type drives the scenario matrix)."""
+
+    def __init__(self, engine: Optional[PriorityEngine] = None):
+        self.engine = engine or priority_engine
+
     def boost_priority(self, base_priority, location_type, urgency_found, text="", hospital_dist=10.0, major_road_dist=10.0, density=0, frequency=0, issue_type="General"):
-        priority_levels = {"LOW": 25, "MEDIUM": 50, "HIGH": 75, "CRITICAL": 100}
-        score = float(priority_levels.get(base_priority.upper(), 50))
-        reasons = []
-        if hospital_dist < 0.5:
-            score += 30
-            reasons.append("Near hospital")
-        if major_road_dist < 0.3:
-            score += 20
-            reasons.append("Near major road")
-        if location_type == "School":
-            score += 25
-            reasons.append("Near school")
-        if urgency_found:
-            score += 25
-            reasons.append("Urgent keywords")
-        if density > 5:
-            score += 15
-            reasons.append("High density")
-        
-        final_score = min(score, 100.0)
-        if final_score >= 85: final_prio = "CRITICAL"
-        elif final_score >= 65: final_prio = "HIGH"
-        elif final_score >= 40: final_prio = "MEDIUM"
-        else: final_prio = "LOW"
-        return final_prio, ", ".join(reasons) or "Standard", final_score
+        return self.engine.score(
+            base_priority, location_type, urgency_found=urgency_found,
+            hospital_dist=hospital_dist, major_road_dist=major_road_dist,
+            density=density, frequency=frequency, issue_type=issue_type,
+        )
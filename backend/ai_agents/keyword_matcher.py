@@ -0,0 +1,83 @@
+"""
+keyword_matcher.py
+Compiled multi-keyword matcher for keyword -> category classification
+"""
+
+import re
+import threading
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+# Separator used to scan a batch of texts in one pass; never part of a keyword
+_BATCH_SEP = "\x00"
+
+class KeywordMatcher:
+    """
+    Case-insensitive substring matcher over a {category: [terms]} table.
+    All terms are compiled into a single regex alternation (longest first,
+    so "stray dog" wins over "dog" at the same position) and the text is
+    scanned once, left to right, without overlapping matches.
+    """
+
+    def __init__(self, table: Optional[Dict[str, Iterable[str]]] = None):
+        self._lock = threading.Lock()
+        self._categories: List[str] = []          # table order, used to break ties
+        self._term_categories: Dict[str, List[str]] = {}
+        self._pattern: Optional[re.Pattern] = None
+        for category, terms in (table or {}).items():
+            self.add_keywords(category, terms)
+
+    def add_keywords(self, category: str, terms: Iterable[str]) -> None:
+        """Register extra terms for a category (new categories go last) and recompile."""
+        with self._lock:
+            if category not in self._categories:
+                self._categories.append(category)
+            for term in terms:
+                term = term.strip().lower()
+                if not term or _BATCH_SEP in term:
+                    continue
+                owners = self._term_categories.setdefault(term, [])
+                if category not in owners:
+                    owners.append(category)
+            terms_by_len = sorted(self._term_categories, key=lambda t: (-len(t), t))
+            self._pattern = re.compile("|".join(map(re.escape, terms_by_len))) if terms_by_len else None
+
+    @property
+    def categories(self) -> List[str]:
+        return list(self._categories)
+
+    def match(self, text: str) -> Dict[str, int]:
+        """Hit count per category for one text."""
+        return self.match_many([text])[0]
+
+    def match_many(self, texts: List[str]) -> List[Dict[str, int]]:
+        """Hit counts per category for each text, from a single scan over the batch."""
+        counts = [Counter() for _ in texts]
+        pattern, term_categories = self._pattern, self._term_categories
+        if pattern is None or not texts:
+            return [dict(c) for c in counts]
+
+        lowered = [(t or "").lower().replace(_BATCH_SEP, " ") for t in texts]
+        starts, pos = [], 0
+        for t in lowered:
+            starts.append(pos)
+            pos += len(t) + 1
+        for m in pattern.finditer(_BATCH_SEP.join(lowered)):
+            bucket = counts[bisect_right(starts, m.start()) - 1]
+            for category in term_categories[m.group(0)]:
+                bucket[category] += 1
+        return [dict(c) for c in counts]
+
+    def _best(self, counts: Dict[str, int]) -> Optional[str]:
+        if not counts:
+            return None
+        order = {c: i for i, c in enumerate(self._categories)}
+        return min(counts, key=lambda c: (-counts[c], order[c]))
+
+    def classify(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """Category with the most hits (earlier table entries win ties), or default."""
+        return self._best(self.match(text)) or default
+
+    def classify_many(self, texts: List[str], default: Optional[str] = None) -> List[Optional[str]]:
+        return [self._best(c) or default for c in self.match_many(texts)]
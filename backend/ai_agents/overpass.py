@@ -0,0 +1,89 @@
+"""
+overpass.py
+Overpass API queries for the POIs used in priority scoring
+"""
+
+import os
+import json
+import asyncio
+import urllib.request
+import urllib.parse
+from typing import Any, Dict, List
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+OVERPASS_URL = os.getenv("OVERPASS_URL", "https://overpass-api.de/api/interpreter")
+
+AMENITY_PATTERN = "hospital|school|college|university|bus_station"
+HIGHWAY_PATTERN = "^(primary|secondary|trunk|motorway)$"
+
+# Search radii of the live point query, in metres
+POI_RADIUS_M = 2000
+ROAD_RADIUS_M = 1000
+
+def point_query(lat: float, lon: float) -> str:
+    """POIs around a single pin (centers only) plus nearby major roads with full geometry."""
+    return f"""
+[out:json][timeout:10];
+(
+  node["amenity"~"{AMENITY_PATTERN}"](around:{POI_RADIUS_M},{lat},{lon});
+  way["amenity"~"{AMENITY_PATTERN}"](around:{POI_RADIUS_M},{lat},{lon});
+  node["shop"="mall"](around:{POI_RADIUS_M},{lat},{lon});
+  way["shop"="mall"](around:{POI_RADIUS_M},{lat},{lon});
+)->.pois;
+way["highway"~"{HIGHWAY_PATTERN}"](around:{ROAD_RADIUS_M},{lat},{lon})->.roads;
+.pois out center;
+.roads out geom;
+"""
+
+def bbox_query(south: float, west: float, north: float, east: float, timeout: int = 25) -> str:
+    """
+    Every POI and major road inside a bounding box, with full way geometry
+    so callers can reproduce the point query's radius filters locally.
+    """
+    return f"""
+[out:json][timeout:{timeout}][bbox:{south},{west},{north},{east}];
+(
+  node["amenity"~"{AMENITY_PATTERN}"];
+  way["amenity"~"{AMENITY_PATTERN}"];
+  node["shop"="mall"];
+  way["shop"="mall"];
+  way["highway"~"{HIGHWAY_PATTERN}"];
+);
+out geom;
+"""
+
+def fetch_elements(query: str, timeout: int = 10) -> List[Dict[str, Any]]:
+    """POST a query to Overpass and return its elements. Raises on network/HTTP errors."""
+    data = urllib.parse.urlencode({"data": query}).encode()
+    req = urllib.request.Request(OVERPASS_URL, data=data, method="POST")
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        result = json.loads(resp.read().decode())
+    return result.get("elements", [])
+
+# One pooled client per event loop (connections are bound to the loop that opened them)
+_async_client = None
+_async_client_loop = None
+
+def _client():
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = httpx.AsyncClient()
+        _async_client_loop = loop
+    return _async_client
+
+async def fetch_elements_async(query: str, timeout: int = 10) -> List[Dict[str, Any]]:
+    """
+    Non-blocking fetch_elements for use on the event loop: httpx when it is
+    installed (reusing one connection pool), otherwise the blocking client
+    on a worker thread.
+    """
+    if httpx is None:
+        return await asyncio.to_thread(fetch_elements, query, timeout)
+    resp = await _client().post(OVERPASS_URL, data={"data": query}, timeout=timeout)
+    resp.raise_for_status()
+    return resp.json().get("elements", [])
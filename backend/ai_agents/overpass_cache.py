@@ -0,0 +1,173 @@
+"""
+overpass_cache.py
+Tile-keyed, disk-backed cache of Overpass POI lookups
+"""
+
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from math import floor, cos, radians
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ai_agents.overpass import POI_RADIUS_M, bbox_query, fetch_elements, fetch_elements_async
+from ai_agents.paths import data_path
+from ai_agents.poi_features import FeatureSet
+
+logger = logging.getLogger(__name__)
+
+# Relative cache paths resolve under DATA_DIR (see ai_agents.paths)
+DEFAULT_CACHE_PATH = "overpass_cache.sqlite"
+
+def tile_bbox(lat: float, lon: float, tile_deg: float) -> Tuple[float, float, float, float]:
+    """
+    (south, west, north, east) of the tile containing a pin, grown by the
+    largest query radius so it holds every POI any pin in the tile can see.
+    """
+    row, col = floor(lat / tile_deg), floor(lon / tile_deg)
+    south, west = row * tile_deg, col * tile_deg
+    north, east = south + tile_deg, west + tile_deg
+    margin_km = POI_RADIUS_M / 1000 * 1.01
+    dlat = margin_km / 111.0
+    dlon = margin_km / (111.0 * cos(radians(max(abs(south), abs(north)))))
+    return south - dlat, west - dlon, north + dlat, east + dlon
+
+class OverpassTileCache:
+    """
+    Snaps coordinates to fixed lat/lon tiles and caches every POI needed by
+    any pin inside a tile: the tile is fetched with a margin equal to the
+    largest query radius, and FeatureSet re-applies the exact radius filters.
+
+    Raw elements live in SQLite (survives restarts, shared by workers); the
+    parsed FeatureSet for recently used tiles is kept in an in-memory LRU.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_seconds: float = 7 * 24 * 3600,
+        tile_deg: float = 0.01,
+        memory_tiles: int = 256,
+        fetch: Callable[[str], List[Dict[str, Any]]] = None,
+    ):
+        self.path = data_path(path)
+        self.ttl_seconds = ttl_seconds
+        self.tile_deg = tile_deg
+        self.memory_tiles = memory_tiles
+        self._fetch = fetch or (lambda query: fetch_elements(query, timeout=25))
+        # Injected sync fetchers run on a worker thread in features_for_async
+        self._afetch = None if fetch else (lambda query: fetch_elements_async(query, timeout=25))
+        self._memory: "OrderedDict[str, Tuple[float, FeatureSet]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS overpass_tiles ("
+            "tile_key TEXT PRIMARY KEY, fetched_at REAL NOT NULL, elements TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["OverpassTileCache"]:
+        if os.getenv("OVERPASS_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+            return None
+        return cls(
+            path=os.getenv("OVERPASS_CACHE_PATH", DEFAULT_CACHE_PATH),
+            ttl_seconds=float(os.getenv("OVERPASS_CACHE_TTL_HOURS", "168")) * 3600,
+            tile_deg=float(os.getenv("OVERPASS_CACHE_TILE_DEG", "0.01")),
+        )
+
+    def tile_key(self, lat: float, lon: float) -> str:
+        return f"{self.tile_deg}:{floor(lat / self.tile_deg)}:{floor(lon / self.tile_deg)}"
+
+    def _fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at < self.ttl_seconds
+
+    def _remember(self, key: str, fetched_at: float, features: FeatureSet):
+        self._memory[key] = (fetched_at, features)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_tiles:
+            self._memory.popitem(last=False)
+
+    def _cached(self, key: str) -> Optional[FeatureSet]:
+        """Fresh FeatureSet for a tile from memory or disk; counts the hit or miss."""
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and self._fresh(cached[0]):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            row = self._conn.execute(
+                "SELECT fetched_at, elements FROM overpass_tiles WHERE tile_key = ?", (key,)
+            ).fetchone()
+            if row and self._fresh(row[0]):
+                features = FeatureSet(json.loads(row[1]))
+                self._remember(key, row[0], features)
+                self.hits += 1
+                return features
+            self.misses += 1
+            return None
+
+    def _store(self, key: str, elements: List[Dict[str, Any]]) -> FeatureSet:
+        fetched_at = time.time()
+        features = FeatureSet(elements)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO overpass_tiles (tile_key, fetched_at, elements) VALUES (?, ?, ?)",
+                (key, fetched_at, json.dumps(elements)),
+            )
+            self._conn.commit()
+            self._remember(key, fetched_at, features)
+        return features
+
+    def _fetch_failed(self, key: str, e: Exception) -> FeatureSet:
+        logger.warning(f"Overpass tile fetch failed for {key}: {e}")
+        with self._lock:
+            self.errors += 1
+        return FeatureSet()
+
+    def features_for(self, lat: float, lon: float) -> FeatureSet:
+        """FeatureSet covering every POI the live query could return for this pin."""
+        key = self.tile_key(lat, lon)
+        features = self._cached(key)
+        if features is not None:
+            return features
+        # Fetch outside the lock so one slow tile doesn't block other lookups
+        try:
+            elements = self._fetch(bbox_query(*tile_bbox(lat, lon, self.tile_deg)))
+        except Exception as e:
+            return self._fetch_failed(key, e)
+        return self._store(key, elements)
+
+    async def features_for_async(self, lat: float, lon: float) -> FeatureSet:
+        """features_for without blocking the event loop (SQLite reads and writes run on a worker thread)."""
+        key = self.tile_key(lat, lon)
+        features = await asyncio.to_thread(self._cached, key)
+        if features is not None:
+            return features
+        query = bbox_query(*tile_bbox(lat, lon, self.tile_deg))
+        try:
+            if self._afetch:
+                elements = await self._afetch(query)
+            else:
+                elements = await asyncio.to_thread(self._fetch, query)
+        except Exception as e:
+            return self._fetch_failed(key, e)
+        return await asyncio.to_thread(self._store, key, elements)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "memory_tiles": len(self._memory),
+            }
@@ -0,0 +1,18 @@
+"""
+paths.py
+Where relative data files (caches, snapshots, rules, grids) live
+"""
+
+import os
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def data_dir() -> str:
+    """DATA_DIR from the environment, else the backend directory; never the working directory."""
+    return os.getenv("DATA_DIR") or BACKEND_DIR
+
+def data_path(path: str) -> str:
+    """path as given if absolute (or SQLite's ":memory:"), else under data_dir()."""
+    if path == ":memory:":
+        return path
+    return os.path.join(data_dir(), path)
@@ -0,0 +1,217 @@
+"""
+poi_features.py
+Compact, array-backed view of Overpass elements for nearest-feature lookups
+"""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+import numpy as np
+from ai_agents.distance import haversine_many
+from ai_agents.spatial import STRTree, query_box, point_segment_distances
+from ai_agents.overpass import POI_RADIUS_M, ROAD_RADIUS_M
+
+FEATURE_TYPES = ("Hospital", "School", "Major Road", "College", "Bus Station", "Mall")
+MAJOR_HIGHWAYS = ("primary", "secondary", "trunk", "motorway")
+# Same radii as the live point query, so cached / offline data gives identical results
+FEATURE_RADIUS_KM = {t: POI_RADIUS_M / 1000 for t in FEATURE_TYPES}
+FEATURE_RADIUS_KM["Major Road"] = ROAD_RADIUS_M / 1000
+NO_FEATURE_DIST = 10.0
+ROAD_CODE = FEATURE_TYPES.index("Major Road")
+# Below this many road segments a brute-force vectorized pass beats the tree walk
+SEGMENT_TREE_MIN = 64
+
+def feature_type(tags: Dict[str, Any]) -> Optional[str]:
+    amenity = tags.get("amenity")
+    if amenity == "hospital": return "Hospital"
+    if amenity == "school": return "School"
+    if tags.get("highway") in MAJOR_HIGHWAYS: return "Major Road"
+    if amenity in ("college", "university"): return "College"
+    if amenity == "bus_station": return "Bus Station"
+    if tags.get("shop") == "mall": return "Mall"
+    return None
+
+def element_center(el: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """Node position, or the bounding-box center Overpass reports for ways."""
+    lat = el.get("lat") or (el.get("center") or {}).get("lat")
+    lon = el.get("lon") or (el.get("center") or {}).get("lon")
+    bounds = el.get("bounds")
+    if (not lat or not lon) and bounds:
+        lat = (bounds["minlat"] + bounds["maxlat"]) / 2
+        lon = (bounds["minlon"] + bounds["maxlon"]) / 2
+    if not lat or not lon: return None
+    return float(lat), float(lon)
+
+class FeatureSet:
+    """
+    Scored features (hospitals, schools, major roads) from a batch of
+    Overpass elements, stored as NumPy arrays.
+
+    Major roads with geometry are measured to their nearest line segment
+    (looked up through an STR R-tree of segments); everything else is
+    measured to its center, like Overpass "out center".
+
+    For data that was not fetched around the query point (bbox tiles,
+    offline snapshots) the live query's "around" filter is reproduced
+    locally: roads by segment distance, other ways by their closest
+    geometry vertex, nodes by position. Pass prefiltered=True for live
+    point-query results, which Overpass already filtered.
+    """
+
+    ARRAYS = ("types", "lats", "lons", "names", "v_lats", "v_lons", "v_starts", "v_owners")
+
+    def __init__(self, elements: Iterable[Dict[str, Any]] = (), prefiltered: bool = False):
+        self.prefiltered = prefiltered
+        types, lats, lons, names = [], [], [], []
+        v_lats, v_lons, v_starts, v_owners = [], [], [], []
+        for el in elements:
+            tags = el.get("tags", {})
+            m_type = feature_type(tags)
+            if not m_type: continue
+            center = element_center(el)
+            if not center: continue
+            geometry = [p for p in (el.get("geometry") or []) if p]
+            if geometry:
+                v_owners.append(len(types))
+                v_starts.append(len(v_lats))
+                v_lats.extend(p["lat"] for p in geometry)
+                v_lons.extend(p["lon"] for p in geometry)
+            types.append(FEATURE_TYPES.index(m_type))
+            lats.append(center[0])
+            lons.append(center[1])
+            names.append(tags.get("name") or m_type)
+        self._set_arrays(
+            types=np.array(types, dtype=np.int8),
+            lats=np.array(lats, dtype=np.float64),
+            lons=np.array(lons, dtype=np.float64),
+            names=np.array(names, dtype=str),
+            v_lats=np.array(v_lats, dtype=np.float64),
+            v_lons=np.array(v_lons, dtype=np.float64),
+            v_starts=np.array(v_starts, dtype=np.intp),
+            v_owners=np.array(v_owners, dtype=np.intp),
+        )
+
+    def _set_arrays(self, **arrays):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self._segments = None
+
+    def _road_segments(self):
+        """(a_idx, b_idx, owner, tree) for every road segment; built once on first use."""
+        if self._segments is None:
+            is_road = self.types[self.v_owners] == ROAD_CODE if self.v_owners.size else np.array([], dtype=bool)
+            starts = self.v_starts[is_road]
+            lengths = self._vertex_ends()[is_road] - starts
+            counts = np.maximum(lengths - 1, 1)  # single-vertex roads become a zero-length segment
+            a_idx = np.repeat(starts, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+            b_idx = a_idx + np.repeat(lengths > 1, counts)
+            owners = np.repeat(self.v_owners[is_road], counts)
+            tree = None
+            if len(a_idx) >= SEGMENT_TREE_MIN:
+                tree = STRTree(np.column_stack([
+                    np.minimum(self.v_lats[a_idx], self.v_lats[b_idx]), np.maximum(self.v_lats[a_idx], self.v_lats[b_idx]),
+                    np.minimum(self.v_lons[a_idx], self.v_lons[b_idx]), np.maximum(self.v_lons[a_idx], self.v_lons[b_idx]),
+                ]))
+            self._segments = (a_idx, b_idx, owners, tree)
+        return self._segments
+
+    def _road_distances(self, lat: float, lon: float):
+        """Feature indices of roads with geometry and their nearest-segment distance (inf if beyond the road radius)."""
+        a_idx, b_idx, owners, tree = self._road_segments()
+        road_idx = np.unique(owners)
+        if not road_idx.size:
+            return road_idx, np.array([], dtype=np.float64)
+        if tree is not None:
+            seg = tree.query(*query_box(lat, lon, FEATURE_RADIUS_KM["Major Road"]))
+            a_idx, b_idx, owners = a_idx[seg], b_idx[seg], owners[seg]
+        best = np.full(len(self), np.inf)
+        if owners.size:
+            seg_dists = point_segment_distances(
+                lat, lon, self.v_lats[a_idx], self.v_lons[a_idx], self.v_lats[b_idx], self.v_lons[b_idx]
+            )
+            np.minimum.at(best, owners, seg_dists)
+        return road_idx, best[road_idx]
+
+    @classmethod
+    def from_arrays(cls, prefiltered: bool = False, **arrays) -> "FeatureSet":
+        features = cls.__new__(cls)
+        features.prefiltered = prefiltered
+        features._set_arrays(**arrays)
+        return features
+
+    def save(self, path: str):
+        """Write the arrays as a single compressed .npz file."""
+        with open(path, "wb") as f:
+            np.savez_compressed(f, **{name: getattr(self, name) for name in self.ARRAYS})
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureSet":
+        with np.load(path, allow_pickle=False) as data:
+            return cls.from_arrays(**{name: data[name] for name in cls.ARRAYS})
+
+    def _vertex_ends(self) -> np.ndarray:
+        return np.append(self.v_starts[1:], len(self.v_lats)).astype(np.intp)
+
+    def bounds(self) -> np.ndarray:
+        """(N, 4) array of min_lat, max_lat, min_lon, max_lon over center and geometry."""
+        b = np.column_stack([self.lats, self.lats, self.lons, self.lons])
+        if self.v_owners.size:
+            owners = self.v_owners
+            b[owners, 0] = np.minimum(b[owners, 0], np.minimum.reduceat(self.v_lats, self.v_starts))
+            b[owners, 1] = np.maximum(b[owners, 1], np.maximum.reduceat(self.v_lats, self.v_starts))
+            b[owners, 2] = np.minimum(b[owners, 2], np.minimum.reduceat(self.v_lons, self.v_starts))
+            b[owners, 3] = np.maximum(b[owners, 3], np.maximum.reduceat(self.v_lons, self.v_starts))
+        return b
+
+    def take(self, indices: np.ndarray) -> "FeatureSet":
+        """Subset of features (with their geometry), preserving order."""
+        indices = np.asarray(indices, dtype=np.intp)
+        remap = np.full(len(self), -1, dtype=np.intp)
+        remap[indices] = np.arange(len(indices))
+        keep = np.flatnonzero(remap[self.v_owners] >= 0) if self.v_owners.size else np.array([], dtype=np.intp)
+        ends = self._vertex_ends()
+        chunks = [np.arange(self.v_starts[k], ends[k]) for k in keep]
+        vertex_idx = np.concatenate(chunks) if chunks else np.array([], dtype=np.intp)
+        lengths = ends[keep] - self.v_starts[keep]
+        return FeatureSet.from_arrays(
+            prefiltered=self.prefiltered,
+            types=self.types[indices],
+            lats=self.lats[indices],
+            lons=self.lons[indices],
+            names=self.names[indices],
+            v_lats=self.v_lats[vertex_idx],
+            v_lons=self.v_lons[vertex_idx],
+            v_starts=(np.cumsum(lengths) - lengths).astype(np.intp),
+            v_owners=remap[self.v_owners[keep]],
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def _reach(self, lat: float, lon: float, dists: np.ndarray) -> np.ndarray:
+        """Distance used for the radius filter of each feature."""
+        if self.prefiltered:
+            return np.zeros_like(dists)
+        reach = dists.copy()
+        if self.v_owners.size:
+            v_dists = haversine_many(lat, lon, self.v_lats, self.v_lons)
+            reach[self.v_owners] = np.minimum.reduceat(v_dists, self.v_starts)
+        return reach
+
+    def nearest(self, lat: float, lon: float) -> Dict[str, Tuple[float, Optional[str]]]:
+        """Nearest (distance_km, name) per feature type."""
+        nearest = {t: (NO_FEATURE_DIST, None) for t in FEATURE_TYPES}
+        if not len(self): return nearest
+
+        dists = haversine_many(lat, lon, self.lats, self.lons)
+        reach = self._reach(lat, lon, dists)
+        road_idx, road_dists = self._road_distances(lat, lon)
+        if road_idx.size:
+            dists[road_idx] = road_dists
+            if not self.prefiltered:
+                reach[road_idx] = road_dists
+        for code, m_type in enumerate(FEATURE_TYPES):
+            idx = np.flatnonzero((self.types == code) & (reach <= FEATURE_RADIUS_KM[m_type]))
+            if not idx.size: continue
+            best = idx[np.argmin(dists[idx])]
+            if dists[best] < nearest[m_type][0]:
+                nearest[m_type] = (float(dists[best]), str(self.names[best]))
+        return nearest
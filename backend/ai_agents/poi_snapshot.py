@@ -0,0 +1,159 @@
+"""
+poi_snapshot.py
+Offline POI index for priority scoring (no Overpass call at request time)
+
+Build the snapshot once from a local extract, or refresh it from Overpass
+as a scheduled job:
+
+    python -m ai_agents.poi_snapshot import chennai.osm --out poi_snapshot.npz
+    python -m ai_agents.poi_snapshot import overpass_dump.json
+    python -m ai_agents.poi_snapshot refresh
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from math import floor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from ai_agents.chennai_locations import CHENNAI_BBOX
+from ai_agents.overpass import bbox_query, fetch_elements
+from ai_agents.overpass_cache import tile_bbox
+from ai_agents.paths import data_path
+from ai_agents.poi_features import FeatureSet, feature_type
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = "poi_snapshot.npz"
+
+class POISnapshot:
+    """
+    City-wide FeatureSet loaded from a .npz snapshot, queried in-process.
+
+    Pins are snapped to tiles like the Overpass cache; the features whose
+    bounds reach a tile (plus the query radius) are sliced out once and
+    kept in an LRU, so repeated pins in a neighbourhood cost one
+    FeatureSet.nearest call.
+    """
+
+    def __init__(self, features: FeatureSet, tile_deg: float = 0.01, memory_tiles: int = 512):
+        self.features = features
+        self.tile_deg = tile_deg
+        self.memory_tiles = memory_tiles
+        self._bounds = features.bounds()
+        self._tiles: "OrderedDict[Tuple[int, int], FeatureSet]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "POISnapshot":
+        return cls(FeatureSet.load(path), **kwargs)
+
+    @classmethod
+    def from_env(cls) -> Optional["POISnapshot"]:
+        path = os.getenv("POI_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH)
+        if not path:
+            return None
+        path = data_path(path)
+        if not os.path.exists(path):
+            return None
+        try:
+            snapshot = cls.load(path)
+            logger.info(f"Loaded POI snapshot {path} ({len(snapshot.features)} features)")
+            return snapshot
+        except Exception as e:
+            logger.error(f"Failed to load POI snapshot {path}: {e}")
+            return None
+
+    def features_for(self, lat: float, lon: float) -> FeatureSet:
+        key = (floor(lat / self.tile_deg), floor(lon / self.tile_deg))
+        with self._lock:
+            features = self._tiles.get(key)
+            if features is not None:
+                self._tiles.move_to_end(key)
+                return features
+        south, west, north, east = tile_bbox(lat, lon, self.tile_deg)
+        b = self._bounds
+        idx = np.flatnonzero((b[:, 1] >= south) & (b[:, 0] <= north) & (b[:, 3] >= west) & (b[:, 2] <= east))
+        features = self.features.take(idx)
+        with self._lock:
+            self._tiles[key] = features
+            while len(self._tiles) > self.memory_tiles:
+                self._tiles.popitem(last=False)
+        return features
+
+def _osm_xml_elements(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Overpass-style elements (with way geometry/bounds) from an OSM XML extract.
+    Only nodes and ways that map to a scored feature type are emitted.
+    """
+    coords: Dict[str, Tuple[float, float]] = {}
+    for _, elem in ET.iterparse(path, events=("end",)):
+        if elem.tag not in ("node", "way"):
+            continue
+        tags = {t.get("k"): t.get("v") for t in elem.findall("tag")}
+        if elem.tag == "node":
+            lat, lon = float(elem.get("lat")), float(elem.get("lon"))
+            coords[elem.get("id")] = (lat, lon)
+            if feature_type(tags):
+                yield {"type": "node", "id": int(elem.get("id")), "lat": lat, "lon": lon, "tags": tags}
+        elif feature_type(tags):
+            geometry = [
+                {"lat": coords[nd.get("ref")][0], "lon": coords[nd.get("ref")][1]}
+                for nd in elem.findall("nd") if nd.get("ref") in coords
+            ]
+            if geometry:
+                yield {
+                    "type": "way", "id": int(elem.get("id")), "tags": tags, "geometry": geometry,
+                    "bounds": {
+                        "minlat": min(p["lat"] for p in geometry), "maxlat": max(p["lat"] for p in geometry),
+                        "minlon": min(p["lon"] for p in geometry), "maxlon": max(p["lon"] for p in geometry),
+                    },
+                }
+        elem.clear()
+
+def load_elements(path: str) -> List[Dict[str, Any]]:
+    """Read an Overpass JSON dump (.json) or an OSM XML extract (.osm / .xml)."""
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("elements", [])
+    if path.endswith((".osm", ".xml")):
+        return list(_osm_xml_elements(path))
+    raise ValueError(f"Unsupported extract format: {path} (expected .json, .osm or .xml)")
+
+def write_snapshot(elements: List[Dict[str, Any]], out_path: str) -> FeatureSet:
+    features = FeatureSet(elements)
+    tmp_path = f"{out_path}.tmp"
+    features.save(tmp_path)
+    os.replace(tmp_path, out_path)  # Atomic swap so running workers never read a partial file
+    return features
+
+def refresh_from_overpass(out_path: str, bbox: Tuple[float, float, float, float] = CHENNAI_BBOX) -> FeatureSet:
+    """Download the whole city from Overpass and rewrite the snapshot (scheduled job)."""
+    elements = fetch_elements(bbox_query(*bbox, timeout=180), timeout=200)
+    return write_snapshot(elements, out_path)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Build the offline POI snapshot used for priority scoring")
+    parser.add_argument("--out", default=data_path(os.getenv("POI_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH)))
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="Import a local OSM XML extract or Overpass JSON dump")
+    imp.add_argument("path")
+    ref = sub.add_parser("refresh", help="Re-download POIs from Overpass")
+    ref.add_argument("--bbox", help="south,west,north,east (defaults to Chennai)")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        features = write_snapshot(load_elements(args.path), args.out)
+    else:
+        bbox = tuple(float(v) for v in args.bbox.split(",")) if args.bbox else CHENNAI_BBOX
+        features = refresh_from_overpass(args.out, bbox)
+    print(f"[OK] Wrote {len(features)} features to {args.out}")
+
+if __name__ == "__main__":
+    sys.exit(main())
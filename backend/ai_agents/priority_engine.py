@@ -0,0 +1,204 @@
+"""
+priority_engine.py
+Table-driven, vectorized priority scoring (single complaints and whole batches)
+
+The rules live in one table (DEFAULT_RULES, overridable with a JSON file
+at PRIORITY_RULES_PATH) so they can be tuned without code changes; the
+admin re-prioritization job reloads them and rescores every open
+complaint in one NumPy pass.
+"""
+
+import os
+import json
+import logging
+import threading
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+from ai_agents.keyword_matcher import KeywordMatcher
+from ai_agents.paths import data_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_PATH = "priority_rules.json"
+
+# Columns of the issue x location weight matrix; "Major Road" applies on top
+# of the location type whenever the pin is within major_road_km of one
+CONTEXTS = ("Hospital", "School", "Residential", "Major Road")
+
+DEFAULT_RULES: Dict[str, Any] = {
+    "base_scores": {"LOW": 25, "MEDIUM": 50, "HIGH": 75, "CRITICAL": 100},
+    "default_base_score": 50,
+    "hospital_km": 0.5,
+    "hospital_points": 30,
+    "major_road_km": 0.3,
+    "major_road_points": 20,
+    "school_points": 25,
+    "urgency_points": 25,
+    "density_above": 5,
+    "density_points": 15,
+    "frequency_above": 10,
+    "frequency_points": 0,
+    "max_score": 100.0,
+    # Lowest score for each level, checked top-down (anything lower is LOW)
+    "levels": [["CRITICAL", 85], ["HIGH", 65], ["MEDIUM", 40]],
+    # Extra points for an issue type in a location context (scenario matrix)
+    "issue_location_weights": {
+        "Potholes":          {"Hospital": 10, "School": 5, "Major Road": 10},
+        "Road Maintenance":  {"Hospital": 10, "School": 5, "Major Road": 10},
+        "Garbage":           {"Hospital": 10, "School": 10, "Residential": 5},
+        "Waste Management":  {"Hospital": 10, "School": 10, "Residential": 5},
+        "Broken Garbage Bin": {"Hospital": 5, "School": 5},
+        "Street Light":      {"School": 5, "Major Road": 10},
+        "Electricity":       {"Hospital": 10, "Major Road": 10},
+        "Water Stagnation":  {"Hospital": 15, "School": 10, "Residential": 5},
+        "Water Supply":      {"Hospital": 15, "Residential": 5},
+        "Storm Water Drain": {"Hospital": 10, "Major Road": 5},
+        "Sanitation":        {"Hospital": 15, "School": 10},
+        "Public Toilet":     {"Hospital": 10, "School": 10},
+        "Mosquito Menace":   {"Hospital": 15, "School": 10, "Residential": 5},
+        "Stray Dogs":        {"Hospital": 5, "School": 15},
+        "Dead Animals":      {"Hospital": 10, "School": 10, "Residential": 5},
+        "Fallen Tree":       {"Major Road": 15, "School": 5},
+        "Traffic":           {"School": 10, "Major Road": 15},
+        "Public Safety":     {"School": 15, "Major Road": 5},
+    },
+    "urgency_keywords": [
+        "urgent", "emergency", "danger", "dangerous", "accident", "injured", "fire",
+        "electrocution", "live wire", "collapsed", "flooded", "immediately",
+    ],
+}
+
+# Bit flags of the reason mask, in the order reasons are reported
+REASONS = ("Near hospital", "Near major road", "Near school", "Urgent keywords",
+           "High density", "Recurring issue", "Issue-location scenario")
+
+def reason_text(mask: int) -> str:
+    """Comma-separated reasons for a reason mask, as boost_priority reports them."""
+    return ", ".join(r for bit, r in enumerate(REASONS) if mask & (1 << bit)) or "Standard"
+
+class PriorityEngine:
+    """
+    Scores complaints from column arrays: every rule is a vectorized
+    comparison, and the issue x location scenario matrix is a single
+    fancy-indexed lookup, so tens of thousands of complaints score in one pass.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Any]] = None):
+        self._lock = threading.Lock()
+        self.set_rules(rules or DEFAULT_RULES)
+
+    @classmethod
+    def from_env(cls) -> "PriorityEngine":
+        engine = cls()
+        engine.reload()
+        return engine
+
+    def reload(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Re-read the rules file (relative paths are under DATA_DIR; defaults
+        when it does not exist); returns the active rules.
+        """
+        path = path or os.getenv("PRIORITY_RULES_PATH", DEFAULT_RULES_PATH)
+        path = data_path(path) if path else None
+        overrides = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    overrides = json.load(f)
+                logger.info(f"Loaded priority rules from {path}")
+            except Exception as e:
+                logger.error(f"Failed to load priority rules {path}: {e}")
+        else:
+            logger.info(f"No priority rules file at {path}; using the built-in rules")
+        self.set_rules({**DEFAULT_RULES, **overrides})
+        return self.rules
+
+    def set_rules(self, rules: Dict[str, Any]):
+        issues = list(rules.get("issue_location_weights", {}))
+        # Last row / column stay zero for unknown issue types / location types
+        weights = np.zeros((len(issues) + 1, len(CONTEXTS) + 1))
+        for i, issue in enumerate(issues):
+            for context, points in rules["issue_location_weights"][issue].items():
+                if context in CONTEXTS:
+                    weights[i, CONTEXTS.index(context)] = points
+        base = rules.get("base_scores", {})
+        with self._lock:
+            self.rules = rules
+            self._issue_codes = {issue: i for i, issue in enumerate(issues)}
+            self._weights = weights
+            self._base_levels = {level.upper(): float(points) for level, points in base.items()}
+            self._levels = sorted(rules.get("levels", []), key=lambda lv: -lv[1])
+
+    @staticmethod
+    def _codes(values: Iterable[Optional[str]], lookup: Dict[str, int], missing: int) -> np.ndarray:
+        return np.array([lookup.get(v, missing) if v is not None else missing for v in values], dtype=np.intp)
+
+    def score_batch(
+        self,
+        base_priorities: Sequence[Optional[str]],
+        location_types: Sequence[Optional[str]],
+        hospital_dists,
+        major_road_dists,
+        densities,
+        frequencies=None,
+        urgency=None,
+        issue_types: Optional[Sequence[Optional[str]]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(levels, scores, reason_masks) for N complaints given as columns."""
+        with self._lock:
+            rules, weights, issue_codes = self.rules, self._weights, self._issue_codes
+            base_levels, levels = self._base_levels, self._levels
+
+        n = len(base_priorities)
+        hospital = np.asarray(hospital_dists, dtype=np.float64)
+        road = np.asarray(major_road_dists, dtype=np.float64)
+        density = np.asarray(densities, dtype=np.float64)
+        frequency = np.zeros(n) if frequencies is None else np.asarray(frequencies, dtype=np.float64)
+        urgent = np.zeros(n, dtype=bool) if urgency is None else np.asarray(urgency, dtype=bool)
+        loc = self._codes(location_types, {c: i for i, c in enumerate(CONTEXTS[:-1])}, len(CONTEXTS))
+        issue = self._codes(issue_types if issue_types is not None else [None] * n, issue_codes, len(issue_codes))
+
+        default_base = float(rules["default_base_score"])
+        score = np.array([base_levels.get((b or "").upper(), default_base) for b in base_priorities], dtype=np.float64)
+
+        flags = [
+            (hospital < rules["hospital_km"], rules["hospital_points"]),
+            (road < rules["major_road_km"], rules["major_road_points"]),
+            (loc == CONTEXTS.index("School"), rules["school_points"]),
+            (urgent, rules["urgency_points"]),
+            (density > rules["density_above"], rules["density_points"]),
+            (frequency > rules["frequency_above"], rules["frequency_points"]),
+        ]
+        mask = np.zeros(n, dtype=np.uint8)
+        for bit, (hit, points) in enumerate(flags):
+            if not points:
+                continue
+            score += np.where(hit, points, 0.0)
+            mask |= np.where(hit, 1 << bit, 0).astype(np.uint8)
+
+        scenario = weights[issue, loc] + np.where(flags[1][0], weights[issue, CONTEXTS.index("Major Road")], 0.0)
+        score += scenario
+        mask |= np.where(scenario != 0, 1 << (len(REASONS) - 1), 0).astype(np.uint8)
+
+        score = np.minimum(score, float(rules["max_score"]))
+        level = np.full(n, "LOW", dtype=object)
+        for name, threshold in reversed(levels):
+            level[score >= threshold] = name
+        return level, score, mask
+
+    def score(self, base_priority: str, location_type: str, urgency_found: bool = False,
+              hospital_dist: float = 10.0, major_road_dist: float = 10.0, density: int = 0,
+              frequency: int = 0, issue_type: str = "General") -> Tuple[str, str, float]:
+        """Single complaint: (level, reasons, score), the boost_priority contract."""
+        level, score, mask = self.score_batch(
+            [base_priority], [location_type], [hospital_dist], [major_road_dist], [density],
+            [frequency], [urgency_found], [issue_type],
+        )
+        return str(level[0]), reason_text(int(mask[0])), float(score[0])
+
+    def urgency_matcher(self) -> KeywordMatcher:
+        """KeywordMatcher over the urgency keywords, for scoring descriptions in bulk."""
+        return KeywordMatcher({"urgent": self.rules.get("urgency_keywords", [])})
+
+priority_engine = PriorityEngine.from_env()
@@ -0,0 +1,261 @@
+"""
+priority_grid.py
+Precomputed per-cell location inputs for priority scoring (heatmap grid)
+
+Everything the priority preview needs that depends only on location
+(nearest hospital / school / major road and complaint density) is
+precomputed for ~100 m cells across the city and stored as one .npz:
+
+    python -m ai_agents.priority_grid --snapshot poi_snapshot.npz --out priority_grid.npz
+"""
+
+import os
+import sys
+import argparse
+import threading
+from math import ceil, cos, radians
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from ai_agents.chennai_locations import CHENNAI_BBOX
+from ai_agents.distance import haversine_many
+from ai_agents.paths import data_path
+from ai_agents.poi_features import FEATURE_TYPES, FEATURE_RADIUS_KM, NO_FEATURE_DIST, FeatureSet
+from ai_agents.spatial import KM_PER_DEG
+
+DEFAULT_GRID_PATH = "priority_grid.npz"
+DEFAULT_CELL_M = 100.0
+# Same radius the live preview uses for complaint density
+DENSITY_RADIUS_KM = 2.0
+# Feature types that feed location type / priority, one distance + name layer each
+GRID_TYPES = ("Hospital", "School", "Major Road")
+
+class PriorityGrid:
+    """
+    Regular lat/lon grid over a bounding box (south, west, north, east).
+    Static layers hold, per cell center, the same nearest-feature distance
+    and name FeatureSet.nearest would return there; the density layer is the
+    number of complaints within DENSITY_RADIUS_KM and is updated in place.
+
+    Layers are filled by patching only the cells within reach of each
+    feature / complaint, so a build costs O(features x cells per radius)
+    rather than a nearest() call per cell.
+    """
+
+    def __init__(self, bbox: Tuple[float, float, float, float] = CHENNAI_BBOX, cell_m: float = DEFAULT_CELL_M):
+        self.bbox = tuple(float(v) for v in bbox)
+        self.cell_m = float(cell_m)
+        south, west, north, east = self.bbox
+        self.cell_lat = self.cell_m / 1000 / KM_PER_DEG
+        self.cell_lon = self.cell_lat / cos(radians((south + north) / 2))
+        self.rows = max(1, ceil((north - south) / self.cell_lat))
+        self.cols = max(1, ceil((east - west) / self.cell_lon))
+        self.center_lats = south + (np.arange(self.rows) + 0.5) * self.cell_lat
+        self.center_lons = west + (np.arange(self.cols) + 0.5) * self.cell_lon
+
+        shape = (len(GRID_TYPES), self.rows, self.cols)
+        self.dists = np.full(shape, NO_FEATURE_DIST, dtype=np.float32)
+        self.name_idx = np.full(shape, -1, dtype=np.int32)
+        self.names = np.array([], dtype=str)
+        self.density = np.zeros((self.rows, self.cols), dtype=np.int32)
+        self._lock = threading.Lock()
+
+    # ---- geometry ----
+
+    def cell(self, lat: float, lon: float) -> Optional[Tuple[int, int]]:
+        south, west, _, _ = self.bbox
+        row, col = int((lat - south) // self.cell_lat), int((lon - west) // self.cell_lon)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    def _patch(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float, radius_km: float) -> Tuple[slice, slice]:
+        """Row / column slices of every cell center within radius_km of a box."""
+        south, west, _, _ = self.bbox
+        dlat = radius_km / KM_PER_DEG * 1.01
+        dlon = dlat / cos(radians(max(abs(min_lat - dlat), abs(max_lat + dlat))))
+        r0 = max(0, int((min_lat - dlat - south) // self.cell_lat))
+        r1 = min(self.rows, int((max_lat + dlat - south) // self.cell_lat) + 1)
+        c0 = max(0, int((min_lon - dlon - west) // self.cell_lon))
+        c1 = min(self.cols, int((max_lon + dlon - west) // self.cell_lon) + 1)
+        return slice(r0, max(r0, r1)), slice(c0, max(c0, c1))
+
+    def _patch_dists(self, rs: slice, cs: slice, lat: float, lon: float) -> np.ndarray:
+        return haversine_many(lat, lon, self.center_lats[rs, None], self.center_lons[None, cs])
+
+    def _patch_segment_dists(self, rs: slice, cs: slice, a_lat, a_lon, b_lat, b_lon) -> np.ndarray:
+        """spatial.point_segment_distances evaluated from every cell center of a patch."""
+        lat, lon = self.center_lats[rs, None], self.center_lons[None, cs]
+        kx = KM_PER_DEG * np.cos(np.radians(lat))
+        ax, ay = (a_lon - lon) * kx, (a_lat - lat) * KM_PER_DEG
+        bx, by = (b_lon - lon) * kx, (b_lat - lat) * KM_PER_DEG
+        dx, dy = bx - ax, by - ay
+        len2 = dx * dx + dy * dy
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.where(len2 > 0, -(ax * dx + ay * dy) / len2, 0.0)
+        t = np.clip(t, 0.0, 1.0)
+        return np.hypot(ax + t * dx, ay + t * dy)
+
+    # ---- static layers ----
+
+    def build_static(self, features: FeatureSet):
+        """Fill the distance / name layers from a city-wide FeatureSet (e.g. the POI snapshot)."""
+        shape = (len(GRID_TYPES), self.rows, self.cols)
+        best = np.full(shape, np.inf)
+        owner = np.full(shape, -1, dtype=np.intp)
+        bounds = features.bounds()
+        ends = features._vertex_ends()
+        geometry = dict(zip(features.v_owners.tolist(), zip(features.v_starts.tolist(), ends.tolist())))
+
+        def offer(layer, rs, cs, dist, reach, radius, i):
+            b, o = best[layer, rs, cs], owner[layer, rs, cs]
+            better = (reach <= radius) & (dist < b)
+            b[better] = dist[better]
+            o[better] = i
+
+        # Points and areas: distance to the center, reach through the closest vertex
+        for layer, m_type in enumerate(GRID_TYPES):
+            radius = FEATURE_RADIUS_KM[m_type]
+            for i in np.flatnonzero(features.types == FEATURE_TYPES.index(m_type)):
+                if m_type == "Major Road" and i in geometry:
+                    continue
+                rs, cs = self._patch(*bounds[i], radius)
+                dist = self._patch_dists(rs, cs, features.lats[i], features.lons[i])
+                reach = dist
+                if i in geometry:
+                    start, end = geometry[i]
+                    reach = np.minimum.reduce([
+                        self._patch_dists(rs, cs, features.v_lats[v], features.v_lons[v]) for v in range(start, end)
+                    ])
+                offer(layer, rs, cs, dist, reach, radius, i)
+
+        # Major roads with geometry: nearest segment, in feature order like FeatureSet.nearest
+        layer, radius = GRID_TYPES.index("Major Road"), FEATURE_RADIUS_KM["Major Road"]
+        a_idx, b_idx, owners, _ = features._road_segments()
+        for a, b, i in zip(a_idx.tolist(), b_idx.tolist(), owners.tolist()):
+            a_lat, a_lon, b_lat, b_lon = features.v_lats[a], features.v_lons[a], features.v_lats[b], features.v_lons[b]
+            rs, cs = self._patch(min(a_lat, b_lat), max(a_lat, b_lat), min(a_lon, b_lon), max(a_lon, b_lon), radius)
+            dist = self._patch_segment_dists(rs, cs, a_lat, a_lon, b_lat, b_lon)
+            offer(layer, rs, cs, dist, dist, radius, i)
+
+        used = owner >= 0
+        names, inverse = np.unique(features.names[owner[used]], return_inverse=True)
+        with self._lock:
+            self.dists = np.where(used, best, NO_FEATURE_DIST).astype(np.float32)
+            self.name_idx = np.full(shape, -1, dtype=np.int32)
+            self.name_idx[used] = inverse
+            self.names = names
+
+    # ---- density layer ----
+
+    def add_complaints(self, points: Iterable[Tuple[Optional[float], Optional[float]]], delta: int = 1):
+        """Add (or with delta=-1, remove) complaints at (lat, lon) to the density layer."""
+        with self._lock:
+            for lat, lon in points:
+                if lat is None or lon is None:
+                    continue
+                rs, cs = self._patch(lat, lat, lon, lon, DENSITY_RADIUS_KM)
+                if rs.start == rs.stop or cs.start == cs.stop:
+                    continue
+                self.density[rs, cs] += delta * (self._patch_dists(rs, cs, lat, lon) <= DENSITY_RADIUS_KM)
+
+    def rebuild_density(self, points: Iterable[Tuple[Optional[float], Optional[float]]]):
+        with self._lock:
+            self.density[:] = 0
+        self.add_complaints(points)
+
+    # ---- lookups ----
+
+    def _name(self, idx: int) -> Optional[str]:
+        return str(self.names[idx]) if idx >= 0 else None
+
+    def nearest(self, lat: float, lon: float) -> Optional[Dict[str, Tuple[float, Optional[str]]]]:
+        """FeatureSet.nearest-style {type: (dist_km, name)} for the cell containing the pin."""
+        cell = self.cell(lat, lon)
+        if cell is None:
+            return None
+        nearest = {t: (NO_FEATURE_DIST, None) for t in FEATURE_TYPES}
+        for layer, m_type in enumerate(GRID_TYPES):
+            nearest[m_type] = (float(self.dists[layer][cell]), self._name(int(self.name_idx[layer][cell])))
+        return nearest
+
+    def density_at(self, lat: float, lon: float) -> Optional[int]:
+        cell = self.cell(lat, lon)
+        return int(self.density[cell]) if cell is not None else None
+
+    def sample(self, lats, lons) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized cell lookup for N pins: (dists (len(GRID_TYPES), N), inside (N,)).
+        Pins outside the grid get NO_FEATURE_DIST and inside=False.
+        """
+        south, west, _, _ = self.bbox
+        lats, lons = np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64)
+        rows = np.floor((lats - south) / self.cell_lat).astype(np.int64)
+        cols = np.floor((lons - west) / self.cell_lon).astype(np.int64)
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        dists = np.full((len(GRID_TYPES), len(lats)), NO_FEATURE_DIST, dtype=np.float64)
+        dists[:, inside] = self.dists[:, rows[inside], cols[inside]]
+        return dists, inside
+
+    def window(self, south: float, west: float, north: float, east: float, max_cells: int = 64) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Layers for the cells inside a bounding box, sampled with a stride so
+        neither side exceeds max_cells. None if the box misses the grid.
+        """
+        rs, cs = self._patch(south, north, west, east, 0.0)
+        if rs.start >= rs.stop or cs.start >= cs.stop:
+            return None
+        r_step = max(1, ceil((rs.stop - rs.start) / max_cells))
+        c_step = max(1, ceil((cs.stop - cs.start) / max_cells))
+        rs, cs = slice(rs.start, rs.stop, r_step), slice(cs.start, cs.stop, c_step)
+        return {
+            "lats": self.center_lats[rs],
+            "lons": self.center_lons[cs],
+            "cell_lat": self.cell_lat * r_step,
+            "cell_lon": self.cell_lon * c_step,
+            "dists": self.dists[:, rs, cs],
+            "name_idx": self.name_idx[:, rs, cs],
+            "density": self.density[rs, cs].copy(),
+        }
+
+    # ---- persistence ----
+
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f, bbox=np.array(self.bbox), cell_m=np.array(self.cell_m), dists=self.dists,
+                name_idx=self.name_idx, names=self.names, density=self.density,
+            )
+        os.replace(tmp_path, path)  # Atomic swap so running workers never read a partial file
+
+    @classmethod
+    def load(cls, path: str) -> "PriorityGrid":
+        with np.load(path, allow_pickle=False) as data:
+            grid = cls(tuple(data["bbox"].tolist()), float(data["cell_m"]))
+            grid.dists, grid.name_idx, grid.names = data["dists"], data["name_idx"], data["names"]
+            grid.density = data["density"].astype(np.int32)
+        return grid
+
+def build_grid(snapshot_path: str, out_path: str, cell_m: float = DEFAULT_CELL_M,
+               bbox: Tuple[float, float, float, float] = CHENNAI_BBOX) -> PriorityGrid:
+    grid = PriorityGrid(bbox, cell_m)
+    grid.build_static(FeatureSet.load(snapshot_path))
+    grid.save(out_path)
+    return grid
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Precompute the priority heatmap grid from the POI snapshot")
+    # Defaults are the files the app loads (under DATA_DIR); explicit arguments are taken as given
+    parser.add_argument("--snapshot", default=data_path(os.getenv("POI_SNAPSHOT_PATH", "poi_snapshot.npz")))
+    parser.add_argument("--out", default=data_path(os.getenv("PRIORITY_GRID_PATH", DEFAULT_GRID_PATH)))
+    parser.add_argument("--cell-m", type=float, default=DEFAULT_CELL_M)
+    parser.add_argument("--bbox", help="south,west,north,east (defaults to Chennai)")
+    args = parser.parse_args(argv)
+
+    bbox = tuple(float(v) for v in args.bbox.split(",")) if args.bbox else CHENNAI_BBOX
+    grid = build_grid(args.snapshot, args.out, args.cell_m, bbox)
+    print(f"[OK] Wrote {grid.rows}x{grid.cols} grid ({grid.cell_m:.0f} m cells) to {args.out}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+spatial.py
+Bulk-loaded STR R-tree and point-to-segment distance kernels
+"""
+
+from math import ceil, sqrt, cos, radians
+import numpy as np
+from ai_agents.distance import EARTH_RADIUS_KM
+
+KM_PER_DEG = np.pi * EARTH_RADIUS_KM / 180
+
+def _str_order(cx: np.ndarray, cy: np.ndarray, capacity: int) -> np.ndarray:
+    """Sort-Tile-Recursive ordering: vertical slices by x, each sorted by y."""
+    n = len(cx)
+    slices = ceil(sqrt(ceil(n / capacity)))
+    slice_size = slices * capacity
+    by_x = np.argsort(cx, kind="stable")
+    chunks = [by_x[s:s + slice_size] for s in range(0, n, slice_size)]
+    return np.concatenate([c[np.argsort(cy[c], kind="stable")] for c in chunks])
+
+def _expand(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Concatenate the ranges [start, end) without a Python loop."""
+    lengths = ends - starts
+    return np.repeat(ends - np.cumsum(lengths), lengths) + np.arange(lengths.sum())
+
+def _union(boxes: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    return np.column_stack([
+        np.minimum.reduceat(boxes[:, 0], starts),
+        np.maximum.reduceat(boxes[:, 1], starts),
+        np.minimum.reduceat(boxes[:, 2], starts),
+        np.maximum.reduceat(boxes[:, 3], starts),
+    ])
+
+class STRTree:
+    """
+    Static R-tree over axis-aligned boxes (min_lat, max_lat, min_lon, max_lon),
+    packed with Sort-Tile-Recursive bulk loading. Each level is stored as
+    flat NumPy arrays and searched one level at a time.
+    """
+
+    def __init__(self, boxes, capacity: int = 16):
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        self.capacity = capacity
+        self.levels = []  # bottom-up: (node_boxes, child_starts, child_ends)
+        if not len(boxes):
+            self.items = np.array([], dtype=np.intp)
+            self.item_boxes = boxes
+            return
+
+        centers_y = (boxes[:, 0] + boxes[:, 1]) / 2
+        centers_x = (boxes[:, 2] + boxes[:, 3]) / 2
+        self.items = _str_order(centers_x, centers_y, capacity)
+        self.item_boxes = boxes[self.items]
+
+        level_boxes = self.item_boxes
+        while True:
+            starts = np.arange(0, len(level_boxes), capacity)
+            ends = np.minimum(starts + capacity, len(level_boxes))
+            node_boxes = _union(level_boxes, starts)
+            if len(node_boxes) > 1:
+                order = _str_order((node_boxes[:, 2] + node_boxes[:, 3]) / 2, (node_boxes[:, 0] + node_boxes[:, 1]) / 2, capacity)
+                node_boxes, starts, ends = node_boxes[order], starts[order], ends[order]
+            self.levels.append((node_boxes, starts, ends))
+            if len(node_boxes) == 1:
+                break
+            level_boxes = node_boxes
+
+    def __len__(self):
+        return len(self.items)
+
+    def query(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> np.ndarray:
+        """Indices of the input boxes that intersect the query box."""
+        if not len(self.items):
+            return self.items
+
+        def hits(boxes, idx):
+            b = boxes[idx]
+            return idx[(b[:, 0] <= max_lat) & (b[:, 1] >= min_lat) & (b[:, 2] <= max_lon) & (b[:, 3] >= min_lon)]
+
+        nodes = np.arange(len(self.levels[-1][0]))
+        for node_boxes, starts, ends in reversed(self.levels):
+            nodes = hits(node_boxes, nodes)
+            if not nodes.size:
+                return np.array([], dtype=np.intp)
+            nodes = _expand(starts[nodes], ends[nodes])
+        return self.items[hits(self.item_boxes, nodes)]
+
+def query_box(lat: float, lon: float, radius_km: float):
+    """(min_lat, max_lat, min_lon, max_lon) comfortably enclosing a small search circle."""
+    dlat = radius_km / KM_PER_DEG * 1.01
+    dlon = dlat / cos(radians(lat))
+    return lat - dlat, lat + dlat, lon - dlon, lon + dlon
+
+def point_segment_distances(lat: float, lon: float, a_lats, a_lons, b_lats, b_lons) -> np.ndarray:
+    """
+    Distance in km from a point to each segment A-B, measured in a local
+    equirectangular projection centred on the point (sub-metre error at
+    city scale).
+    """
+    kx = KM_PER_DEG * cos(radians(lat))
+    ax, ay = (np.asarray(a_lons) - lon) * kx, (np.asarray(a_lats) - lat) * KM_PER_DEG
+    bx, by = (np.asarray(b_lons) - lon) * kx, (np.asarray(b_lats) - lat) * KM_PER_DEG
+    dx, dy = bx - ax, by - ay
+    len2 = dx * dx + dy * dy
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = np.where(len2 > 0, -(ax * dx + ay * dy) / len2, 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    return np.hypot(ax + t * dx, ay + t * dy)
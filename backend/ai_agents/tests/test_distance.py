@@ -0,0 +1,30 @@
+"""
+Vectorized haversine kernels must agree with the scalar implementation.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from ai_agents.distance import haversine, haversine_many, haversine_matrix
+
+
+def test_one_to_many_matches_scalar():
+    rng = np.random.default_rng(3)
+    lats = rng.uniform(12.8, 13.3, 500)
+    lons = rng.uniform(80.0, 80.4, 500)
+    dists = haversine_many(13.0827, 80.2707, lats, lons)
+    expected = [haversine(13.0827, 80.2707, la, lo) for la, lo in zip(lats, lons)]
+    assert np.allclose(dists, expected, rtol=0, atol=1e-9)
+
+
+def test_matrix_shape_and_values():
+    lats1, lons1 = [13.0, 13.1], [80.2, 80.3]
+    lats2, lons2 = [12.9, 13.0, 13.2], [80.1, 80.2, 80.25]
+    matrix = haversine_matrix(lats1, lons1, lats2, lons2)
+    assert matrix.shape == (2, 3)
+    assert matrix[0, 1] == 0.0
+    assert np.isclose(matrix[1, 2], haversine(13.1, 80.3, 13.2, 80.25))
@@ -0,0 +1,61 @@
+"""
+Compiled keyword matcher tests.
+"""
+
+import os
+import sys
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from ai_agents.keyword_matcher import KeywordMatcher
+from ai_agents.geo_agent import CHENNAI_ZONE_MAPPING, ZONE_MATCHER
+
+TABLE = {
+    "Stray Dogs": ["stray dog", "dog", "naai thollai"],
+    "Road Maintenance": ["pothole", "road"],
+    "Water Supply": ["water", "no water", "pipe"],
+}
+
+
+def test_counts_and_best_category():
+    matcher = KeywordMatcher(TABLE)
+    text = "Pothole on the ROAD near the water pipe, and a stray dog"
+    assert matcher.match(text) == {"Road Maintenance": 2, "Water Supply": 2, "Stray Dogs": 1}
+    # Tie between Road Maintenance and Water Supply goes to the earlier table entry
+    assert matcher.classify(text) == "Road Maintenance"
+    # Best match rather than first: one dog vs two water terms
+    assert matcher.classify("dog drinking from a leaking water pipe") == "Water Supply"
+    assert matcher.classify("nothing relevant", default="General") == "General"
+    assert matcher.classify("") is None
+
+
+def test_longest_term_wins_at_same_position():
+    matcher = KeywordMatcher(TABLE)
+    assert matcher.match("no water since monday") == {"Water Supply": 1}
+    assert matcher.match("stray dogs") == {"Stray Dogs": 1}
+
+
+def test_runtime_extension():
+    matcher = KeywordMatcher(TABLE)
+    assert matcher.classify("mosquito breeding") is None
+    matcher.add_keywords("Mosquito Menace", ["mosquito", "breeding"])
+    matcher.add_keywords("Stray Dogs", ["naai"])
+    assert matcher.classify("mosquito breeding") == "Mosquito Menace"
+    assert matcher.match("naai iruku") == {"Stray Dogs": 1}
+    assert matcher.categories[-1] == "Mosquito Menace"
+
+
+def test_batch_matches_single_scans():
+    matcher = KeywordMatcher(TABLE)
+    words = ["road", "dog", "pipe", "water", "pothole", "hello", "no", "stray", "\x00", "naai thollai"]
+    rng = random.Random(3)
+    texts = [" ".join(rng.choice(words) for _ in range(rng.randint(0, 8))) for _ in range(200)] + [None]
+    assert matcher.match_many(texts) == [matcher.match(t) for t in texts]
+    assert matcher.classify_many(texts, default="General") == [matcher.classify(t, default="General") for t in texts]
+
+
+def test_zone_matcher_agrees_with_single_locality_hits():
+    for zone, localities in CHENNAI_ZONE_MAPPING.items():
+        for locality in localities:
+            assert ZONE_MATCHER.classify(f"Issue near {locality.title()} bus stop") == zone
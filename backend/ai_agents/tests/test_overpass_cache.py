@@ -0,0 +1,144 @@
+"""
+Tile cache tests using a fake Overpass backend (no network).
+"""
+
+import os
+import sys
+import random
+from math import cos, radians, hypot
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from ai_agents.distance import haversine
+from ai_agents.overpass_cache import OverpassTileCache
+from ai_agents.poi_features import FeatureSet
+
+
+def synthetic_elements(n=400, seed=5):
+    rng = random.Random(seed)
+    elements = []
+    for i in range(n):
+        lat, lon = rng.uniform(12.95, 13.15), rng.uniform(80.15, 80.30)
+        kind = rng.choice(["hospital", "school", "college", "road"])
+        if kind == "road":
+            geometry = [{"lat": lat + k * 0.004, "lon": lon + k * 0.003} for k in range(6)]
+            elements.append({
+                "type": "way", "id": i, "tags": {"highway": "primary", "name": f"Road {i}"},
+                "bounds": {
+                    "minlat": min(p["lat"] for p in geometry), "maxlat": max(p["lat"] for p in geometry),
+                    "minlon": min(p["lon"] for p in geometry), "maxlon": max(p["lon"] for p in geometry),
+                },
+                "geometry": geometry,
+            })
+        else:
+            elements.append({"type": "node", "id": i, "lat": lat, "lon": lon, "tags": {"amenity": kind, "name": f"{kind} {i}"}})
+    return elements
+
+
+def segment_distance(lat, lon, a, b):
+    """Scalar reference for point-to-segment distance in km."""
+    k = 6371.0 * 3.141592653589793 / 180
+    ax, ay = (a["lon"] - lon) * k * cos(radians(lat)), (a["lat"] - lat) * k
+    bx, by = (b["lon"] - lon) * k * cos(radians(lat)), (b["lat"] - lat) * k
+    dx, dy = bx - ax, by - ay
+    t = 0.0 if dx == dy == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / (dx * dx + dy * dy)))
+    return hypot(ax + t * dx, ay + t * dy)
+
+
+def road_distance(lat, lon, geometry):
+    return min(segment_distance(lat, lon, a, b) for a, b in zip(geometry, geometry[1:]))
+
+
+def live_point_query(elements, lat, lon):
+    """What Overpass' around: filters would return for a pin (roads come back with geometry)."""
+    hits = []
+    for el in elements:
+        if "geometry" in el:
+            if road_distance(lat, lon, el["geometry"]) <= 1.0:
+                hits.append(el)
+        elif haversine(lat, lon, el["lat"], el["lon"]) <= 2.0:
+            hits.append(el)
+    return hits
+
+
+class FakeOverpass:
+    def __init__(self, elements):
+        self.elements = elements
+        self.calls = 0
+
+    def __call__(self, query):
+        self.calls += 1
+        return self.elements
+
+
+def test_tile_results_match_live_point_query(tmp_path):
+    elements = synthetic_elements()
+    cache = OverpassTileCache(path=str(tmp_path / "tiles.sqlite"), fetch=FakeOverpass(elements))
+    rng = random.Random(9)
+    for _ in range(40):
+        lat, lon = rng.uniform(13.0, 13.1), rng.uniform(80.2, 80.25)
+        live = FeatureSet(live_point_query(elements, lat, lon), prefiltered=True).nearest(lat, lon)
+        assert cache.features_for(lat, lon).nearest(lat, lon) == live
+
+
+def test_hits_misses_and_disk_persistence(tmp_path):
+    path = str(tmp_path / "tiles.sqlite")
+    fake = FakeOverpass(synthetic_elements(50))
+    cache = OverpassTileCache(path=path, fetch=fake)
+    cache.features_for(13.0412, 80.2331)
+    cache.features_for(13.0415, 80.2336)  # same tile
+    assert fake.calls == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    reopened = OverpassTileCache(path=path, fetch=fake)
+    reopened.features_for(13.0413, 80.2332)
+    assert fake.calls == 1
+    assert reopened.stats()["hits"] == 1
+
+
+def test_expired_tiles_and_failures_are_refetched(tmp_path):
+    fake = FakeOverpass(synthetic_elements(50))
+    cache = OverpassTileCache(path=str(tmp_path / "tiles.sqlite"), ttl_seconds=0, fetch=fake)
+    cache.features_for(13.0412, 80.2331)
+    cache.features_for(13.0412, 80.2331)
+    assert fake.calls == 2
+
+    def broken(query):
+        raise OSError("overpass down")
+
+    failing = OverpassTileCache(path=str(tmp_path / "other.sqlite"), fetch=broken)
+    assert len(failing.features_for(13.0412, 80.2331)) == 0
+    assert failing.stats()["errors"] == 1
+
+
+def test_async_lookup_matches_sync(tmp_path):
+    import asyncio
+    fake = FakeOverpass(synthetic_elements(100))
+    sync_cache = OverpassTileCache(path=str(tmp_path / "a.sqlite"), fetch=fake)
+    async_cache = OverpassTileCache(path=str(tmp_path / "b.sqlite"), fetch=fake)
+    pins = [(13.0412, 80.2331), (13.0415, 80.2336), (13.07, 80.26)]
+    for lat, lon in pins:
+        expected = sync_cache.features_for(lat, lon).nearest(lat, lon)
+        assert asyncio.run(async_cache.features_for_async(lat, lon)).nearest(lat, lon) == expected
+    assert async_cache.stats()["misses"] == 2 and async_cache.stats()["hits"] == 1
+
+
+def test_relative_cache_path_is_anchored_to_data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    (tmp_path / "data").mkdir()
+    monkeypatch.chdir(tmp_path)
+    cache = OverpassTileCache(path="tiles.sqlite", fetch=FakeOverpass([]))
+    assert cache.path == str(tmp_path / "data" / "tiles.sqlite")
+    assert (tmp_path / "data" / "tiles.sqlite").exists() and not (tmp_path / "tiles.sqlite").exists()
+
+
+def test_app_and_agents_share_one_data_path_helper(tmp_path, monkeypatch):
+    from app.core.config import data_path as app_data_path
+    from ai_agents.paths import BACKEND_DIR, data_path
+
+    assert app_data_path is data_path
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    assert data_path("x.npz") == str(tmp_path / "x.npz")
+    assert data_path("/abs/x.npz") == "/abs/x.npz" and data_path(":memory:") == ":memory:"
+    monkeypatch.setenv("DATA_DIR", "")
+    assert data_path("x.npz") == os.path.join(BACKEND_DIR, "x.npz")
@@ -0,0 +1,77 @@
+"""
+Offline POI snapshot must give the same metrics as the live Overpass path.
+"""
+
+import os
+import sys
+import json
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+sys.path.append(os.path.dirname(__file__))
+
+from ai_agents.poi_features import FeatureSet
+from ai_agents.poi_snapshot import POISnapshot, load_elements, main
+from test_overpass_cache import synthetic_elements, live_point_query
+
+
+def write_osm_xml(path, elements):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<osm version="0.6">']
+    node_id = 10_000_000
+    ways = []
+    for el in elements:
+        tags = "".join(f'<tag k="{k}" v="{v}"/>' for k, v in el["tags"].items())
+        if el["type"] == "node":
+            lines.append(f'<node id="{el["id"]}" lat="{el["lat"]}" lon="{el["lon"]}">{tags}</node>')
+        else:
+            refs = []
+            for p in el["geometry"]:
+                node_id += 1
+                refs.append(node_id)
+                lines.append(f'<node id="{node_id}" lat="{p["lat"]}" lon="{p["lon"]}"/>')
+            nds = "".join(f'<nd ref="{r}"/>' for r in refs)
+            ways.append(f'<way id="{el["id"]}">{nds}{tags}</way>')
+    lines.extend(ways)
+    lines.append("</osm>")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+def test_snapshot_matches_live_metrics(tmp_path):
+    elements = synthetic_elements(600, seed=21)
+    dump = tmp_path / "dump.json"
+    dump.write_text(json.dumps({"elements": elements}))
+    out = tmp_path / "poi_snapshot.npz"
+    main(["--out", str(out), "import", str(dump)])
+
+    snapshot = POISnapshot.load(str(out))
+    rng = random.Random(4)
+    for _ in range(60):
+        lat, lon = rng.uniform(12.96, 13.14), rng.uniform(80.16, 80.29)
+        live = FeatureSet(live_point_query(elements, lat, lon), prefiltered=True).nearest(lat, lon)
+        assert snapshot.features_for(lat, lon).nearest(lat, lon) == live
+
+
+def test_osm_xml_extract_imports_same_features(tmp_path):
+    elements = synthetic_elements(80, seed=2)
+    extract = tmp_path / "chennai.osm"
+    write_osm_xml(extract, elements)
+
+    from_xml = FeatureSet(load_elements(str(extract)))
+    from_json = FeatureSet(elements)
+    assert len(from_xml) == len(from_json)
+    assert from_xml.nearest(13.05, 80.22) == from_json.nearest(13.05, 80.22)
+
+
+def test_default_snapshot_path_is_anchored_to_data_dir(tmp_path, monkeypatch):
+    dump = tmp_path / "dump.json"
+    dump.write_text(json.dumps({"elements": synthetic_elements(40, seed=3)}))
+    (tmp_path / "data").mkdir()
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.delenv("POI_SNAPSHOT_PATH", raising=False)
+    monkeypatch.chdir(tmp_path)
+    # Written and found under DATA_DIR, wherever the process was started
+    main(["import", str(dump)])
+    assert (tmp_path / "data" / "poi_snapshot.npz").exists() and not (tmp_path / "poi_snapshot.npz").exists()
+    snapshot = POISnapshot.from_env()
+    assert snapshot is not None and len(snapshot.features) > 0
@@ -0,0 +1,99 @@
+"""
+Table-driven priority engine: batch scoring, legacy parity and scenario weights.
+"""
+
+import os
+import sys
+import random
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from ai_agents.geo_agent import SmartPriorityBooster
+from ai_agents.priority_engine import PriorityEngine, DEFAULT_RULES
+
+
+def legacy_boost(base_priority, location_type, urgency_found, hospital_dist, major_road_dist, density):
+    """The hard-coded booster the rule table replaced."""
+    score = {"LOW": 25, "MEDIUM": 50, "HIGH": 75, "CRITICAL": 100}.get(base_priority.upper(), 50)
+    reasons = []
+    if hospital_dist < 0.5: score += 30; reasons.append("Near hospital")
+    if major_road_dist < 0.3: score += 20; reasons.append("Near major road")
+    if location_type == "School": score += 25; reasons.append("Near school")
+    if urgency_found: score += 25; reasons.append("Urgent keywords")
+    if density > 5: score += 15; reasons.append("High density")
+    score = min(score, 100)
+    level = "CRITICAL" if score >= 85 else "HIGH" if score >= 65 else "MEDIUM" if score >= 40 else "LOW"
+    return level, ", ".join(reasons) or "Standard", score
+
+
+def random_inputs(rng, n):
+    issues = list(DEFAULT_RULES["issue_location_weights"]) + ["General", None]
+    return dict(
+        base_priorities=[rng.choice(["LOW", "MEDIUM", "HIGH", "CRITICAL", "medium", None]) for _ in range(n)],
+        location_types=[rng.choice(["Hospital", "School", "Residential", "Unknown"]) for _ in range(n)],
+        hospital_dists=[rng.uniform(0, 2) for _ in range(n)],
+        major_road_dists=[rng.uniform(0, 1) for _ in range(n)],
+        densities=[rng.randint(0, 12) for _ in range(n)],
+        frequencies=[rng.randint(0, 20) for _ in range(n)],
+        urgency=[rng.random() < 0.3 for _ in range(n)],
+        issue_types=[rng.choice(issues) for _ in range(n)],
+    )
+
+
+def test_batch_matches_single_scoring():
+    engine = PriorityEngine({**DEFAULT_RULES, "frequency_points": 10})
+    cols = random_inputs(random.Random(4), 500)
+    levels, scores, _ = engine.score_batch(**cols)
+    for i in range(500):
+        level, _, score = engine.score(
+            cols["base_priorities"][i],
+            cols["location_types"][i], cols["urgency"][i], cols["hospital_dists"][i],
+            cols["major_road_dists"][i], cols["densities"][i], cols["frequencies"][i], cols["issue_types"][i],
+        )
+        assert (levels[i], scores[i]) == (level, score)
+
+
+def test_unweighted_issue_reproduces_legacy_booster():
+    rng = random.Random(9)
+    booster = SmartPriorityBooster(PriorityEngine())
+    for _ in range(300):
+        args = (
+            rng.choice(["LOW", "MEDIUM", "HIGH", "CRITICAL"]), rng.choice(["Hospital", "School", "Residential"]),
+            rng.random() < 0.5, rng.uniform(0, 1), rng.uniform(0, 0.6), rng.randint(0, 10),
+        )
+        level, reasons, score = booster.boost_priority(
+            args[0], args[1], args[2], hospital_dist=args[3], major_road_dist=args[4], density=args[5], issue_type="General"
+        )
+        assert (level, reasons, score) == legacy_boost(*args)
+
+
+def test_issue_location_weights_apply():
+    engine = PriorityEngine({**DEFAULT_RULES, "issue_location_weights": {"Garbage": {"Residential": 20, "Major Road": 7}}})
+    assert engine.score("LOW", "Residential", issue_type="Garbage")[2] == 45
+    assert engine.score("LOW", "Residential", issue_type="Potholes")[2] == 25
+    # Major Road weight stacks with the location type when the pin is near one
+    level, reasons, score = engine.score("LOW", "Residential", major_road_dist=0.1, issue_type="Garbage")
+    assert score == 25 + 20 + 20 + 7 and level == "HIGH"
+    assert reasons == "Near major road, Issue-location scenario"
+    levels, _, _ = engine.score_batch(["LOW"] * 2, ["Residential"] * 2, [5, 5], [5, 5], [0, 0], issue_types=["Garbage", None])
+    assert list(levels) == ["MEDIUM", "LOW"]
+    assert np.all(engine.score_batch(["MEDIUM"], ["School"], [5], [5], [0], issue_types=["Garbage"])[1] == 75)
+
+
+def test_rules_file_is_read_from_data_dir(tmp_path, monkeypatch, caplog):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "priority_rules.json").write_text('{"urgency_keywords": ["sinkhole"]}')
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.delenv("PRIORITY_RULES_PATH", raising=False)
+    monkeypatch.chdir(tmp_path)  # not the working directory
+    engine = PriorityEngine()
+    with caplog.at_level("INFO", logger="ai_agents.priority_engine"):
+        assert engine.reload()["urgency_keywords"] == ["sinkhole"]
+    assert str(tmp_path / "data" / "priority_rules.json") in caplog.text
+
+    monkeypatch.setenv("PRIORITY_RULES_PATH", "missing.json")
+    with caplog.at_level("INFO", logger="ai_agents.priority_engine"):
+        assert engine.reload() == DEFAULT_RULES
+    assert "using the built-in rules" in caplog.text
@@ -0,0 +1,80 @@
+"""
+Precomputed priority grid must agree with FeatureSet.nearest at cell centers.
+"""
+
+import os
+import sys
+import random
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+sys.path.append(os.path.dirname(__file__))
+
+from ai_agents.distance import haversine_many
+from ai_agents.poi_features import FeatureSet
+from ai_agents.priority_grid import GRID_TYPES, PriorityGrid, main
+from test_overpass_cache import synthetic_elements
+
+BBOX = (12.98, 80.18, 13.10, 80.28)
+
+
+def test_static_layers_match_nearest_at_cell_centers():
+    features = FeatureSet(synthetic_elements(500, seed=8))
+    grid = PriorityGrid(BBOX, cell_m=200)
+    grid.build_static(features)
+
+    rng = random.Random(1)
+    for _ in range(150):
+        row, col = rng.randrange(grid.rows), rng.randrange(grid.cols)
+        lat, lon = grid.center_lats[row], grid.center_lons[col]
+        expected = features.nearest(lat, lon)
+        got = grid.nearest(lat, lon)
+        for m_type in GRID_TYPES:
+            assert abs(got[m_type][0] - expected[m_type][0]) < 1e-5
+            assert got[m_type][1] == expected[m_type][1]
+
+
+def test_density_layer_incremental_updates():
+    grid = PriorityGrid(BBOX, cell_m=250)
+    rng = random.Random(6)
+    points = [(rng.uniform(13.0, 13.08), rng.uniform(80.2, 80.26)) for _ in range(120)]
+    grid.rebuild_density(points[:100])
+    grid.add_complaints(points[100:])
+    grid.add_complaints(points[:10], delta=-1)
+
+    kept = np.array(points[10:])
+    for _ in range(50):
+        row, col = rng.randrange(grid.rows), rng.randrange(grid.cols)
+        lat, lon = grid.center_lats[row], grid.center_lons[col]
+        expected = int((haversine_many(lat, lon, kept[:, 0], kept[:, 1]) <= 2.0).sum())
+        assert grid.density_at(lat, lon) == expected
+    assert grid.density_at(14.0, 80.2) is None
+
+
+def test_save_load_and_window(tmp_path):
+    snapshot = tmp_path / "poi_snapshot.npz"
+    FeatureSet(synthetic_elements(200, seed=3)).save(str(snapshot))
+    out = tmp_path / "grid.npz"
+    main(["--snapshot", str(snapshot), "--out", str(out), "--cell-m", "300", "--bbox", ",".join(map(str, BBOX))])
+
+    grid = PriorityGrid.load(str(out))
+    grid.add_complaints([(13.05, 80.23)])
+    assert grid.nearest(13.05, 80.23) == PriorityGrid.load(str(out)).nearest(13.05, 80.23)
+
+    window = grid.window(13.0, 80.2, 13.08, 80.26, max_cells=10)
+    assert window["dists"].shape[0] == len(GRID_TYPES)
+    assert window["density"].shape == (len(window["lats"]), len(window["lons"]))
+    assert len(window["lats"]) <= 10 and len(window["lons"]) <= 10
+    assert grid.window(14.0, 81.0, 14.1, 81.1) is None
+
+
+def test_default_paths_are_anchored_to_data_dir(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    FeatureSet(synthetic_elements(50, seed=5)).save(str(tmp_path / "data" / "poi_snapshot.npz"))
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.delenv("POI_SNAPSHOT_PATH", raising=False)
+    monkeypatch.delenv("PRIORITY_GRID_PATH", raising=False)
+    monkeypatch.chdir(tmp_path)
+    main(["--cell-m", "500", "--bbox", ",".join(map(str, BBOX))])
+    assert (tmp_path / "data" / "priority_grid.npz").exists() and not (tmp_path / "priority_grid.npz").exists()
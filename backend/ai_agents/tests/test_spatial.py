@@ -0,0 +1,67 @@
+"""
+STR R-tree and segment-distance tests.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+sys.path.append(os.path.dirname(__file__))
+
+from ai_agents.spatial import STRTree
+from ai_agents.poi_features import FeatureSet
+from test_overpass_cache import road_distance
+
+
+def test_str_tree_matches_brute_force_box_intersection():
+    rng = np.random.default_rng(1)
+    lo = rng.uniform(0, 10, (3000, 2))
+    size = rng.uniform(0, 0.3, (3000, 2))
+    boxes = np.column_stack([lo[:, 0], lo[:, 0] + size[:, 0], lo[:, 1], lo[:, 1] + size[:, 1]])
+    tree = STRTree(boxes)
+    for _ in range(100):
+        y, x = rng.uniform(0, 10, 2)
+        q = (y, y + 0.5, x, x + 0.5)
+        expected = np.flatnonzero((boxes[:, 0] <= q[1]) & (boxes[:, 1] >= q[0]) & (boxes[:, 2] <= q[3]) & (boxes[:, 3] >= q[2]))
+        assert sorted(tree.query(*q)) == sorted(expected)
+    assert len(STRTree(np.empty((0, 4))).query(0, 1, 0, 1)) == 0
+
+
+def test_long_road_measured_to_nearest_segment_not_center():
+    # A 10 km arterial running north-south; the pin sits 150 m east of its southern end
+    geometry = [{"lat": 13.00 + 0.01 * k, "lon": 80.25} for k in range(10)]
+    road = {
+        "type": "way", "tags": {"highway": "trunk", "name": "Anna Salai"}, "geometry": geometry,
+        "bounds": {"minlat": 13.00, "maxlat": 13.09, "minlon": 80.25, "maxlon": 80.25},
+    }
+    lat, lon = 13.005, 80.2514
+    dist, name = FeatureSet([road]).nearest(lat, lon)["Major Road"]
+    assert name == "Anna Salai"
+    assert abs(dist - road_distance(lat, lon, geometry)) < 1e-9
+    assert dist < 0.2
+
+
+def test_segment_tree_path_matches_brute_force():
+    rng = np.random.default_rng(8)
+    roads = []
+    for i in range(40):
+        start = rng.uniform([13.0, 80.2], [13.1, 80.28])
+        steps = np.cumsum(rng.uniform(-0.002, 0.002, (8, 2)), axis=0) + start
+        geometry = [{"lat": float(a), "lon": float(b)} for a, b in steps]
+        roads.append({"type": "way", "tags": {"highway": "primary", "name": f"Road {i}"}, "geometry": geometry,
+                      "bounds": {"minlat": float(steps[:, 0].min()), "maxlat": float(steps[:, 0].max()),
+                                 "minlon": float(steps[:, 1].min()), "maxlon": float(steps[:, 1].max())}})
+    features = FeatureSet(roads)
+    assert features._road_segments()[3] is not None  # enough segments to use the tree
+    for _ in range(50):
+        lat, lon = rng.uniform([13.0, 80.2], [13.1, 80.28])
+        dist, name = features.nearest(lat, lon)["Major Road"]
+        candidates = [(road_distance(lat, lon, r["geometry"]), r["tags"]["name"]) for r in roads]
+        within = [c for c in candidates if c[0] <= 1.0]
+        if within:
+            best = min(within)
+            assert name == best[1] and abs(dist - best[0]) < 1e-9
+        else:
+            assert name is None
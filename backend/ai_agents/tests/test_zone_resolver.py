@@ -0,0 +1,75 @@
+"""
+Offline zone resolution against synthetic GCC boundary polygons.
+"""
+
+import os
+import sys
+import json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from ai_agents.zone_resolver import ZoneResolver
+
+
+def square(lat0, lon0, lat1, lon1):
+    return [[lon0, lat0], [lon1, lat0], [lon1, lat1], [lon0, lat1], [lon0, lat0]]
+
+
+def write_zones(path):
+    features = [
+        {   # Adyar with a hole cut out of its middle
+            "type": "Feature",
+            "properties": {"zone_name": "ZONE 13 - ADYAR", "ward_no": 173},
+            "geometry": {"type": "Polygon", "coordinates": [
+                square(13.00, 80.24, 13.02, 80.27),
+                square(13.008, 80.25, 13.012, 80.26),
+            ]},
+        },
+        {   # The hole belongs to another ward
+            "type": "Feature",
+            "properties": {"zone_name": "Zone 13 - Adyar", "ward_no": 174},
+            "geometry": {"type": "Polygon", "coordinates": [square(13.008, 80.25, 13.012, 80.26)]},
+        },
+        {
+            "type": "Feature",
+            "properties": {"Zone_Name": "Anna Nagar", "Ward": 100},
+            "geometry": {"type": "MultiPolygon", "coordinates": [
+                [square(13.08, 80.20, 13.10, 80.22)],
+                [square(13.11, 80.20, 13.12, 80.21)],
+            ]},
+        },
+        {"type": "Feature", "properties": {"name": "Unmapped Zone"}, "geometry": {"type": "Polygon", "coordinates": [square(13.20, 80.30, 13.21, 80.31)]}},
+        {"type": "Feature", "properties": {"name": "Point"}, "geometry": {"type": "Point", "coordinates": [80.0, 13.0]}},
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f)
+
+
+def test_polygons_holes_and_multipolygons(tmp_path):
+    path = tmp_path / "zones.geojson"
+    write_zones(path)
+    resolver = ZoneResolver.from_geojson(str(path), known_zones=["Adyar", "Anna Nagar", "Teynampet"])
+
+    assert resolver.resolve(13.005, 80.245) == "Adyar"
+    assert resolver.resolve_ward(13.005, 80.245) == "173"
+    assert resolver.resolve_ward(13.010, 80.255) == "174"  # inside the hole
+    assert resolver.resolve(13.09, 80.21) == "Anna Nagar"
+    assert resolver.resolve(13.115, 80.205) == "Anna Nagar"
+    assert resolver.resolve(13.205, 80.305) == "Unmapped Zone"
+    assert resolver.resolve(13.05, 80.21) is None
+    assert resolver.resolve(13.0, 80.0) is None
+
+
+def test_from_env_missing_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("GCC_ZONES_GEOJSON", str(tmp_path / "missing.geojson"))
+    assert ZoneResolver.from_env() is None
+
+
+def test_from_env_resolves_relative_path_under_data_dir(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    write_zones(tmp_path / "data" / "zones.geojson")
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("GCC_ZONES_GEOJSON", "zones.geojson")
+    monkeypatch.chdir(tmp_path)  # not the working directory
+    resolver = ZoneResolver.from_env(known_zones=["Anna Nagar"])
+    assert resolver is not None and resolver.resolve(13.09, 80.21) == "Anna Nagar"
@@ -0,0 +1,110 @@
+"""
+zone_resolver.py
+Offline GPS -> GCC zone/ward lookup from boundary polygons (GeoJSON)
+"""
+
+import os
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from ai_agents.paths import data_path
+from ai_agents.spatial import STRTree
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ZONES_PATH = "gcc_zones.geojson"
+# Property keys tried, in order, for the zone / ward label of each feature
+ZONE_KEYS = ("zone_name", "Zone_Name", "ZONE_NAME", "zone", "Zone", "ZONE", "name", "Name")
+WARD_KEYS = ("ward_no", "Ward_No", "WARD_NO", "ward", "Ward", "WARD")
+
+def _point_in_ring(lon: float, lat: float, ring: np.ndarray) -> bool:
+    """Even-odd ray casting against one closed ring of (lon, lat) vertices."""
+    x1, y1 = ring[:, 0], ring[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    crosses = (y1 > lat) != (y2 > lat)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_at = x1 + (lat - y1) * (x2 - x1) / (y2 - y1)
+    return bool(np.count_nonzero(crosses & (lon < x_at)) % 2)
+
+class ZoneResolver:
+    """
+    GCC zone/ward boundary polygons indexed by an STR R-tree over their
+    bounding boxes. A lookup walks the tree to the handful of polygons
+    whose box contains the pin, then runs point-in-polygon on those.
+    """
+
+    def __init__(self, polygons: List[Tuple[List[np.ndarray], Dict[str, Any]]], known_zones: Iterable[str] = ()):
+        # polygons: (rings, properties); rings[0] is the exterior, the rest are holes
+        self.polygons = polygons
+        self.known_zones = sorted(known_zones, key=len, reverse=True)  # Longest name wins on overlap
+        boxes = [
+            (rings[0][:, 1].min(), rings[0][:, 1].max(), rings[0][:, 0].min(), rings[0][:, 0].max())
+            for rings, _ in polygons
+        ]
+        self.tree = STRTree(np.array(boxes, dtype=np.float64).reshape(-1, 4))
+
+    @classmethod
+    def from_geojson(cls, path: str, known_zones: Iterable[str] = ()) -> "ZoneResolver":
+        with open(path, encoding="utf-8") as f:
+            collection = json.load(f)
+        polygons = []
+        for feature in collection.get("features", []):
+            geometry = feature.get("geometry") or {}
+            props = feature.get("properties") or {}
+            if geometry.get("type") == "Polygon":
+                parts = [geometry["coordinates"]]
+            elif geometry.get("type") == "MultiPolygon":
+                parts = geometry["coordinates"]
+            else:
+                continue
+            for part in parts:
+                rings = [np.asarray(ring, dtype=np.float64)[:, :2] for ring in part if len(ring) >= 3]
+                if rings:
+                    polygons.append((rings, props))
+        return cls(polygons, known_zones)
+
+    @classmethod
+    def from_env(cls, known_zones: Iterable[str] = ()) -> Optional["ZoneResolver"]:
+        path = os.getenv("GCC_ZONES_GEOJSON", DEFAULT_ZONES_PATH)
+        if not path:
+            return None
+        path = data_path(path)
+        if not os.path.exists(path):
+            return None
+        try:
+            resolver = cls.from_geojson(path, known_zones)
+            logger.info(f"Loaded {len(resolver.polygons)} zone polygons from {path}")
+            return resolver
+        except Exception as e:
+            logger.error(f"Failed to load zone boundaries {path}: {e}")
+            return None
+
+    def lookup(self, lat: float, lon: float) -> Optional[Dict[str, Any]]:
+        """Properties of the boundary polygon containing the point, if any."""
+        for i in sorted(self.tree.query(lat, lat, lon, lon)):
+            rings, props = self.polygons[i]
+            if _point_in_ring(lon, lat, rings[0]) and not any(_point_in_ring(lon, lat, hole) for hole in rings[1:]):
+                return props
+        return None
+
+    def _zone_label(self, props: Dict[str, Any]) -> Optional[str]:
+        label = next((str(props[k]) for k in ZONE_KEYS if props.get(k)), None)
+        if not label:
+            return None
+        # Prefer the canonical zone names used elsewhere (e.g. "ZONE 13 - ADYAR" -> "Adyar")
+        for zone in self.known_zones:
+            if zone.lower() in label.lower():
+                return zone
+        return label
+
+    def resolve(self, lat: float, lon: float) -> Optional[str]:
+        props = self.lookup(lat, lon)
+        return self._zone_label(props) if props else None
+
+    def resolve_ward(self, lat: float, lon: float) -> Optional[str]:
+        props = self.lookup(lat, lon)
+        if not props:
+            return None
+        return next((str(props[k]) for k in WARD_KEYS if props.get(k) is not None), None)
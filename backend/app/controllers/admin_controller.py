@@ -1,13 +1,40 @@
-from fastapi import APIRouter, Depends, BackgroundTasks
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from ..core.database import get_db
-from ..schemas.complaint import ComplaintResponse
+from ..schemas.complaint import ComplaintResponse, BulkStatusUpdate, BulkAssign, BulkUpdateResult
 from ..services.admin_service import admin_service
+from ..services.export_service import export_service
+from ..services.stats_service import stats_service
 from ..core.security import get_current_user
 from ..models.user import User
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+@router.put("/complaints/bulk/status", response_model=BulkUpdateResult)
+def bulk_update_complaint_status(
+    update: BulkStatusUpdate,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Set new_status on every selected complaint (ids and/or filters) in one
+    statement. Reporters are notified in one background batch.
+    """
+    return admin_service.bulk_update_status(db, update, current_user, background_tasks)
+
+@router.put("/complaints/bulk/assign", response_model=BulkUpdateResult)
+def bulk_assign_complaints(
+    assign: BulkAssign,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Assign every selected complaint (ids and/or filters) to worker_id in one statement."""
+    return admin_service.bulk_assign(db, assign, current_user)
+
 @router.put("/complaints/{complaint_id}/status", response_model=ComplaintResponse)
 def update_complaint_status(
     complaint_id: int, 
@@ -26,3 +53,54 @@ def assign_complaint(
     db: Session = Depends(get_db)
 ):
     return admin_service.assign_complaint(db, complaint_id, worker_id, current_user)
+
+@router.get("/complaints/export")
+def export_complaints(
+    format: str = Query("csv", description="csv, ndjson, parquet or arrow"),
+    area: Optional[str] = Query(None, description="Only this area (area admins always get their own)"),
+    start: Optional[date] = Query(None, description="Created on or after this day"),
+    end: Optional[date] = Query(None, description="Created on or before this day"),
+    status: Optional[str] = Query(None, description="Filter by status e.g. 'RESOLVED'"),
+    category: Optional[str] = Query(None, description="Filter by category e.g. 'Water Supply'"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Streams every matching complaint as a file download, in constant
+    memory however large the range (for reports and offline analysis).
+    """
+    media_type, filename, chunks = export_service.open_export(
+        current_user, format, area, start, end, status, category
+    )
+    return StreamingResponse(
+        chunks, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/stats")
+def get_dashboard_stats(
+    area: Optional[str] = Query(None, description="Only this area (area admins always get their own)"),
+    days: Optional[int] = Query(None, ge=1, le=365, description="Resolution window in days (default STATS_WINDOW_DAYS)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Dashboard totals and per-area / per-category breakdowns by status and
+    priority, with SLA compliance and time-to-resolve percentiles. Read
+    from rollup tables refreshed in the background, so the cost does not
+    grow with the backlog. Status changes refresh the rollups within a
+    second or two on the worker running the scheduler; elsewhere counts can
+    lag by up to STATS_REFRESH_SECONDS + STATS_CACHE_SECONDS (see
+    rollup_refreshed_at in the response).
+    """
+    return stats_service.dashboard(db, current_user, area, days)
+
+@router.post("/complaints/reprioritize", status_code=202)
+def reprioritize_complaints(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
+    return admin_service.reprioritize_open_complaints(current_user, background_tasks)
+
+@router.get("/db/pool")
+def get_database_pool_metrics(current_user: User = Depends(get_current_user)):
+    """Connection pool size, checkouts and checkout wait times for this worker."""
+    return admin_service.database_pool_metrics(current_user)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ..core.database import get_db
-from ..core.security import get_current_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.database import get_async_db
+from ..core.security import get_current_user_async
 from ..models.user import User
 from ..services.chatbot_service import chatbot_service
 from pydantic import BaseModel
@@ -12,6 +12,8 @@ class ChatRequest(BaseModel):
     message: str
 
 @router.post("/")
-async def chat(request: ChatRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def chat(
+    request: ChatRequest, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)
+):
     response = await chatbot_service.get_response(db, current_user, request.message)
     return {"response": response}
@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, BackgroundTasks, Query
+from fastapi import APIRouter, Depends, UploadFile, File, Form, BackgroundTasks, Query, HTTPException, Request
+from fastapi.responses import StreamingResponse
+import json
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from ..core.database import get_db
-from ..schemas.complaint import ComplaintResponse
+from typing import List, Optional, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.database import get_db, get_async_db
+from ..schemas.complaint import (
+    ComplaintResponse, ComplaintSummary, ComplaintChanges, ComplaintBatch, ComplaintBatchResponse
+)
 from ..services.complaint_service import complaint_service
-from ..core.security import get_current_user
+from ..core.security import complaint_scope, create_stream_token, get_current_user, get_current_user_async, get_stream_user
+from ..core.config import settings
+from ..core.events import complaint_events
+from ..core.json_response import FastJSONResponse
 from ..models.user import User
-from ..repositories.complaint_repository import complaint_repository
-from ..services.ai_service import ai_service
+from ..services.priority_preview_service import priority_preview_service
 
 router = APIRouter(prefix="/complaints", tags=["complaints"])
 
@@ -43,79 +50,33 @@ async def extract_text_from_image_api(image: UploadFile = File(...)):
 async def get_priority_preview(
     lat: float = Query(..., description="Latitude of the issue location"),
     lon: float = Query(..., description="Longitude of the issue location"),
-    issue_type: Optional[str] = Query(None, description="Issue category e.g. 'Potholes', 'Garbage'"),
-    db: Session = Depends(get_db)
+    issue_type: Optional[str] = Query(None, description="Issue category e.g. 'Potholes', 'Garbage'")
 ):
     """
     Live priority preview for a map pin (called on every pin drop).
     Optionally pass issue_type for scenario-aware scoring.
+    Never blocks the event loop; answers within PRIORITY_PREVIEW_BUDGET_MS,
+    with "partial": true if some inputs were not ready in time.
     """
-    result = {
-        "priority_score": 50,
-        "priority_level": "MEDIUM",
-        "suggested_sla": "Standard (48 Hrs)",
-        "nearby_hospital": None,
-        "hospital_dist_km": None,
-        "nearby_road": None,
-        "major_road_dist_km": None,
-        "complaint_density": 0,
-        "location_type": "Residential",
-        "reasoning": []
-    }
-
-    try:
-        agent_system = ai_service.get_agent_system()
-        if not agent_system:
-            return result
-
-        gps_str = f"{lat},{lon}"
-
-        # Step 2a: Distances from Overpass (hospital, road)
-        location_type, place_name, metrics = agent_system.feature_agent.detect_location_type_from_gps(gps_str)
-
-        # Step 2b: Nearby complaint density from DB
-        density = complaint_repository.get_nearby_complaints(db, lat, lon, radius_km=2.0)
-
-        # Step 3: Compute priority score using Issue × Location scenario matrix
-        priority_level, reason_str, priority_score = agent_system.priority_booster.boost_priority(
-            base_priority="MEDIUM",
-            location_type=location_type,
-            urgency_found=False,
-            text="",
-            hospital_dist=metrics["hospital_dist"],
-            major_road_dist=metrics["major_road_dist"],
-            density=density,
-            frequency=0,
-            issue_type=issue_type or "General"    # ← scenario matrix
-        )
-
-        sla_map = {
-            "CRITICAL": "Immediate Action (4 Hrs)",
-            "HIGH": "High Priority (24 Hrs)",
-            "MEDIUM": "Standard (48 Hrs)",
-            "LOW": "Low Priority (72 Hrs)"
-        }
-
-        result.update({
-            "priority_score": round(priority_score, 1),
-            "priority_level": priority_level,
-            "suggested_sla": sla_map.get(priority_level, "Standard (48 Hrs)"),
-            "nearby_hospital": metrics.get("nearby_hospital"),
-            "hospital_dist_km": round(metrics["hospital_dist"], 2) if metrics["hospital_dist"] < 10 else None,
-            "nearby_road": metrics.get("nearby_road"),
-            "major_road_dist_km": round(metrics["major_road_dist"], 2) if metrics["major_road_dist"] < 10 else None,
-            "complaint_density": density,
-            "location_type": location_type,
-            "nearby_place": place_name,
-            "reasoning": [r.strip() for r in reason_str.split(",") if r.strip() and r.strip() != "Standard Assessment"]
-        })
-
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        print(f"[Priority Preview Error] {e}")
+    return await priority_preview_service.preview(lat, lon, issue_type)
 
-    return result
+@router.get("/priority-heatmap")
+def get_priority_heatmap(
+    south: float = Query(..., description="South edge of the map viewport"),
+    west: float = Query(..., description="West edge of the map viewport"),
+    north: float = Query(..., description="North edge of the map viewport"),
+    east: float = Query(..., description="East edge of the map viewport"),
+    issue_type: Optional[str] = Query(None, description="Issue category e.g. 'Potholes', 'Garbage'"),
+    max_cells: int = Query(64, ge=1, le=128, description="Maximum grid cells per side")
+):
+    """
+    Priority scores for the precomputed grid cells in a map viewport,
+    so the frontend can paint priority zones in one call.
+    """
+    heatmap = priority_preview_service.heatmap(south, west, north, east, issue_type, max_cells)
+    if heatmap is None:
+        raise HTTPException(status_code=503, detail="Priority heatmap is not built yet")
+    return heatmap
 
 @router.post("/", response_model=ComplaintResponse)
 async def create_complaint(
@@ -126,21 +87,124 @@ async def create_complaint(
     image: Optional[UploadFile] = File(None),
     image_path: Optional[str] = Form(None),
     audio: Optional[UploadFile] = File(None),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return complaint_service.create_complaint(
+    return await complaint_service.create_complaint_async(
         db, background_tasks, current_user.id, description, location, area, image, audio, image_path
     )
 
-@router.get("/", response_model=List[ComplaintResponse])
+@router.post("/batch", response_model=ComplaintBatchResponse)
+async def create_complaints_batch(
+    batch: ComplaintBatch,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Submit many complaints at once (JSON, media already uploaded as
+    URLs). Valid items are stored in one transaction; the response has
+    one result per item, in order, with its id or the reason it was rejected.
+    """
+    return await complaint_service.create_complaints_batch_async(
+        db, background_tasks, current_user.id, batch.items
+    )
+
+# get_complaints builds its FastJSONResponse itself (no response_model validation); this documents both views
+COMPLAINT_PAGE_RESPONSES = {
+    200: {
+        "model": Union[List[ComplaintSummary], List[ComplaintResponse]],
+        "description": "ComplaintSummary items (view=summary) or ComplaintResponse items (view=full)",
+        "headers": {
+            "X-Next-Cursor": {"description": "Cursor for the next page; absent on the last page", "schema": {"type": "string"}},
+        },
+    },
+}
+
+@router.get("/", response_model=None, responses=COMPLAINT_PAGE_RESPONSES)
 def get_complaints(
-    skip: int = 0, 
-    limit: int = 100, 
+    request: Request,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, description="Page size (server default and maximum apply)"),
+    status: Optional[str] = Query(None, description="Filter by status e.g. 'IN_PROGRESS'"),
+    priority: Optional[str] = Query(None, description="Filter by priority e.g. 'HIGH'"),
+    category: Optional[str] = Query(None, description="Filter by category e.g. 'Water Supply'"),
+    view: str = Query("summary", pattern="^(summary|full)$", description="'full' for complete ComplaintResponse items"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Newest-first page of the caller's complaints (all for admins, their
+    zone for area admins, their own for citizens). When more pages exist
+    the X-Next-Cursor header carries the cursor for the next request.
+    Rows are summaries (no AI insight or media, description shortened);
+    large pages are br/gzip compressed when the client accepts it.
+    """
+    if view == "full":
+        items, next_cursor = complaint_service.get_user_complaints(
+            db, current_user, cursor, limit, status, priority, category
+        )
+        items = [ComplaintResponse.model_validate(c).model_dump(mode="json") for c in items]
+    else:
+        items, next_cursor = complaint_service.get_user_complaint_summaries(
+            db, current_user, cursor, limit, status, priority, category
+        )
+    return FastJSONResponse(
+        items, accept_encoding=request.headers.get("accept-encoding"),
+        headers={"X-Next-Cursor": next_cursor} if next_cursor else None
+    )
+
+@router.get("/changes", response_model=ComplaintChanges)
+def get_complaint_changes(
+    since: Optional[str] = Query(None, description="Watermark from the previous response; omit for a full sync"),
+    limit: Optional[int] = Query(None, ge=1, description="Max changed complaints per response"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return complaint_service.get_user_complaints(db, current_user, skip, limit)
+    """
+    Delta sync for polling clients: the caller's complaints created or
+    modified after the watermark, ids deleted since, and the next
+    watermark. Keep polling immediately while has_more is true.
+    """
+    return complaint_service.get_changes(db, current_user, since, limit)
+
+@router.post("/events/token")
+def create_events_token(current_user: User = Depends(get_current_user)):
+    """
+    Short-lived token for GET /complaints/events?access_token=..., so the
+    account's bearer token never appears in URLs. Only checked when the
+    stream opens: fetch a new one to reconnect.
+    """
+    complaint_scope(current_user)  # refuse (403) streams this user could not open
+    return {"access_token": create_stream_token(current_user), "expires_in": settings.EVENTS_TOKEN_SECONDS}
+
+@router.get("/events")
+async def stream_complaint_events(request: Request, current_user: User = Depends(get_stream_user)):
+    """
+    Server-sent events for the caller's complaints (created, ai_completed,
+    status_changed, assigned), scoped like GET /complaints. A "resync"
+    event means some events were dropped: catch up via /complaints/changes.
+    """
+    # Same scope as GET /complaints: an area admin without an area is refused (403)
+    scope = complaint_scope(current_user)
+    sub = complaint_events.subscribe(current_user.role, current_user.id, scope.get("area"))
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                event = await sub.next(timeout=settings.EVENTS_KEEPALIVE_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            complaint_events.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.get("/{complaint_id}", response_model=ComplaintResponse)
 def get_complaint(
@@ -4,14 +4,87 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Relative data file paths (EVENTS_BROKER_PATH, ...) resolve under DATA_DIR, shared with ai_agents
+try:
+    from ai_agents.paths import BACKEND_DIR, data_path
+except ImportError:
+    from ...ai_agents.paths import BACKEND_DIR, data_path
+
 class Settings(BaseSettings):
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./civic_db.sqlite")
+    # Async driver URL for get_async_db; derived from DATABASE_URL when empty
+    # (sqlite -> aiosqlite, postgresql -> asyncpg, mysql -> asyncmy)
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+    # Comma-separated read replica URLs for repository reads marked @read_only;
+    # empty = everything on DATABASE_URL. A user's reads stay on the primary
+    # for REPLICA_STICKY_SECONDS after their own write (read-your-writes)
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    REPLICA_STICKY_SECONDS: float = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+    # Connection pool (QueuePool databases; SQLite :memory: keeps a single connection)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # SQLite connection pragmas (WAL, synchronous=NORMAL are always applied)
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-keep-it-safe")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
 
+    # Latency budget for /complaints/priority-preview (partial result after this)
+    PRIORITY_PREVIEW_BUDGET_MS: int = int(os.getenv("PRIORITY_PREVIEW_BUDGET_MS", "800"))
+    # Precomputed priority heatmap grid (built from the POI snapshot if missing); relative paths are under DATA_DIR
+    PRIORITY_GRID_PATH: str = os.getenv("PRIORITY_GRID_PATH", "priority_grid.npz")
+    POI_SNAPSHOT_PATH: str = os.getenv("POI_SNAPSHOT_PATH", "poi_snapshot.npz")
+    # Rolling window (days) for the density fed to the AI pipeline; 0 = all time
+    DENSITY_WINDOW_DAYS: int = int(os.getenv("DENSITY_WINDOW_DAYS", "0"))
+    # Rolling window (days) for the category x area frequency; 0 = all time
+    FREQUENCY_WINDOW_DAYS: int = int(os.getenv("FREQUENCY_WINDOW_DAYS", "0"))
+
+    # Page sizes for GET /complaints (requests above the max are clamped)
+    COMPLAINTS_PAGE_SIZE: int = int(os.getenv("COMPLAINTS_PAGE_SIZE", "50"))
+    COMPLAINTS_MAX_PAGE_SIZE: int = int(os.getenv("COMPLAINTS_MAX_PAGE_SIZE", "200"))
+    # JSON list bodies at least this big are sent br/gzip compressed
+    COMPRESS_MIN_BYTES: int = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+    # Most complaints accepted by one POST /complaints/batch
+    COMPLAINTS_BATCH_MAX_ITEMS: int = int(os.getenv("COMPLAINTS_BATCH_MAX_ITEMS", "500"))
+    # Most complaints one bulk admin status change / assignment may touch
+    ADMIN_BULK_MAX_ROWS: int = int(os.getenv("ADMIN_BULK_MAX_ROWS", "1000"))
+
+    # Delta sync: the returned watermark trails now by this much, so rows
+    # committed late with an earlier updated_at are re-sent, never missed
+    SYNC_SETTLE_SECONDS: int = int(os.getenv("SYNC_SETTLE_SECONDS", "5"))
+    # The AI pipeline pulls other workers' complaint writes into this worker's
+    # spatial index at most this often (once per job, never per density lookup)
+    SPATIAL_SYNC_SECONDS: int = int(os.getenv("SPATIAL_SYNC_SECONDS", "10"))
+    # Rows fetched per streaming-cursor batch by /admin/complaints/export
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+
+    # GET /admin/stats: rollups are rebuilt every STATS_REFRESH_SECONDS by a
+    # background thread (turn it off on all but one worker with
+    # STATS_SCHEDULER=false); responses are cached per role / area for
+    # STATS_CACHE_SECONDS. SLA compliance falls back to
+    # STATS_DEFAULT_SLA_HOURS when a complaint has no SLA duration
+    STATS_SCHEDULER: bool = os.getenv("STATS_SCHEDULER", "true").lower() == "true"
+    STATS_REFRESH_SECONDS: int = int(os.getenv("STATS_REFRESH_SECONDS", "60"))
+    STATS_CACHE_SECONDS: int = int(os.getenv("STATS_CACHE_SECONDS", "30"))
+    STATS_WINDOW_DAYS: int = int(os.getenv("STATS_WINDOW_DAYS", "30"))
+    STATS_DEFAULT_SLA_HOURS: float = float(os.getenv("STATS_DEFAULT_SLA_HOURS", "48"))
+
+    # Complaint event push (GET /complaints/events): "memory" for one worker,
+    # "sqlite" to fan out across workers through a shared broker file
+    EVENTS_BACKEND: str = os.getenv("EVENTS_BACKEND", "memory")
+    EVENTS_BROKER_PATH: str = os.getenv("EVENTS_BROKER_PATH", "events_broker.sqlite")
+    EVENTS_KEEPALIVE_SECONDS: int = int(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+    # Lifetime of the stream-only token EventSource sends in ?access_token=
+    # (only checked when the stream opens, so it can be short)
+    EVENTS_TOKEN_SECONDS: int = int(os.getenv("EVENTS_TOKEN_SECONDS", "60"))
+
     # Email notification settings
     SMTP_SERVER: str = os.getenv("SMTP_SERVER", "smtp.gmail.com")
     SMTP_PORT: int = int(os.getenv("SMTP_PORT", "587"))
@@ -29,3 +102,4 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 settings = Settings()
+
@@ -1,17 +1,173 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from .config import settings
+from .db_routing import ReadRouter, RoutingSession
+
+class PoolStats:
+    """Checkout counts and wait times for one engine's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_total_s += seconds
+            self.wait_max_s = max(self.wait_max_s, seconds)
+
+    def snapshot(self, pool) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(1000 * self.wait_total_s / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(1000 * self.wait_max_s, 3),
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(), checked_out=pool.checkedout(),
+                idle=pool.checkedin(), overflow=max(pool.overflow(), 0),
+            )
+        return stats
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
 
-# For SQLite, we need connect_args={"check_same_thread": False}
-if settings.DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        settings.DATABASE_URL, connect_args={"check_same_thread": False}
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            self.stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool, TimedQueuePool):
+    """Async-adapted pool with the same checkout metrics."""
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "mysql": "mysql+asyncmy"}
+
+def async_database_url(database_url: str):
+    """The async-driver twin of a sync URL (sqlite+aiosqlite, postgresql+asyncpg, mysql+asyncmy)."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if url.get_driver_name() in ("aiosqlite", "asyncpg", "asyncmy", "aiomysql"):
+        return url
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def _apply_sqlite_pragmas(dbapi_conn, connection_record):
+    cursor = dbapi_conn.cursor()
+    try:
+        # WAL lets background AI writes and request reads run side by side
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA cache_size={-int(settings.SQLITE_CACHE_SIZE_KB)}")
+    finally:
+        cursor.close()
+
+def build_engine(database_url: str) -> Engine:
+    """Engine with the configured pool, SQLite pragmas and pool metrics."""
+    url = make_url(database_url)
+    if _is_memory_sqlite(url):
+        # In-memory databases (tests) have nothing to pool or journal
+        return create_engine(url, connect_args={"check_same_thread": False})
+
+    options: Dict[str, Any] = dict(
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
     )
-else:
-     engine = create_engine(settings.DATABASE_URL)
+    if url.get_backend_name() == "sqlite":
+        # For SQLite, we need connect_args={"check_same_thread": False};
+        # busy waits are handled by the busy_timeout pragma
+        options["connect_args"] = {"check_same_thread": False}
+    new_engine = create_engine(url, **options)
+
+    if url.get_backend_name() == "sqlite":
+        event.listen(new_engine, "connect", _apply_sqlite_pragmas)
+    event.listen(new_engine, "connect", lambda *_: new_engine.pool.stats.record_connect())
+    return new_engine
+
+def build_async_engine(database_url: str) -> AsyncEngine:
+    """Async twin of build_engine: same pool settings, pragmas and metrics."""
+    url = async_database_url(database_url)
+    if _is_memory_sqlite(url):
+        return create_async_engine(url)
+    new_engine = create_async_engine(
+        url,
+        poolclass=TimedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    sync_engine = new_engine.sync_engine
+    if url.get_backend_name() == "sqlite":
+        event.listen(sync_engine, "connect", _apply_sqlite_pragmas)
+    event.listen(sync_engine, "connect", lambda *_: sync_engine.pool.stats.record_connect())
+    return new_engine
+
+def pool_stats(target: Engine = None) -> Dict[str, Any]:
+    """Live pool metrics for GET /admin/db/pool."""
+    target = target or engine
+    stats = getattr(target.pool, "stats", None)
+    if stats is None:
+        return {"pool": type(target.pool).__name__}
+    return {"pool": type(target.pool).__name__, **stats.snapshot(target.pool)}
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def replica_urls():
+    return [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+engine = build_engine(settings.DATABASE_URL)
+replica_engines = [build_engine(url) for url in replica_urls()]
+read_router = ReadRouter(engine, replica_engines, settings.REPLICA_STICKY_SECONDS)
+
+# Writes and unmarked reads use engine; @read_only repository reads may use a replica
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, info={"router": read_router}
+)
 
 Base = declarative_base()
 
@@ -21,3 +177,30 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Async engine for async controllers, created on first use so a missing
+# async driver only affects the endpoints that need it
+_async_engine: AsyncEngine = None
+_async_session_factory: async_sessionmaker = None
+_async_lock = threading.Lock()
+
+def async_session_factory() -> async_sessionmaker:
+    global _async_engine, _async_session_factory
+    with _async_lock:
+        if _async_session_factory is None:
+            _async_engine = build_async_engine(settings.ASYNC_DATABASE_URL or settings.DATABASE_URL)
+            replicas = [build_async_engine(url).sync_engine for url in replica_urls()]
+            # Objects stay usable after commit without an implicit (sync) reload
+            _async_session_factory = async_sessionmaker(
+                _async_engine, sync_session_class=RoutingSession, autoflush=False, expire_on_commit=False,
+                info={"router": read_router.with_engines(_async_engine.sync_engine, replicas)},
+            )
+        return _async_session_factory
+
+def async_pool_stats():
+    """Pool metrics for the async engine, or None until it is first used."""
+    return pool_stats(_async_engine.sync_engine) if _async_engine is not None else None
+
+async def get_async_db():
+    async with async_session_factory()() as db:
+        yield db
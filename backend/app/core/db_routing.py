@@ -0,0 +1,146 @@
+import asyncio
+import functools
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+class ReadRouter:
+    """
+    The primary engine plus read replicas (round robin), and which users
+    recently wrote and so must read from the primary for a while.
+
+    Stickiness is per process: with several workers a user's next request
+    may land elsewhere, so keep REPLICA_STICKY_SECONDS above replica lag
+    only as a best effort, not a guarantee.
+    """
+
+    def __init__(self, primary: Engine, replicas: List[Engine], sticky_seconds: float):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.sticky_seconds = sticky_seconds
+        self._next = itertools.count()
+        self._sticky_until: Dict[Any, float] = {}
+        self._lock = threading.Lock()
+
+    def with_engines(self, primary: Engine, replicas: List[Engine]) -> "ReadRouter":
+        """A router over other engines (the async ones) sharing this stickiness."""
+        twin = ReadRouter(primary, replicas, self.sticky_seconds)
+        twin._sticky_until, twin._lock = self._sticky_until, self._lock
+        return twin
+
+    def replica(self) -> Engine:
+        return self.replicas[next(self._next) % len(self.replicas)]
+
+    def stick(self, user_id: Any):
+        with self._lock:
+            now = time.monotonic()
+            if len(self._sticky_until) > 10000:
+                for key in [k for k, v in self._sticky_until.items() if v <= now]:
+                    del self._sticky_until[key]
+            self._sticky_until[user_id] = now + self.sticky_seconds
+
+    def is_sticky(self, user_id: Any) -> bool:
+        if user_id is None:
+            return False
+        with self._lock:
+            until = self._sticky_until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+class RoutingSession(Session):
+    """
+    Session that sends reads marked with replica_reads() / @read_only to a
+    replica. Everything else stays on the primary: flushes, DML, unmarked
+    or @primary_only reads, and every read after this session or this user
+    (info["user_id"]) has written recently.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        router: Optional[ReadRouter] = self.info.get("router")
+        if router is None:
+            return super().get_bind(mapper, clause, **kw)
+        if (
+            router.replicas
+            and self.info.get("replica_reads")
+            and not self._flushing
+            and not getattr(clause, "is_dml", False)
+            and not self.info.get("wrote")
+            and not router.is_sticky(self.info.get("user_id"))
+        ):
+            return router.replica()
+        return router.primary
+
+@event.listens_for(RoutingSession, "after_flush")
+def _remember_write(session, flush_context):
+    session.info["wrote"] = True
+
+@event.listens_for(RoutingSession, "after_bulk_update")
+@event.listens_for(RoutingSession, "after_bulk_delete")
+def _remember_bulk_write(update_context):
+    _remember_write(update_context.session, None)
+
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_writer(session):
+    router = session.info.get("router")
+    if router is not None and session.info.get("wrote") and session.info.get("user_id") is not None:
+        router.stick(session.info["user_id"])
+
+def _sync_session(db) -> Session:
+    return getattr(db, "sync_session", db)  # AsyncSession wraps a sync Session
+
+@contextmanager
+def replica_reads(db):
+    """Let reads inside this block go to a replica (if the session routes)."""
+    info = _sync_session(db).info
+    previous = info.get("replica_reads", False)
+    info["replica_reads"] = True
+    try:
+        yield
+    finally:
+        info["replica_reads"] = previous
+
+@contextmanager
+def primary_reads(db):
+    """Keep reads inside this block on the primary, even within replica_reads()."""
+    info = _sync_session(db).info
+    previous = info.get("replica_reads", False)
+    info["replica_reads"] = False
+    try:
+        yield
+    finally:
+        info["replica_reads"] = previous
+
+def read_only(method):
+    """Repository method decorator: the method only reads, so a replica may serve it."""
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, db, *args, **kwargs):
+            with replica_reads(db):
+                return await method(self, db, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, db, *args, **kwargs):
+        with replica_reads(db):
+            return method(self, db, *args, **kwargs)
+    return wrapper
+
+def primary_only(method):
+    """
+    Repository method decorator: the method reads state a watermark is
+    derived from, which a lagging replica would silently skip past.
+    """
+    @functools.wraps(method)
+    def wrapper(self, db, *args, **kwargs):
+        with primary_reads(db):
+            return method(self, db, *args, **kwargs)
+    return wrapper
+
+def bind_user(db, user_id: Any):
+    """Tag the request session with its user, for read-your-writes stickiness."""
+    _sync_session(db).info["user_id"] = user_id
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+
+from .config import data_path, settings
+
+Event = Dict[str, Any]
+Deliver = Callable[[Event], None]
+
+# Event types: created, ai_completed, status_changed, assigned. "resync" is
+# sent to a subscriber that fell behind and should catch up via /complaints/changes
+
+class MemoryBackend:
+    """Single-worker fan-out: events go straight to this process's subscribers."""
+
+    def start(self, deliver: Deliver):
+        self._deliver = deliver
+
+    def publish(self, event: Event):
+        self._deliver(event)
+
+    def close(self):
+        pass
+
+class SQLiteBrokerBackend:
+    """
+    Stand-in broker for several uvicorn workers on one host: events are
+    appended to a shared SQLite log that every worker tails, so subscribers
+    hear events published by any worker. Old events are pruned on publish.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 0.2, retention_s: float = 3600):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention_s = retention_s
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._conn = self._connect()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY AUTOINCREMENT, at REAL, payload TEXT)"
+            )
+        self._published = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def start(self, deliver: Deliver):
+        # Only events published from now on
+        last_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+        threading.Thread(target=self._tail, args=(deliver, last_id), name="complaint-events-tail", daemon=True).start()
+
+    def _tail(self, deliver: Deliver, last_id: int):
+        conn = self._connect()
+        while not self._stop.wait(self.poll_interval):
+            try:
+                rows = conn.execute("SELECT id, payload FROM events WHERE id > ? ORDER BY id", (last_id,)).fetchall()
+            except sqlite3.Error as e:
+                print(f"[Events] Broker read failed: {e}")
+                continue
+            for last_id, payload in rows:
+                deliver(json.loads(payload))
+        conn.close()
+
+    def publish(self, event: Event):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO events (at, payload) VALUES (?, ?)", (now, json.dumps(event)))
+            self._published += 1
+            if self._published % 500 == 0:
+                self._conn.execute("DELETE FROM events WHERE at < ?", (now - self.retention_s,))
+
+    def close(self):
+        self._stop.set()
+
+class Subscription:
+    """One connected client: a bounded queue owned by its event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, accepts: Callable[[Event], bool], maxsize: int):
+        self.loop = loop
+        self.accepts = accepts
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def _offer(self, event: Event):
+        # Runs on the subscriber's loop
+        if self.queue.full():
+            self.overflowed = True
+        else:
+            self.queue.put_nowait(event)
+
+    async def next(self, timeout: float) -> Optional[Event]:
+        """The next event, a resync marker after an overflow, or None on timeout."""
+        if self.overflowed:
+            self.overflowed = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return {"type": "resync"}
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class ComplaintEventHub:
+    """
+    Process-level pub/sub for complaint events. Services publish from any
+    thread; each subscriber only receives events in its role's scope
+    (everything for admins, their zone for area admins, their own
+    complaints for citizens). Delivery goes through a pluggable backend.
+    """
+
+    def __init__(self, backend=None, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._backend = backend
+        self._started = False
+        self._subs: Set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def _started_backend(self):
+        with self._lock:
+            if self._backend is None:
+                self._backend = backend_from_settings()
+            if not self._started:
+                self._backend.start(self._deliver)
+                self._started = True
+            return self._backend
+
+    def start(self):
+        self._started_backend()
+
+    def close(self):
+        with self._lock:
+            if self._started:
+                self._backend.close()
+                self._started = False
+
+    def publish(self, event_type: str, complaint, **extra):
+        """Best effort: a failed publish never fails the write that triggered it."""
+        event = {
+            "type": event_type,
+            "complaint_id": complaint.id,
+            "user_id": complaint.user_id,
+            "area": complaint.area,
+            "status": complaint.status,
+            "priority": complaint.priority,
+            "category": complaint.category,
+            "at": datetime.utcnow().isoformat(),
+            **extra,
+        }
+        try:
+            self._started_backend().publish(event)
+        except Exception as e:
+            print(f"[Events] Publish failed for #{event['complaint_id']}: {e}")
+
+    def _deliver(self, event: Event):
+        with self._lock:
+            subs = list(self._subs)
+        for sub in subs:
+            if not sub.accepts(event):
+                continue
+            try:
+                sub.loop.call_soon_threadsafe(sub._offer, event)
+            except RuntimeError:  # loop closed under a client that never unsubscribed
+                self.unsubscribe(sub)
+
+    def subscribe(self, role: str, user_id: int, area: Optional[str]) -> Subscription:
+        """Call from the subscriber's event loop."""
+        if role == "admin":
+            accepts = lambda event: True
+        elif role == "area_admin":
+            # area=None would match every complaint not yet routed (all "created" events)
+            if area is None:
+                raise ValueError("An area admin subscription needs an area")
+            accepts = lambda event: event.get("area") == area
+        else:
+            accepts = lambda event: event.get("user_id") == user_id
+        self._started_backend()
+        sub = Subscription(asyncio.get_running_loop(), accepts, self.queue_size)
+        with self._lock:
+            self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            self._subs.discard(sub)
+
+def backend_from_settings():
+    if settings.EVENTS_BACKEND == "sqlite":
+        return SQLiteBrokerBackend(data_path(settings.EVENTS_BROKER_PATH))
+    return MemoryBackend()
+
+complaint_events = ComplaintEventHub()
@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator, List, Sequence
+
+from sqlalchemy import DateTime, Float, Integer
+
+# Parquet / Arrow output is optional: CSV and NDJSON work without pyarrow
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+Batch = Sequence[tuple]
+
+# format -> (media type, file extension)
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+# Leading characters that make Excel / Sheets evaluate a cell as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _text(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _csv_cell(value):
+    """
+    CSV cell for a value. Text fields are citizen-supplied, so text that a
+    spreadsheet would run as a formula is quoted with a leading "'".
+    """
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return _text(value)
+
+def csv_chunks(columns: List, batches: Iterable[Batch]) -> Iterator[bytes]:
+    """One header line, then one encoded chunk per batch of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in columns])
+    for batch in batches:
+        writer.writerows([[_csv_cell(v) for v in row] for row in batch])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def ndjson_chunks(columns: List, batches: Iterable[Batch]) -> Iterator[bytes]:
+    names = [column.name for column in columns]
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(names, map(_text, row))), ensure_ascii=False) + "\n" for row in batch
+        ).encode()
+
+def _arrow_type(column):
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever pyarrow wrote since the last take()."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+def columnar_chunks(fmt: str, columns: List, batches: Iterable[Batch]) -> Iterator[bytes]:
+    """Parquet (one row group per batch) or an Arrow IPC stream (one record batch per batch)."""
+    if pa is None:
+        raise RuntimeError("pyarrow is required for parquet/arrow export")
+    schema = pa.schema([pa.field(column.name, _arrow_type(column)) for column in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema) if fmt == "parquet" else pa.ipc.new_stream(sink, schema)
+    for batch in batches:
+        table = pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(zip(*batch), schema)], schema=schema
+        )
+        writer.write_table(table)
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+def export_chunks(fmt: str, columns: List, batches: Iterable[Batch]) -> Iterator[bytes]:
+    if fmt == "csv":
+        return csv_chunks(columns, batches)
+    if fmt == "ndjson":
+        return ndjson_chunks(columns, batches)
+    return columnar_chunks(fmt, columns, batches)
@@ -0,0 +1,70 @@
+from math import radians, degrees, sin, cos, asin, isfinite
+from typing import Optional, Tuple
+
+# Distance kernels are shared with the AI agents
+try:
+    from ai_agents.distance import EARTH_RADIUS_KM, haversine, haversine_many
+except ImportError:
+    from ...ai_agents.distance import EARTH_RADIUS_KM, haversine, haversine_many
+
+# Pads bounding boxes so float rounding never drops a point sitting on the edge
+_BOX_EPSILON = 1e-9
+
+def parse_location(location: Optional[str]) -> Optional[Tuple[float, float]]:
+    """Extract (lat, lon) from a stored "lat,lon | address" location string."""
+    if not location:
+        return None
+    try:
+        coords = location.split('|')[0].strip().split(',')
+        lat, lon = float(coords[0]), float(coords[1])
+    except (ValueError, IndexError):
+        return None
+    if not (isfinite(lat) and isfinite(lon)):
+        return None
+    return lat, lon
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Conservative (min_lat, max_lat, min_lon, max_lon) box around a search circle.
+    Every point within radius_km (haversine) is guaranteed to fall inside it.
+    Longitudes are not wrapped, so callers near the antimeridian get a box
+    that extends past +/-180.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    dlat = degrees(angular) + _BOX_EPSILON
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90 or max_lat >= 90 or sin(angular) >= cos(radians(lat)):
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+    dlon = degrees(asin(sin(angular) / cos(radians(lat)))) + _BOX_EPSILON
+    return min_lat, max_lat, lon - dlon, lon + dlon
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+
+def geohash_encode(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Standard base32 geohash (9 chars is roughly a 5m cell)."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, ch, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        ch <<= 1
+        if value >= mid:
+            ch |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_BASE32[ch])
+            bits, ch = 0, 0
+    return "".join(chars)
+
+def location_columns(location: Optional[str]) -> dict:
+    """Numeric lat/lon/geohash column values derived from a location string."""
+    coords = parse_location(location)
+    if coords is None:
+        return {"lat": None, "lon": None, "geohash": None}
+    lat, lon = coords
+    return {"lat": lat, "lon": lon, "geohash": geohash_encode(lat, lon)}
@@ -0,0 +1,71 @@
+import os
+import threading
+from typing import Callable, Iterable, Optional, Tuple
+
+try:
+    from ai_agents.priority_grid import PriorityGrid, build_grid
+except ImportError:
+    from ...ai_agents.priority_grid import PriorityGrid, build_grid
+
+Points = Iterable[Tuple[Optional[float], Optional[float]]]
+
+class PriorityHeatmap:
+    """
+    Process-level holder for the precomputed priority grid.
+
+    The static layers come from the grid file (or are built from the POI
+    snapshot in a background thread on first start); the density layer is
+    rebuilt from the complaints table once the grid is loaded and then kept
+    current by the complaint repository as complaints are added or moved.
+    """
+
+    def __init__(self):
+        self.grid: Optional[PriorityGrid] = None
+        self._lock = threading.Lock()
+        self._building = False
+
+    @property
+    def ready(self) -> bool:
+        return self.grid is not None
+
+    def _activate(self, grid: PriorityGrid, complaint_points: Callable[[], Points]):
+        # Fill density before publishing, so previews never see an empty layer
+        grid.rebuild_density(complaint_points())
+        self.grid = grid
+
+    def load(self, path: str, complaint_points: Callable[[], Points]) -> bool:
+        if not path or not os.path.exists(path):
+            return False
+        self._activate(PriorityGrid.load(path), complaint_points)
+        return True
+
+    def build_in_background(self, snapshot_path: str, out_path: str, complaint_points: Callable[[], Points]) -> bool:
+        """Build (and save) the grid from the POI snapshot without blocking startup."""
+        if not snapshot_path or not os.path.exists(snapshot_path):
+            return False
+        with self._lock:
+            if self._building:
+                return True
+            self._building = True
+
+        def run():
+            try:
+                self._activate(build_grid(snapshot_path, out_path), complaint_points)
+                print(f"[OK] Priority Heatmap Built ({out_path})")
+            except Exception as e:
+                print(f"[ERROR] Priority heatmap build failed: {e}")
+            finally:
+                self._building = False
+
+        threading.Thread(target=run, name="priority-heatmap-build", daemon=True).start()
+        return True
+
+    def add(self, lat: Optional[float], lon: Optional[float], delta: int = 1):
+        if self.grid:
+            self.grid.add_complaints([(lat, lon)], delta)
+
+    def add_many(self, points: Points):
+        if self.grid:
+            self.grid.add_complaints(points)
+
+priority_heatmap = PriorityHeatmap()
@@ -0,0 +1,69 @@
+import gzip
+import json
+from datetime import date, datetime
+from typing import Any, Mapping, Optional
+
+from starlette.responses import Response
+
+from .config import settings
+
+# Both optional: stdlib json and gzip are the fallbacks
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Fast settings: list payloads are compressed on every request
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+def pick_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """br (when brotli is installed) or gzip, if the client accepts it."""
+    accepted = set()
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+class FastJSONResponse(Response):
+    """
+    JSON rendered with orjson from plain dicts (no Pydantic pass), and
+    compressed when the body reaches COMPRESS_MIN_BYTES and the request's
+    Accept-Encoding allows it. For large list payloads.
+    """
+    media_type = "application/json"
+
+    def __init__(
+        self, content: Any, accept_encoding: Optional[str] = None, status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None
+    ):
+        body = dumps(content)
+        headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+        encoding = pick_encoding(accept_encoding) if len(body) >= settings.COMPRESS_MIN_BYTES else None
+        if encoding == "br":
+            body = brotli.compress(body, quality=BROTLI_QUALITY)
+        elif encoding == "gzip":
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        super().__init__(body, status_code, headers, self.media_type)
@@ -1,3 +1,5 @@
+import logging
+import re
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
@@ -5,6 +7,7 @@ from .config import settings
 from fastapi.security import OAuth2PasswordBearer
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="auth/token", auto_error=False)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -24,25 +27,124 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-from fastapi import Depends, HTTPException, status
+# Scope claim of the short-lived token for GET /complaints/events (see create_stream_token)
+STREAM_TOKEN_SCOPE = "events"
+
+def create_stream_token(user) -> str:
+    """
+    Token that only opens the event stream. EventSource cannot send headers,
+    so it travels in the query string (and so in logs and history): it must
+    not be the account's bearer token, and it expires in EVENTS_TOKEN_SECONDS.
+    """
+    return create_access_token(
+        {"sub": user.username, "scope": STREAM_TOKEN_SCOPE}, timedelta(seconds=settings.EVENTS_TOKEN_SECONDS)
+    )
+
+class RedactQueryTokens(logging.Filter):
+    """Access-log filter: blanks ?access_token= values in logged request paths."""
+    _pattern = re.compile(r"(access_token=)[^&\s]*")
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.args, tuple):
+            record.args = tuple(
+                self._pattern.sub(r"\1[redacted]", arg) if isinstance(arg, str) else arg for arg in record.args
+            )
+        return True
+
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from .database import get_db
-from ..repositories.user_repository import user_repository
+from sqlalchemy.ext.asyncio import AsyncSession
+from .database import get_db, get_async_db, SessionLocal
+from .db_routing import bind_user
+from ..repositories.user_repository import user_repository, async_user_repository
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _username_for_token(token: Optional[str], scope: Optional[str] = None) -> str:
+    # Account tokens carry no scope; stream tokens are only good for their own endpoint
+    if not token:
+        raise _credentials_exception()
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
+        if username is None or payload.get("scope") != scope:
+            raise _credentials_exception()
     except JWTError:
-        raise credentials_exception
-    user = user_repository.get_by_username(db, username)
+        raise _credentials_exception()
+    return username
+
+def _user_for_token(token: Optional[str], db: Session, scope: Optional[str] = None):
+    user = user_repository.get_by_username(db, _username_for_token(token, scope))
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    user = _user_for_token(token, db)
+    # Same session as the endpoint's: its reads turn sticky after this user writes
+    bind_user(db, user.id)
+    return user
+
+def get_stream_user(
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+    access_token: Optional[str] = Query(
+        None, description="Stream token from POST /complaints/events/token (EventSource cannot send headers)"
+    )
+):
+    """
+    For long-lived streams: an Authorization header, or a short-lived
+    stream token in ?access_token= (never the account token). Holds no DB
+    session open.
+    """
+    db = SessionLocal()
+    try:
+        if token:
+            return _user_for_token(token, db)
+        return _user_for_token(access_token, db, STREAM_TOKEN_SCOPE)
+    finally:
+        db.close()
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """get_current_user for async endpoints: no threadpool hop, no blocking query."""
+    user = await async_user_repository.get_by_username(db, _username_for_token(token))
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    bind_user(db, user.id)
     return user
+
+def _own_area(user) -> str:
+    # An area admin without an area must not fall through to "no area filter" (= every complaint)
+    if not user.area:
+        raise HTTPException(status_code=403, detail="No area assigned to this area admin")
+    return user.area
+
+def complaint_scope(user) -> dict:
+    """
+    Repository filters for the complaints a user may see: everything for
+    admins, their zone for area admins, their own complaints for citizens.
+    """
+    if user.role == "admin":
+        return {}
+    if user.role == "area_admin":
+        return {"area": _own_area(user)}
+    return {"user_id": user.id}
+
+def admin_area_scope(user, area: Optional[str] = None) -> Optional[str]:
+    """
+    Area filter for admin-only views (export, bulk changes, stats): any
+    area (or all, for None) for admins, only their own for area admins.
+    """
+    if user.role == "admin":
+        return area
+    if user.role == "area_admin":
+        own = _own_area(user)
+        if area and area != own:
+            raise HTTPException(status_code=403, detail="Not authorized for this area")
+        return own
+    raise HTTPException(status_code=403, detail="Not authorized")
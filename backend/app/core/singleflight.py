@@ -0,0 +1,36 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent async calls that share a key: the first caller
+    starts the work as a task, later callers await that same task until it
+    finishes. Nothing is cached once the task is done.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self):
+        return len(self._inflight)
+
+    def task(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """The in-flight task for key, started from factory() if there is none."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return task
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]], timeout: float = None) -> Any:
+        """
+        Await the shared result. A timeout (or a cancelled caller) only stops
+        this caller from waiting; the shared task keeps running for the others.
+        """
+        return await asyncio.wait_for(asyncio.shield(self.task(key, factory)), timeout)
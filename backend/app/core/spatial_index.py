@@ -0,0 +1,128 @@
+import threading
+from collections import defaultdict
+from datetime import datetime
+from math import floor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .geo import haversine_many, bounding_box
+
+class ComplaintSpatialIndex:
+    """
+    Process-level grid index over complaint coordinates.
+
+    Complaints are bucketed into fixed lat/lon cells, so a radius query only
+    visits the cells overlapping the search circle's bounding box and runs the
+    exact haversine check on those candidates. Results match a full scan of
+    the complaints table.
+    """
+
+    def __init__(self, cell_deg: float = 0.01):
+        self.cell_deg = cell_deg
+        self._cells: Dict[Tuple[int, int], Dict[int, Tuple[float, float]]] = defaultdict(dict)
+        self._points: Dict[int, Tuple[float, float]] = {}
+        self._lock = threading.RLock()
+        self.ready = False
+        self.max_id = 0
+        self.synced_at: Optional[datetime] = None # Change watermark, kept by complaint_repository
+
+    def __len__(self):
+        return len(self._points)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return floor(lat / self.cell_deg), floor(lon / self.cell_deg)
+
+    def build(self, rows: Iterable[Tuple[int, Optional[float], Optional[float]]]):
+        """(Re)build the index from (complaint_id, lat, lon) rows."""
+        with self._lock:
+            self._cells.clear()
+            self._points.clear()
+            self.max_id = 0
+            self.add_many(rows)
+            self.ready = True
+
+    def add_many(self, rows: Iterable[Tuple[int, Optional[float], Optional[float]]]):
+        with self._lock:
+            for complaint_id, lat, lon in rows:
+                self.upsert(complaint_id, lat, lon)
+
+    def apply_changes(
+        self, rows: Iterable[Tuple[int, Optional[float], Optional[float]]], deleted_ids: Iterable[int]
+    ) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        """
+        Upsert (complaint_id, lat, lon) rows and drop deleted ids, skipping
+        rows already applied. Returns (points removed, points added).
+        """
+        removed, added = [], []
+        with self._lock:
+            for complaint_id, lat, lon in rows:
+                self.max_id = max(self.max_id, complaint_id)
+                old = self._points.get(complaint_id)
+                new = (lat, lon) if lat is not None and lon is not None else None
+                if old == new:
+                    continue
+                self.upsert(complaint_id, lat, lon)
+                removed.extend([old] if old else [])
+                added.extend([new] if new else [])
+            for complaint_id in deleted_ids:
+                old = self._points.get(complaint_id)
+                if old:
+                    self.remove(complaint_id)
+                    removed.append(old)
+        return removed, added
+
+    def upsert(self, complaint_id: int, lat: Optional[float], lon: Optional[float]):
+        """Insert a complaint or move it after its location changed."""
+        with self._lock:
+            self.max_id = max(self.max_id, complaint_id)
+            self.remove(complaint_id)
+            if lat is None or lon is None:
+                return
+            coords = (lat, lon)
+            self._points[complaint_id] = coords
+            self._cells[self._cell(*coords)][complaint_id] = coords
+
+    def remove(self, complaint_id: int):
+        with self._lock:
+            coords = self._points.pop(complaint_id, None)
+            if coords is None:
+                return
+            cell = self._cell(*coords)
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.pop(complaint_id, None)
+                if not bucket:
+                    del self._cells[cell]
+
+    def _candidates(self, lat: float, lon: float, radius_km: float):
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        if min_lon < -180 or max_lon > 180:
+            # Box wraps the antimeridian (or covers a pole): just check everything
+            yield from self._points.items()
+            return
+        row_lo, col_lo = self._cell(min_lat, min_lon)
+        row_hi, col_hi = self._cell(max_lat, max_lon)
+        if (row_hi - row_lo + 1) * (col_hi - col_lo + 1) > len(self._cells):
+            for bucket in self._cells.values():
+                yield from bucket.items()
+            return
+        for row in range(row_lo, row_hi + 1):
+            for col in range(col_lo, col_hi + 1):
+                bucket = self._cells.get((row, col))
+                if bucket:
+                    yield from bucket.items()
+
+    def query_ids(self, lat: float, lon: float, radius_km: float) -> List[int]:
+        """IDs of complaints within radius_km of (lat, lon)."""
+        with self._lock:
+            candidates = list(self._candidates(lat, lon, radius_km))
+        if not candidates:
+            return []
+        ids, coords = zip(*candidates)
+        lats, lons = zip(*coords)
+        within = haversine_many(lat, lon, lats, lons) <= radius_km
+        return [complaint_id for complaint_id, hit in zip(ids, within) if hit]
+
+    def count_within(self, lat: float, lon: float, radius_km: float) -> int:
+        return len(self.query_ids(lat, lon, radius_km))
+
+complaint_index = ComplaintSpatialIndex()
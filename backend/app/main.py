@@ -2,25 +2,69 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
+import logging
 import os
 
 # Load Environment Variables
 load_dotenv()
 
-from .core.database import engine, Base
+from .core.database import engine, SessionLocal
+from .core.config import data_path, settings
+from .core.heatmap import priority_heatmap
+from .core.security import RedactQueryTokens
 from .models.user import User
 from .models.complaint import Complaint
+from .repositories.complaint_repository import complaint_repository
+from .services.stats_service import stats_service
+from . import migrations
 from .controllers import auth_controller, complaint_controller, admin_controller, stt_controller, chatbot_controller, user_controller
 
 # Initialize Database
 try:
-    Base.metadata.create_all(bind=engine)
+    applied = migrations.upgrade(engine)
+    if applied:
+        print(f"[OK] Applied migrations: {', '.join(applied)}")
     print("[OK] Database Models Initialized")
 except Exception as e:
     print(f"[ERROR] Database creation failed: {e}")
 
+# Warm the in-memory spatial index used by proximity/density queries
+try:
+    db = SessionLocal()
+    try:
+        complaint_repository.warm_spatial_index(db)
+    finally:
+        db.close()
+    print("[OK] Complaint Spatial Index Built")
+except Exception as e:
+    print(f"[ERROR] Spatial index warm-up failed: {e}")
+
+# Load the precomputed priority heatmap (or build it from the POI snapshot in the background)
+def _complaint_points():
+    db = SessionLocal()
+    try:
+        return complaint_repository.complaint_points(db)
+    finally:
+        db.close()
+
+try:
+    grid_path, snapshot_path = data_path(settings.PRIORITY_GRID_PATH), data_path(settings.POI_SNAPSHOT_PATH)
+    if priority_heatmap.load(grid_path, _complaint_points):
+        print("[OK] Priority Heatmap Loaded")
+    elif priority_heatmap.build_in_background(snapshot_path, grid_path, _complaint_points):
+        print("[OK] Priority Heatmap Build Started")
+except Exception as e:
+    print(f"[ERROR] Priority heatmap load failed: {e}")
+
+# Keep the admin dashboard rollups current
+if settings.STATS_SCHEDULER and stats_service.start_scheduler():
+    print("[OK] Dashboard Rollup Scheduler Started")
+
 app = FastAPI(title="Civic Issue Management System - Structured V1")
 
+# Event stream tokens ride in the query string; keep them out of the access log
+logging.getLogger("uvicorn.access").addFilter(RedactQueryTokens())
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +72,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"], # GET /complaints pagination
 )
 
 # Include Controllers/Routers
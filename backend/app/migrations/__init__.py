@@ -0,0 +1,64 @@
+"""
+Versioned schema migrations. Each step runs once per database, in order,
+and is recorded in the schema_migrations table. Databases created before
+versioning simply replay every step (each one is idempotent).
+
+Apply pending migrations / show what has been applied:
+    python -m app.migrations [--status]
+"""
+
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, insert, select
+from sqlalchemy.engine import Engine
+
+from . import (
+    initial_schema, add_complaint_coordinates, add_density_counters,
+    add_frequency_counters, add_base_priority, add_complaint_indexes, add_complaint_changes,
+    add_complaint_history, add_stats_rollups, add_complaint_area_exits,
+)
+
+# (version, step); append only, never renumber an applied step
+MIGRATIONS = [
+    ("0001", initial_schema),
+    ("0002", add_complaint_coordinates),
+    ("0003", add_density_counters),
+    ("0004", add_frequency_counters),
+    ("0005", add_base_priority),
+    ("0006", add_complaint_indexes),
+    ("0007", add_complaint_changes),
+    ("0008", add_complaint_history),
+    ("0009", add_stats_rollups),
+    ("0010", add_complaint_area_exits),
+]
+
+schema_migrations = Table(
+    "schema_migrations", MetaData(),
+    Column("version", String(32), primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+def _name(module) -> str:
+    return module.__name__.rsplit(".", 1)[-1]
+
+def applied_versions(engine: Engine) -> List[str]:
+    schema_migrations.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        return [row[0] for row in conn.execute(select(schema_migrations.c.version).order_by(schema_migrations.c.version))]
+
+def upgrade(engine: Engine) -> List[str]:
+    """Apply every pending step; returns the names of the steps applied."""
+    done = set(applied_versions(engine))
+    applied = []
+    for version, module in MIGRATIONS:
+        if version in done:
+            continue
+        module.upgrade(engine)
+        with engine.begin() as conn:
+            conn.execute(insert(schema_migrations).values(
+                version=version, name=_name(module), applied_at=datetime.utcnow()
+            ))
+        applied.append(_name(module))
+    return applied
@@ -0,0 +1,12 @@
+import sys
+
+from ..core.database import engine
+from . import MIGRATIONS, applied_versions, upgrade, _name
+
+if "--status" in sys.argv:
+    done = set(applied_versions(engine))
+    for version, module in MIGRATIONS:
+        print(f"[{'x' if version in done else ' '}] {version} {_name(module)}")
+else:
+    applied = upgrade(engine)
+    print(f"[OK] Applied {len(applied)} migrations" + (f": {', '.join(applied)}" if applied else ""))
@@ -0,0 +1,34 @@
+"""
+Adds the base_priority column to complaints and seeds it from the current
+priority, so re-prioritization always rescores from the AI's own level
+instead of compounding boosts on every run.
+
+Safe to run repeatedly:
+    python -m app.migrations.add_base_priority
+"""
+
+from sqlalchemy import inspect, text, update
+from sqlalchemy.engine import Engine
+
+from ..models.user import User # Registers the mapper Complaint relationships point at
+from ..models.complaint import Complaint
+
+def upgrade(engine: Engine) -> int:
+    """Returns the number of complaints whose base_priority was seeded."""
+    existing = {c["name"] for c in inspect(engine).get_columns(Complaint.__tablename__)}
+    with engine.begin() as conn:
+        if "base_priority" not in existing:
+            col_type = Complaint.__table__.c.base_priority.type.compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE {Complaint.__tablename__} ADD COLUMN base_priority {col_type}"))
+        result = conn.execute(
+            update(Complaint.__table__)
+            .where(Complaint.__table__.c.base_priority.is_(None), Complaint.__table__.c.priority.isnot(None))
+            # updated_at pinned: seeding is not a change (its onupdate would restamp every row)
+            .values(base_priority=Complaint.__table__.c.priority, updated_at=Complaint.__table__.c.updated_at)
+        )
+    return result.rowcount or 0
+
+if __name__ == "__main__":
+    from ..core.database import engine
+    count = upgrade(engine)
+    print(f"[OK] Seeded base priority for {count} complaints")
@@ -0,0 +1,24 @@
+"""
+Creates the complaint_area_exits table (complaints re-routed out of an
+area), which area-scoped delta sync reads alongside the tombstones.
+
+Safe to run repeatedly:
+    python -m app.migrations.add_complaint_area_exits
+"""
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from ..models.complaint_tombstone import ComplaintAreaExit
+
+def upgrade(engine: Engine) -> bool:
+    """Returns True if the table was created."""
+    if inspect(engine).has_table(ComplaintAreaExit.__tablename__):
+        return False
+    ComplaintAreaExit.__table__.create(bind=engine)
+    return True
+
+if __name__ == "__main__":
+    from ..core.database import engine
+    created = upgrade(engine)
+    print(f"[OK] Complaint area exits table {'created' if created else 'already present'}")
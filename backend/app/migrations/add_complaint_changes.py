@@ -0,0 +1,37 @@
+"""
+Adds what delta sync (GET /complaints/changes) reads: the updated_at
+watermark index on complaints and the complaint_tombstones table.
+
+Safe to run repeatedly:
+    python -m app.migrations.add_complaint_changes
+"""
+
+from sqlalchemy import inspect, update
+from sqlalchemy.engine import Engine
+
+from ..models.user import User # Registers the mapper Complaint relationships point at
+from ..models.complaint import Complaint
+from ..models.complaint_tombstone import ComplaintTombstone
+
+WATERMARK_INDEX = "ix_complaints_updated_at_id"
+
+def upgrade(engine: Engine) -> bool:
+    """Returns True if the watermark index was created."""
+    ComplaintTombstone.__table__.create(bind=engine, checkfirst=True)
+    table = Complaint.__table__
+    with engine.begin() as conn:
+        # Rows that never had updated_at would sort before every watermark
+        conn.execute(
+            update(table).where(table.c.updated_at.is_(None))
+            .values(updated_at=table.c.created_at)
+        )
+    existing = {index["name"] for index in inspect(engine).get_indexes(Complaint.__tablename__)}
+    if WATERMARK_INDEX in existing:
+        return False
+    next(index for index in table.indexes if index.name == WATERMARK_INDEX).create(bind=engine)
+    return True
+
+if __name__ == "__main__":
+    from ..core.database import engine
+    created = upgrade(engine)
+    print(f"[OK] Delta sync schema ready (index {'created' if created else 'already present'})")
@@ -0,0 +1,68 @@
+"""
+Adds numeric lat/lon/geohash columns to complaints and backfills them
+from the legacy "lat,lon | address" location string.
+
+Safe to run repeatedly:
+    python -m app.migrations.add_complaint_coordinates
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..core.geo import location_columns
+from ..models.user import User # Registers the mapper Complaint relationships point at
+from ..models.complaint import Complaint
+
+NEW_COLUMNS = ("lat", "lon", "geohash")
+BATCH_SIZE = 1000
+
+def add_columns(engine: Engine):
+    existing = {c["name"] for c in inspect(engine).get_columns(Complaint.__tablename__)}
+    with engine.begin() as conn:
+        for name in NEW_COLUMNS:
+            if name in existing:
+                continue
+            col_type = Complaint.__table__.c[name].type.compile(dialect=engine.dialect)
+            conn.execute(text(f"ALTER TABLE {Complaint.__tablename__} ADD COLUMN {name} {col_type}"))
+
+    for index in Complaint.__table__.indexes:
+        if {c.name for c in index.columns} & set(NEW_COLUMNS):
+            index.create(bind=engine, checkfirst=True)
+
+def backfill(engine: Engine) -> int:
+    """Fill lat/lon/geohash for rows that only have a location string."""
+    updated = 0
+    last_id = 0
+    with Session(engine) as db:
+        while True:
+            rows = (
+                db.query(Complaint.id, Complaint.location, Complaint.updated_at)
+                .filter(Complaint.lat.is_(None), Complaint.location.isnot(None), Complaint.id > last_id)
+                .order_by(Complaint.id)
+                .limit(BATCH_SIZE)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+            mappings = []
+            for row in rows:
+                cols = location_columns(row.location)
+                if cols["lat"] is not None:
+                    # updated_at pinned: a backfill is not a change (its onupdate would restamp every row)
+                    mappings.append({"id": row.id, **cols, "updated_at": row.updated_at})
+            if mappings:
+                db.bulk_update_mappings(Complaint, mappings)
+                db.commit()
+                updated += len(mappings)
+    return updated
+
+def upgrade(engine: Engine) -> int:
+    add_columns(engine)
+    return backfill(engine)
+
+if __name__ == "__main__":
+    from ..core.database import engine
+    count = upgrade(engine)
+    print(f"[OK] Backfilled coordinates for {count} complaints")
@@ -0,0 +1,23 @@
+"""
+Creates the complaint_history table (status / assignee change log).
+
+Safe to run repeatedly:
+    python -m app.migrations.add_complaint_history
+"""
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from ..models.complaint_history import ComplaintHistory
+
+def upgrade(engine: Engine) -> bool:
+    """Returns True if the table was created."""
+    if inspect(engine).has_table(ComplaintHistory.__tablename__):
+        return False
+    ComplaintHistory.__table__.create(bind=engine)
+    return True
+
+if __name__ == "__main__":
+    from ..core.database import engine
+    created = upgrade(engine)
+    print(f"[OK] Complaint history table {'created' if created else 'already present'}")
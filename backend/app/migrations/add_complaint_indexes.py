@@ -0,0 +1,29 @@
+"""
+Adds the composite complaint indexes behind the hot list/lookup queries
+(per-user and per-area listings, chatbot context, admin status views,
+category x area lookups).
+
+Safe to run repeatedly:
+    python -m app.migrations.add_complaint_indexes
+"""
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from ..models.user import User # Registers the mapper Complaint relationships point at
+from ..models.complaint import Complaint, QUERY_INDEXES
+
+def upgrade(engine: Engine) -> int:
+    """Returns the number of indexes created."""
+    existing = {index["name"] for index in inspect(engine).get_indexes(Complaint.__tablename__)}
+    created = 0
+    for index in Complaint.__table__.indexes:
+        if index.name in QUERY_INDEXES and index.name not in existing:
+            index.create(bind=engine)
+            created += 1
+    return created
+
+if __name__ == "__main__":
+    from ..core.database import engine
+    count = upgrade(engine)
+    print(f"[OK] Created {count} complaint indexes")
@@ -0,0 +1,29 @@
+"""
+Creates the complaint_density_cells counter table and fills it from the
+existing complaints (only when it is still empty).
+
+Safe to run repeatedly; pass --rebuild to recompute every counter:
+    python -m app.migrations.add_density_counters [--rebuild]
+"""
+
+import sys
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..models.user import User # Registers the mapper Complaint relationships point at
+from ..models.complaint_density import ComplaintDensityCell
+from ..repositories.density_repository import density_repository
+
+def upgrade(engine: Engine, rebuild: bool = False) -> int:
+    """Returns the number of counter rows written (0 if already populated)."""
+    ComplaintDensityCell.__table__.create(bind=engine, checkfirst=True)
+    with Session(engine) as db:
+        if not rebuild and db.query(ComplaintDensityCell).first() is not None:
+            return 0
+        return density_repository.rebuild(db)
+
+if __name__ == "__main__":
+    from ..core.database import engine
+    count = upgrade(engine, rebuild="--rebuild" in sys.argv)
+    print(f"[OK] Wrote {count} complaint density counters")
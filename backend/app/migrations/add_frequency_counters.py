@@ -0,0 +1,29 @@
+"""
+Creates the complaint_frequency_counts rollup table and fills it from the
+existing complaints (only when it is still empty).
+
+Safe to run repeatedly; pass --rebuild to recompute every counter:
+    python -m app.migrations.add_frequency_counters [--rebuild]
+"""
+
+import sys
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..models.user import User # Registers the mapper Complaint relationships point at
+from ..models.complaint_frequency import ComplaintFrequencyCount
+from ..repositories.frequency_repository import frequency_repository
+
+def upgrade(engine: Engine, rebuild: bool = False) -> int:
+    """Returns the number of counter rows written (0 if already populated)."""
+    ComplaintFrequencyCount.__table__.create(bind=engine, checkfirst=True)
+    with Session(engine) as db:
+        if not rebuild and db.query(ComplaintFrequencyCount).first() is not None:
+            return 0
+        return frequency_repository.rebuild(db)
+
+if __name__ == "__main__":
+    from ..core.database import engine
+    count = upgrade(engine, rebuild="--rebuild" in sys.argv)
+    print(f"[OK] Wrote {count} complaint frequency counters")
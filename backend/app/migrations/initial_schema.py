@@ -0,0 +1,25 @@
+"""
+Creates every table that does not exist yet from the current models.
+
+Existing tables are left alone; later migrations add what older databases
+are missing.
+"""
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from ..core.database import Base
+from ..models.user import User
+from ..models.complaint import Complaint
+from ..models.complaint_density import ComplaintDensityCell
+from ..models.complaint_frequency import ComplaintFrequencyCount
+from ..models.complaint_tombstone import ComplaintTombstone, ComplaintAreaExit
+from ..models.complaint_history import ComplaintHistory
+from ..models.complaint_stats import ComplaintStatusCount, ComplaintResolutionBucket
+
+def upgrade(engine: Engine) -> int:
+    """Returns the number of tables created."""
+    existing = set(inspect(engine).get_table_names())
+    missing = [t for t in Base.metadata.sorted_tables if t.name not in existing]
+    Base.metadata.create_all(bind=engine, tables=missing)
+    return len(missing)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..core.database import Base
@@ -9,12 +9,16 @@ class Complaint(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     description = Column(Text, nullable=False)
     location = Column(String(255))
+    lat = Column(Float(precision=53), nullable=True) # Parsed from location
+    lon = Column(Float(precision=53), nullable=True)
+    geohash = Column(String(12), nullable=True, index=True)
     area = Column(String(100), nullable=True) # Routing
     image_url = Column(String(255))
     audio_url = Column(String(255))
     category = Column(String(50), nullable=True) # AI Determined
     status = Column(String(50), default="SUBMITTED") # SUBMITTED, IN_PROGRESS, RESOLVED
     priority = Column(String(20), default="MEDIUM") # LOW, MEDIUM, HIGH, CRITICAL
+    base_priority = Column(String(20), nullable=True) # AI priority before location/rule boosts (rescoring input)
     priority_score = Column(Integer, default=0)
     suggested_sla = Column(String(50), nullable=True)
     ai_insight = Column(Text, nullable=True) # AI Reasoning for Priority/Category
@@ -24,3 +28,22 @@ class Complaint(Base):
 
     reporter_user = relationship("User", foreign_keys=[user_id])
     assignee = relationship("User", foreign_keys=[assigned_to])
+
+    __table_args__ = (
+        Index("ix_complaints_lat_lon", "lat", "lon"), # Bounding-box prefilter for proximity queries
+        Index("ix_complaints_user_id_created_at", "user_id", "created_at"), # Citizen listings / chatbot context
+        Index("ix_complaints_area_created_at", "area", "created_at"), # Area admin listings / chatbot context
+        Index("ix_complaints_created_at", "created_at"), # Admin newest-first views
+        Index("ix_complaints_status_priority", "status", "priority"), # Admin status / priority views
+        Index("ix_complaints_category_area", "category", "area"), # Category x area lookups and rollup rebuilds
+        Index("ix_complaints_updated_at_id", "updated_at", "id"), # Delta sync watermark scans
+    )
+
+# Indexes added by migrations.add_complaint_indexes
+QUERY_INDEXES = (
+    "ix_complaints_user_id_created_at",
+    "ix_complaints_area_created_at",
+    "ix_complaints_created_at",
+    "ix_complaints_status_priority",
+    "ix_complaints_category_area",
+)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, Date
+from ..core.database import Base
+
+class ComplaintDensityCell(Base):
+    """
+    Complaint counters per spatial cell, category and creation day.
+    Maintained by density_repository in the same transaction as the
+    complaint writes, so radius / window counts never scan complaints.
+    """
+    __tablename__ = "complaint_density_cells"
+    cell_y = Column(Integer, primary_key=True, autoincrement=False) # floor(lat / DENSITY_CELL_DEG)
+    cell_x = Column(Integer, primary_key=True, autoincrement=False) # floor(lon / DENSITY_CELL_DEG)
+    category = Column(String(50), primary_key=True, default="") # "" = not yet categorised
+    day = Column(Date, primary_key=True) # created_at (UTC) date
+    total_count = Column(Integer, nullable=False, default=0)
+    open_count = Column(Integer, nullable=False, default=0) # Not RESOLVED / CLOSED / REJECTED
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Date
+from ..core.database import Base
+
+class ComplaintFrequencyCount(Base):
+    """
+    Complaint counts per category, area and creation day. Maintained by
+    frequency_repository in the same transaction as the complaint writes,
+    so historical frequency lookups never count complaints rows.
+    """
+    __tablename__ = "complaint_frequency_counts"
+    category = Column(String(50), primary_key=True)
+    area = Column(String(100), primary_key=True)
+    day = Column(Date, primary_key=True) # created_at (UTC) date
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from datetime import datetime
+from ..core.database import Base
+
+class ComplaintHistory(Base):
+    """
+    One row per status or assignee change, written by history_repository
+    in the same transaction as the change (single updates through the
+    flush hook, bulk admin updates explicitly).
+    """
+    __tablename__ = "complaint_history"
+    id = Column(Integer, primary_key=True)
+    complaint_id = Column(Integer, nullable=False)
+    field = Column(String(20), nullable=False) # "status" or "assigned_to"
+    old_value = Column(String(50), nullable=True)
+    new_value = Column(String(50), nullable=True)
+    changed_by = Column(Integer, nullable=True) # Acting user; None for background jobs
+    changed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_complaint_history_complaint_id", "complaint_id", "changed_at"), # Per-complaint timelines
+        Index("ix_complaint_history_field_value_changed_at", "field", "new_value", "changed_at"), # Rollup refresh scans
+    )
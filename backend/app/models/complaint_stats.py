@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from ..core.database import Base
+
+class ComplaintStatusCount(Base):
+    """
+    Current complaint counts per area, category, status and priority.
+    Rebuilt with one GROUP BY by stats_repository.refresh (the dashboard
+    scheduler), so /admin/stats reads a few hundred rows at most.
+    """
+    __tablename__ = "complaint_status_counts"
+    area = Column(String(100), primary_key=True, default="") # "" = not routed
+    category = Column(String(50), primary_key=True, default="") # "" = not yet categorised
+    status = Column(String(50), primary_key=True, default="")
+    priority = Column(String(20), primary_key=True, default="")
+    count = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime, nullable=False)
+
+class ComplaintResolutionBucket(Base):
+    """
+    Hourly resolution rollup: transitions to RESOLVED per hour, area,
+    category and time-to-resolve bucket (RESOLVE_BUCKET_HOURS), and how
+    many of them were within the complaint's SLA. Percentiles come from
+    summing the buckets, so they never touch complaint_history.
+    """
+    __tablename__ = "complaint_resolution_buckets"
+    hour = Column(DateTime, primary_key=True) # changed_at (UTC), truncated to the hour
+    area = Column(String(100), primary_key=True, default="")
+    category = Column(String(50), primary_key=True, default="")
+    bucket = Column(Integer, primary_key=True, autoincrement=False) # Index into RESOLVE_BUCKET_HOURS
+    resolved_count = Column(Integer, nullable=False, default=0)
+    within_sla_count = Column(Integer, nullable=False, default=0)
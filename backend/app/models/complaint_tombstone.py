@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from datetime import datetime
+from ..core.database import Base
+
+class ComplaintTombstone(Base):
+    """
+    One row per deleted complaint, written by tombstone_repository in the
+    deleting transaction, so delta sync can tell clients what to drop.
+    Keeps the owner and area for role scoping.
+    """
+    __tablename__ = "complaint_tombstones"
+    complaint_id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, nullable=True)
+    area = Column(String(100), nullable=True)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_complaint_tombstones_deleted_at", "deleted_at", "complaint_id"), # Watermark scans
+    )
+
+class ComplaintAreaExit(Base):
+    """
+    One row per (complaint, area) a complaint was re-routed out of, written
+    by tombstone_repository in the moving transaction. To an area-scoped
+    delta sync the complaint is gone, like a deletion.
+    """
+    __tablename__ = "complaint_area_exits"
+    complaint_id = Column(Integer, primary_key=True, autoincrement=False)
+    area = Column(String(100), primary_key=True) # The area it left
+    user_id = Column(Integer, nullable=True)
+    exited_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_complaint_area_exits_area_exited_at", "area", "exited_at", "complaint_id"), # Watermark scans
+    )
@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Generic, TypeVar, Type, List, Optional, Any
 
@@ -32,3 +34,36 @@ class BaseRepository(Generic[ModelType]):
         db.delete(obj)
         db.commit()
         return obj
+
+class AsyncBaseRepository(Generic[ModelType]):
+    """BaseRepository for AsyncSession callers (async controllers)."""
+
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+
+    async def get_by_id(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        result = await db.execute(select(self.model).offset(skip).limit(limit))
+        return list(result.scalars())
+
+    async def create(self, db: AsyncSession, obj_in: Any) -> ModelType:
+        db.add(obj_in)
+        await db.commit()
+        await db.refresh(obj_in)
+        return obj_in
+
+    async def update(self, db: AsyncSession, db_obj: ModelType, obj_in: Any) -> ModelType:
+        for field in obj_in:
+            if hasattr(db_obj, field):
+                setattr(db_obj, field, obj_in[field])
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def remove(self, db: AsyncSession, id: Any) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
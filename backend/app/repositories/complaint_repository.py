@@ -1,56 +1,427 @@
 from sqlalchemy.orm import Session, joinedload
-from .base_repository import BaseRepository
+from sqlalchemy.ext.asyncio import AsyncSession
+from .base_repository import BaseRepository, AsyncBaseRepository
 from ..models.complaint import Complaint
-from typing import List
+from ..models.user import User
+from ..core.spatial_index import complaint_index
+from ..core.heatmap import priority_heatmap
+from .density_repository import density_repository
+from .frequency_repository import frequency_repository
+from .tombstone_repository import tombstone_repository
+from .history_repository import history_repository
+from .density_repository import TRACKED
+from ..core.geo import bounding_box, haversine_many, location_columns
+from ..core.pagination import CursorKey
+from ..core.db_routing import primary_only, read_only, replica_reads
+from ..core.config import settings
+from sqlalchemy import and_, func, or_, select, update
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+# Characters of the description kept in list rows (the detail endpoint has it all)
+SUMMARY_DESCRIPTION_CHARS = 160
+# Columns of the lightweight list representation (see ComplaintSummary)
+SUMMARY_COLUMNS = (
+    Complaint.id, Complaint.user_id, Complaint.area, Complaint.category, Complaint.status,
+    Complaint.priority, Complaint.priority_score, Complaint.suggested_sla, Complaint.location,
+    func.substr(Complaint.description, 1, SUMMARY_DESCRIPTION_CHARS).label("description"),
+    Complaint.created_at, Complaint.updated_at,
+)
+
+def summary_items(rows: List[Any]) -> List[dict]:
+    """list_summary_page rows as ComplaintSummary-shaped dicts (for FastJSONResponse)."""
+    if not rows:
+        return []
+    fields = rows[0]._fields  # zip once per row: several times faster than Row._asdict()
+    items = []
+    for values in rows:
+        item = dict(zip(fields, values))
+        username = item.pop("reporter_username")
+        item["reporter_user"] = {"id": item["user_id"], "username": username} if username is not None else None
+        items.append(item)
+    return items
 
 class ComplaintRepository(BaseRepository[Complaint]):
     def __init__(self):
         super().__init__(Complaint)
 
+    @read_only
     def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Complaint]:
         return db.query(Complaint).options(joinedload(Complaint.reporter_user)).offset(skip).limit(limit).all()
 
-    def get_by_user_id(self, db: Session, user_id: int) -> List[Complaint]:
-        return db.query(Complaint).options(joinedload(Complaint.reporter_user)).filter(Complaint.user_id == user_id).all()
+    def _scoped(self, query, user_id: Optional[int] = None, area: Optional[str] = None):
+        if user_id is not None:
+            query = query.filter(Complaint.user_id == user_id)
+        if area is not None:
+            query = query.filter(Complaint.area == area)
+        return query
+
+    def _page_statement(
+        self, query, limit: int, after: Optional[CursorKey], user_id: Optional[int], area: Optional[str],
+        status: Optional[str], priority: Optional[str], category: Optional[str]
+    ):
+        # Works on a Query (sync) or a select() (async): both take filter/order_by/limit
+        query = self._scoped(query, user_id, area)
+        # Stored upper-case: normalise the input so the (status, priority) index stays usable
+        if status:
+            query = query.filter(Complaint.status == status.upper())
+        if priority:
+            query = query.filter(Complaint.priority == priority.upper())
+        if category:
+            query = query.filter(Complaint.category == category)
+        if after:
+            created_at, last_id = after
+            query = query.filter(or_(
+                Complaint.created_at < created_at,
+                and_(Complaint.created_at == created_at, Complaint.id < last_id),
+            ))
+        return query.order_by(Complaint.created_at.desc(), Complaint.id.desc()).limit(limit + 1)
+
+    def _page_result(self, items: List[Complaint], limit: int) -> Tuple[List[Complaint], Optional[CursorKey]]:
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, (items[-1].created_at, items[-1].id)
+
+    @read_only
+    def list_page(
+        self, db: Session, limit: int, after: Optional[CursorKey] = None,
+        user_id: Optional[int] = None, area: Optional[str] = None, status: Optional[str] = None,
+        priority: Optional[str] = None, category: Optional[str] = None
+    ) -> Tuple[List[Complaint], Optional[CursorKey]]:
+        """
+        Newest-first page of complaints after the keyset position `after`,
+        seeking on (created_at, id) so every page costs the same. Returns
+        (items, position of the last item if there are more pages).
+        """
+        query = self._page_statement(
+            db.query(Complaint).options(joinedload(Complaint.reporter_user)),
+            limit, after, user_id, area, status, priority, category
+        )
+        return self._page_result(query.all(), limit)
 
-    def get_by_area(self, db: Session, area: str) -> List[Complaint]:
-        return db.query(Complaint).options(joinedload(Complaint.reporter_user)).filter(Complaint.area == area).all()
+    @read_only
+    def list_summary_page(
+        self, db: Session, limit: int, after: Optional[CursorKey] = None,
+        user_id: Optional[int] = None, area: Optional[str] = None, status: Optional[str] = None,
+        priority: Optional[str] = None, category: Optional[str] = None
+    ) -> Tuple[List[Any], Optional[CursorKey]]:
+        """
+        list_page as plain rows of SUMMARY_COLUMNS (plus the reporter's
+        username): no ORM objects, no AI insight or media columns, and only
+        the start of each description.
+        """
+        statement = self._page_statement(
+            select(*SUMMARY_COLUMNS, User.username.label("reporter_username"))
+            .outerjoin(User, User.id == Complaint.user_id),
+            limit, after, user_id, area, status, priority, category
+        )
+        return self._page_result(db.execute(statement).all(), limit)
+
+    @primary_only
+    def list_changes(
+        self, db: Session, limit: int, after: Optional[CursorKey], settled_at: datetime,
+        user_id: Optional[int] = None, area: Optional[str] = None
+    ) -> Tuple[List[Complaint], List[int], CursorKey, bool]:
+        """
+        Complaints created or modified after the (updated_at, id) watermark,
+        oldest change first (seeking on the updated_at index), and ids deleted
+        in the same span. Returns (items, deleted ids, next watermark, has_more).
+
+        Once caught up, the watermark stops at settled_at, so rows committed
+        late with an earlier updated_at are re-sent rather than skipped. Reads
+        the primary: rows a lagging replica lacks would fall behind the
+        watermark and never be sent.
+        """
+        query = self._scoped(db.query(Complaint).options(joinedload(Complaint.reporter_user)), user_id, area)
+        if after:
+            updated_at, last_id = after
+            query = query.filter(or_(
+                Complaint.updated_at > updated_at,
+                and_(Complaint.updated_at == updated_at, Complaint.id > last_id),
+            ))
+        items = query.order_by(Complaint.updated_at, Complaint.id).limit(limit + 1).all()
+        has_more = len(items) > limit
+        items = items[:limit]
+        if has_more:
+            until = watermark = (items[-1].updated_at, items[-1].id)
+        else:
+            until = None
+            watermark = max((settled_at, 0), after) if after else (settled_at, 0)
+        changed = {c.id for c in items}
+        deleted = [
+            id for id in tombstone_repository.deleted_between(db, after, until, user_id, area) if id not in changed
+        ]
+        return items, deleted, watermark, has_more
+
+    def export_batches(
+        self, db: Session, columns: List, batch_size: int, area: Optional[str] = None,
+        since: Optional[datetime] = None, until: Optional[datetime] = None,
+        status: Optional[str] = None, category: Optional[str] = None
+    ) -> Iterator[List[tuple]]:
+        """
+        Plain row tuples of the given complaint columns in id order,
+        batch_size at a time off a streaming (server-side) cursor. No ORM
+        objects are built, so memory stays flat however many rows match.
+        """
+        statement = self._scoped(select(*columns), area=area)
+        if since:
+            statement = statement.filter(Complaint.created_at >= since)
+        if until:
+            statement = statement.filter(Complaint.created_at < until)
+        if status:
+            statement = statement.filter(Complaint.status == status.upper())
+        if category:
+            statement = statement.filter(Complaint.category == category)
+        # Generator body: replica_reads must cover the iteration, not just the call
+        with replica_reads(db):
+            result = db.execute(statement.order_by(Complaint.id), execution_options={"yield_per": batch_size})
+            try:
+                for partition in result.partitions():
+                    yield partition
+            finally:
+                result.close()
+
+    def lock_selection(
+        self, db: Session, changes: Dict[str, Any], limit: int, ids: Optional[List[int]] = None,
+        area: Optional[str] = None, status: Optional[str] = None, priority: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> List[Any]:
+        """
+        Complaints a bulk change would modify (matching the selection and
+        not already at the new values), locked until commit on databases
+        that support FOR UPDATE. Rows carry id, user_id, area, priority and
+        the counter / history columns as they are now; at most limit + 1.
+        """
+        columns = {Complaint.id, Complaint.user_id, Complaint.area, Complaint.priority, Complaint.assigned_to}
+        columns.update(getattr(Complaint, name) for name in TRACKED)
+        statement = self._scoped(select(*sorted(columns, key=lambda c: c.name)), area=area)
+        if ids is not None:
+            statement = statement.filter(Complaint.id.in_(ids))
+        if status:
+            statement = statement.filter(Complaint.status == status.upper())
+        if priority:
+            statement = statement.filter(Complaint.priority == priority.upper())
+        if category:
+            statement = statement.filter(Complaint.category == category)
+        statement = statement.filter(or_(*[
+            getattr(Complaint, name).is_distinct_from(value) for name, value in changes.items()
+        ]))
+        return db.execute(statement.order_by(Complaint.id).limit(limit + 1).with_for_update()).all()
+
+    def bulk_update(self, db: Session, rows: List[Any], changes: Dict[str, Any], changed_by: Optional[int] = None):
+        """
+        Apply changes to the locked rows with one UPDATE and commit. A
+        set-based UPDATE skips the flush hooks, so the density counters and
+        change history they would maintain are written here, in the same
+        transaction. (Frequency counters and tombstones are unaffected by
+        status or assignee changes.)
+        """
+        if not rows:
+            return
+        db.execute(
+            update(Complaint).where(Complaint.id.in_([row.id for row in rows])).values(**changes),
+            execution_options={"synchronize_session": False},
+        )
+        if any(name in TRACKED for name in changes):
+            density_repository.track_update(db, [tuple(getattr(row, name) for name in TRACKED) for row in rows], changes)
+        history_repository.record_many(db, [
+            (row.id, name, getattr(row, name), value)
+            for row in rows for name, value in changes.items() if getattr(row, name) != value
+        ], changed_by)
+        db.commit()
 
     def get_by_id(self, db: Session, id: int) -> Complaint:
         return db.query(Complaint).options(joinedload(Complaint.reporter_user)).filter(Complaint.id == id).first()
 
-    def get_nearby_complaints(self, db: Session, lat: float, lon: float, radius_km: float = 2.0) -> int:
-        # Simplified density check: just count complaints in the same area for now
-        # Ideally, this would use a spatial query if using PostGIS or a Haversine implementation in SQL
-        # Since we use SQLite, we can fetch all and filter in Python
-        all_complaints = db.query(Complaint).all()
-        count = 0
-        from math import radians, sin, cos, sqrt, atan2
-        
-        def calculate_distance(lat1, lon1, lat2, lon2):
-            R = 6371
-            lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-            a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-            c = 2 * atan2(sqrt(a), sqrt(1-a))
-            return R * c
-
-        for c in all_complaints:
-            if not c.location: continue
-            try:
-                coords = c.location.split('|')[0].strip().split(',')
-                c_lat, c_lon = float(coords[0]), float(coords[1])
-                if calculate_distance(lat, lon, c_lat, c_lon) <= radius_km:
-                    count += 1
-            except:
-                continue
-        return count
-
-    def get_historical_frequency(self, db: Session, category: str, area: str) -> int:
-        return db.query(Complaint).filter(
-            Complaint.category == category,
-            Complaint.area == area
-        ).count()
+    def create(self, db: Session, obj_in: Complaint) -> Complaint:
+        complaint = super().create(db, obj_in)
+        complaint_index.upsert(complaint.id, complaint.lat, complaint.lon)
+        priority_heatmap.add(complaint.lat, complaint.lon)
+        return complaint
+
+    def bulk_create(self, db: Session, complaints: List[Complaint]) -> List[Complaint]:
+        """
+        Insert all complaints in one transaction and one commit. On
+        PostgreSQL the ORM sends them as multi-row INSERT ... RETURNING
+        batches; SQLite has no way to match RETURNING rows to parameters,
+        so it still runs one INSERT per row, but without per-row commits.
+        The flush hooks update counters once for the whole batch, and the
+        returned complaints are detached with ids and defaults filled in,
+        so reading them after the commit costs no per-row refresh.
+        """
+        db.add_all(complaints)
+        db.flush()
+        for complaint in complaints:
+            db.expunge(complaint)
+        db.commit()
+        self.index_created(complaints)
+        return complaints
+
+    def index_created(self, complaints: List[Complaint]):
+        complaint_index.add_many((c.id, c.lat, c.lon) for c in complaints)
+        priority_heatmap.add_many([(c.lat, c.lon) for c in complaints])
+
+    def update(self, db: Session, db_obj: Complaint, obj_in: Any) -> Complaint:
+        if "location" in obj_in:
+            obj_in = {**obj_in, **location_columns(obj_in["location"])}
+        old_coords = (db_obj.lat, db_obj.lon)
+        complaint = super().update(db, db_obj, obj_in)
+        if "location" in obj_in:
+            complaint_index.upsert(complaint.id, complaint.lat, complaint.lon)
+            priority_heatmap.add(*old_coords, delta=-1)
+            priority_heatmap.add(complaint.lat, complaint.lon)
+        return complaint
+
+    def remove(self, db: Session, id: Any) -> Complaint:
+        complaint = super().remove(db, id)
+        complaint_index.remove(id)
+        if complaint:
+            priority_heatmap.add(complaint.lat, complaint.lon, delta=-1)
+        return complaint
+
+    def warm_spatial_index(self, db: Session):
+        """Build the in-memory spatial index from every stored complaint coordinate."""
+        synced_at = datetime.utcnow() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+        complaint_index.build(
+            db.query(Complaint.id, Complaint.lat, Complaint.lon).filter(Complaint.lat.isnot(None)).all()
+        )
+        complaint_index.synced_at = synced_at
+
+    @read_only
+    def complaint_points(self, db: Session) -> List[tuple]:
+        """(lat, lon) of every complaint with coordinates, for the heatmap density layer."""
+        return db.query(Complaint.lat, Complaint.lon).filter(Complaint.lat.isnot(None)).all()
+
+    @primary_only
+    def sync_spatial_state(self, db: Session):
+        """
+        Apply complaints other workers / background sessions created, moved
+        or deleted since the last sync: rows changed after the watermark (on
+        the (updated_at, id) index) and tombstones. The watermark trails the
+        clock by SYNC_SETTLE_SECONDS so late commits are picked up; rows this
+        worker already applied are no-ops.
+        """
+        since = complaint_index.synced_at
+        now = datetime.utcnow()
+        query = db.query(Complaint.id, Complaint.lat, Complaint.lon)
+        if since is None:
+            # Index built without a watermark: only new ids can be told apart
+            rows, deleted = query.filter(Complaint.id > complaint_index.max_id).all(), []
+        else:
+            rows = query.filter(Complaint.updated_at >= since).all()
+            deleted = tombstone_repository.deleted_between(db, (since, 0), None)
+        removed, added = complaint_index.apply_changes(rows, deleted)
+        for lat, lon in removed:
+            priority_heatmap.add(lat, lon, delta=-1)
+        priority_heatmap.add_many(added)
+        complaint_index.synced_at = now - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+
+    def sync_spatial_state_if_due(self, db: Session) -> bool:
+        """
+        sync_spatial_state, unless the index was synced less than
+        SPATIAL_SYNC_SECONDS ago; for callers that run often (AI jobs).
+        """
+        if not complaint_index.ready:
+            return False
+        synced_at = complaint_index.synced_at
+        lag = timedelta(seconds=settings.SYNC_SETTLE_SECONDS + settings.SPATIAL_SYNC_SECONDS)
+        if synced_at is not None and datetime.utcnow() - synced_at < lag:
+            return False
+        self.sync_spatial_state(db)
+        return True
+
+    def _within_box(self, query, lat: float, lon: float, radius_km: float):
+        # SQL prefilter on the indexed lat/lon columns; callers apply the exact haversine
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        return query.filter(
+            Complaint.lat.between(min_lat, max_lat),
+            Complaint.lon.between(min_lon, max_lon)
+        )
+
+    @read_only
+    def get_nearby_complaints(
+        self, db: Session, lat: float, lon: float, radius_km: float = 2.0,
+        category: Optional[str] = None, since_days: Optional[int] = None, open_only: bool = False
+    ) -> int:
+        """
+        Complaints within radius_km. Unfiltered counts come from the
+        in-memory index as it stands: callers keep it current with
+        sync_spatial_state(_if_due) once per batch, not per lookup.
+        """
+        if category is not None or since_days or open_only:
+            # Filtered / rolling-window counts come from the per-cell counters
+            return density_repository.count_within(db, lat, lon, radius_km, category, since_days, open_only)
+        if complaint_index.ready:
+            return complaint_index.count_within(lat, lon, radius_km)
+        rows = self._within_box(db.query(Complaint.lat, Complaint.lon), lat, lon, radius_km).all()
+        if not rows:
+            return 0
+        lats, lons = zip(*rows)
+        return int((haversine_many(lat, lon, lats, lons) <= radius_km).sum())
+
+    @read_only
+    def list_nearby_complaints(self, db: Session, lat: float, lon: float, radius_km: float = 2.0) -> List[Complaint]:
+        candidates = self._within_box(
+            db.query(Complaint).options(joinedload(Complaint.reporter_user)), lat, lon, radius_km
+        ).all()
+        if not candidates:
+            return []
+        dists = haversine_many(lat, lon, [c.lat for c in candidates], [c.lon for c in candidates])
+        return [c for c, dist in zip(candidates, dists) if dist <= radius_km]
+
+    @read_only
+    def get_historical_frequency(self, db: Session, category: str, area: str, since_days: Optional[int] = None) -> int:
+        # Answered from the (category, area, day) rollup, never the complaints table
+        return frequency_repository.count(db, category, area, since_days)
 
 complaint_repository = ComplaintRepository()
+
+class AsyncComplaintRepository(AsyncBaseRepository[Complaint]):
+    """
+    AsyncSession twin of ComplaintRepository for async controllers. Shares
+    its query building, and the same flush hooks keep the counters and
+    tombstones current.
+    """
+
+    def __init__(self):
+        super().__init__(Complaint)
+
+    async def get_by_id(self, db: AsyncSession, id: int) -> Optional[Complaint]:
+        result = await db.execute(
+            select(Complaint).options(joinedload(Complaint.reporter_user)).where(Complaint.id == id)
+        )
+        return result.scalars().first()
+
+    async def create(self, db: AsyncSession, obj_in: Complaint) -> Complaint:
+        complaint = await super().create(db, obj_in)
+        complaint_index.upsert(complaint.id, complaint.lat, complaint.lon)
+        priority_heatmap.add(complaint.lat, complaint.lon)
+        # Reload with the reporter, which responses serialize (no lazy loads under asyncio)
+        return await self.get_by_id(db, complaint.id)
+
+    async def bulk_create(self, db: AsyncSession, complaints: List[Complaint]) -> List[Complaint]:
+        """See ComplaintRepository.bulk_create."""
+        db.add_all(complaints)
+        await db.flush()
+        for complaint in complaints:
+            db.expunge(complaint)
+        await db.commit()
+        complaint_repository.index_created(complaints)
+        return complaints
+
+    @read_only
+    async def list_page(
+        self, db: AsyncSession, limit: int, after: Optional[CursorKey] = None,
+        user_id: Optional[int] = None, area: Optional[str] = None, status: Optional[str] = None,
+        priority: Optional[str] = None, category: Optional[str] = None
+    ) -> Tuple[List[Complaint], Optional[CursorKey]]:
+        """See ComplaintRepository.list_page."""
+        statement = complaint_repository._page_statement(
+            select(Complaint).options(joinedload(Complaint.reporter_user)),
+            limit, after, user_id, area, status, priority, category
+        )
+        result = await db.execute(statement)
+        return complaint_repository._page_result(list(result.scalars().unique()), limit)
+
+async_complaint_repository = AsyncComplaintRepository()
@@ -0,0 +1,217 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from math import floor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..core.geo import bounding_box, haversine_many
+from ..models.complaint import Complaint
+from ..models.complaint_density import ComplaintDensityCell
+
+# ~275 m cells: a 2 km radius sums ~170 cells, accurate to about half a cell
+DENSITY_CELL_DEG = 0.0025
+CLOSED_STATUSES = ("RESOLVED", "CLOSED", "REJECTED")
+# Complaint columns that decide which counter a complaint lands in
+TRACKED = ("lat", "lon", "category", "status", "created_at")
+
+CounterKey = Tuple[int, int, str, date]
+
+def upsert_counters(session: Session, table, deltas: Dict[tuple, Dict[str, int]]):
+    """
+    Add deltas to counter rows keyed by the table's primary key (in column
+    order), inserting missing rows, with one dialect-native upsert per key.
+    """
+    conn = session.connection()
+    key_names = [c.name for c in table.primary_key]
+    dialect = conn.dialect.name
+    for key, counts in deltas.items():
+        if not any(counts.values()):
+            continue
+        values = dict(zip(key_names, key), **counts)
+        increment = {name: table.c[name] + delta for name, delta in counts.items()}
+        if dialect in ("sqlite", "postgresql"):
+            dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            conn.execute(
+                dialect_insert(table).values(**values)
+                .on_conflict_do_update(index_elements=key_names, set_=increment)
+            )
+        elif dialect in ("mysql", "mariadb"):
+            conn.execute(mysql.insert(table).values(**values).on_duplicate_key_update(**increment))
+        else:
+            result = conn.execute(
+                update(table).where(*[table.c[name] == value for name, value in zip(key_names, key)]).values(**increment)
+            )
+            if not result.rowcount:
+                conn.execute(insert(table).values(**values))
+
+class DensityRepository:
+    """
+    Per-cell complaint counters. Every flush that adds, moves, recategorises,
+    resolves or deletes complaints turns those changes into counter deltas
+    and upserts them in the same transaction (see track_changes), so the
+    counters stay exact for writes made through any code path.
+    """
+
+    def cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return floor(lat / DENSITY_CELL_DEG), floor(lon / DENSITY_CELL_DEG)
+
+    def _counter(self, lat, lon, category, status, created_at) -> Optional[Tuple[CounterKey, int]]:
+        """(counter key, open flag) a complaint with these values contributes to."""
+        if lat is None or lon is None:
+            return None
+        day = (created_at or datetime.utcnow()).date()
+        is_open = 0 if (status or "").upper() in CLOSED_STATUSES else 1
+        return (*self.cell(lat, lon), category or "", day), is_open
+
+    # ---- write path ----
+
+    def track_changes(self, session: Session, flush_context, instances):
+        deltas: Dict[CounterKey, list] = defaultdict(lambda: [0, 0])
+
+        def apply(values, sign):
+            counter = self._counter(*values)
+            if counter:
+                key, is_open = counter
+                deltas[key][0] += sign
+                deltas[key][1] += sign * is_open
+
+        for obj in session.new:
+            if isinstance(obj, Complaint):
+                apply([getattr(obj, name) for name in TRACKED], 1)
+
+        changed = [
+            obj for obj in session.dirty
+            if isinstance(obj, Complaint) and obj.id is not None and session.is_modified(obj, include_collections=False)
+        ]
+        deleted = [obj for obj in session.deleted if isinstance(obj, Complaint) and obj.id is not None]
+        old = {}
+        if changed or deleted:
+            # Old values come from the database (still pre-flush), so expired attributes are fine
+            ids = [obj.id for obj in changed + deleted]
+            old = {
+                row[0]: tuple(row[1:])
+                for row in session.connection().execute(
+                    select(Complaint.id, *[getattr(Complaint, name) for name in TRACKED]).where(Complaint.id.in_(ids))
+                )
+            }
+        for obj in changed:
+            new_values = tuple(getattr(obj, name) for name in TRACKED)
+            if obj.id in old and old[obj.id] != new_values:
+                apply(old[obj.id], -1)
+                apply(new_values, 1)
+        for obj in deleted:
+            if obj.id in old:
+                apply(old[obj.id], -1)
+        if deltas:
+            self._apply(session, deltas)
+
+    def track_update(self, session: Session, rows: List[tuple], changes: Dict[str, Any]):
+        """
+        Counter deltas for a set-based UPDATE, which skips the flush hook:
+        rows are the TRACKED values of the affected complaints before it.
+        """
+        deltas: Dict[CounterKey, list] = defaultdict(lambda: [0, 0])
+        for old in rows:
+            new = tuple(changes.get(name, value) for name, value in zip(TRACKED, old))
+            for values, sign in ((old, -1), (new, 1)):
+                counter = self._counter(*values)
+                if counter:
+                    key, is_open = counter
+                    deltas[key][0] += sign
+                    deltas[key][1] += sign * is_open
+        if deltas:
+            self._apply(session, deltas)
+
+    def _apply(self, session: Session, deltas: Dict[CounterKey, list]):
+        upsert_counters(session, ComplaintDensityCell.__table__, {
+            key: {"total_count": d_total, "open_count": d_open} for key, (d_total, d_open) in deltas.items()
+        })
+
+    def rebuild(self, db: Session) -> int:
+        """Recompute every counter from the complaints table (backfill / repair)."""
+        db.query(ComplaintDensityCell).delete()
+        rows: Dict[CounterKey, list] = defaultdict(lambda: [0, 0])
+        query = db.query(*[getattr(Complaint, name) for name in TRACKED]).filter(Complaint.lat.isnot(None))
+        for values in query.yield_per(5000):
+            counter = self._counter(*values)
+            if counter:
+                key, is_open = counter
+                rows[key][0] += 1
+                rows[key][1] += is_open
+        db.bulk_insert_mappings(ComplaintDensityCell, [
+            dict(cell_y=k[0], cell_x=k[1], category=k[2], day=k[3], total_count=v[0], open_count=v[1])
+            for k, v in rows.items()
+        ])
+        db.commit()
+        return len(rows)
+
+    # ---- read path ----
+
+    def count_within(
+        self,
+        db: Session,
+        lat: float,
+        lon: float,
+        radius_km: float = 2.0,
+        category: Optional[str] = None,
+        since_days: Optional[int] = None,
+        open_only: bool = False,
+    ) -> int:
+        """
+        Complaints in the cells whose center lies within radius_km, optionally
+        for one category, created in the last since_days days (today
+        included), or still open.
+        """
+        return self.count_within_many(db, [(lat, lon)], radius_km, category, since_days, open_only)[0]
+
+    def count_within_many(
+        self,
+        db: Session,
+        points: Sequence[Tuple[float, float]],
+        radius_km: float = 2.0,
+        category: Optional[str] = None,
+        since_days: Optional[int] = None,
+        open_only: bool = False,
+    ) -> List[int]:
+        """count_within for every point, from one counter query over the cells they all reach."""
+        if not len(points):
+            return []
+        boxes = [bounding_box(lat, lon, radius_km) for lat, lon in points]
+        y0, x0 = self.cell(min(b[0] for b in boxes), min(b[2] for b in boxes))
+        y1, x1 = self.cell(max(b[1] for b in boxes), max(b[3] for b in boxes))
+        column = ComplaintDensityCell.open_count if open_only else ComplaintDensityCell.total_count
+        query = db.query(ComplaintDensityCell.cell_y, ComplaintDensityCell.cell_x, func.sum(column)).filter(
+            ComplaintDensityCell.cell_y.between(y0, y1),
+            ComplaintDensityCell.cell_x.between(x0, x1),
+        )
+        if category is not None:
+            query = query.filter(ComplaintDensityCell.category == category)
+        if since_days:
+            query = query.filter(ComplaintDensityCell.day >= datetime.utcnow().date() - timedelta(days=since_days - 1))
+        rows = query.group_by(ComplaintDensityCell.cell_y, ComplaintDensityCell.cell_x).all()
+        if not rows:
+            return [0] * len(points)
+        ys, xs, counts = (np.array(column) for column in zip(*rows))
+        counts = np.array([int(c or 0) for c in counts])
+        center_lats = (ys + 0.5) * DENSITY_CELL_DEG
+        center_lons = (xs + 0.5) * DENSITY_CELL_DEG
+        results = []
+        for (lat, lon), (min_lat, max_lat, min_lon, max_lon) in zip(points, boxes):
+            py0, px0 = self.cell(min_lat, min_lon)
+            py1, px1 = self.cell(max_lat, max_lon)
+            near = (ys >= py0) & (ys <= py1) & (xs >= px0) & (xs <= px1)
+            if not near.any():
+                results.append(0)
+                continue
+            inside = haversine_many(lat, lon, center_lats[near], center_lons[near]) <= radius_km
+            results.append(int(counts[near][inside].sum()))
+        return results
+
+density_repository = DensityRepository()
+
+# Keep counters in the same transaction as every complaint write
+event.listen(Session, "before_flush", density_repository.track_changes)
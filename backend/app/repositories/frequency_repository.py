@@ -0,0 +1,117 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from ..models.complaint import Complaint
+from ..models.complaint_frequency import ComplaintFrequencyCount
+from .density_repository import upsert_counters
+
+# Complaint columns that decide which counter a complaint lands in
+TRACKED = ("category", "area", "created_at")
+
+CounterKey = Tuple[str, str, date]
+
+class FrequencyRepository:
+    """
+    Per-(category, area, day) complaint counters, the rollup behind
+    get_historical_frequency. Kept current from the same before_flush hook
+    pattern as the density counters, so inserts and AI reclassification
+    (category / area changes) move counts in the complaint's transaction.
+    """
+
+    def _counter(self, category, area, created_at) -> Optional[CounterKey]:
+        # Uncategorised or unrouted complaints are never asked about
+        if not category or not area:
+            return None
+        return category, area, (created_at or datetime.utcnow()).date()
+
+    # ---- write path ----
+
+    def track_changes(self, session: Session, flush_context, instances):
+        deltas: Dict[CounterKey, int] = defaultdict(int)
+
+        def apply(values, sign):
+            key = self._counter(*values)
+            if key:
+                deltas[key] += sign
+
+        for obj in session.new:
+            if isinstance(obj, Complaint):
+                apply([getattr(obj, name) for name in TRACKED], 1)
+
+        changed = [
+            obj for obj in session.dirty
+            if isinstance(obj, Complaint) and obj.id is not None and session.is_modified(obj, include_collections=False)
+        ]
+        deleted = [obj for obj in session.deleted if isinstance(obj, Complaint) and obj.id is not None]
+        old = {}
+        if changed or deleted:
+            ids = [obj.id for obj in changed + deleted]
+            old = {
+                row[0]: tuple(row[1:])
+                for row in session.connection().execute(
+                    select(Complaint.id, *[getattr(Complaint, name) for name in TRACKED]).where(Complaint.id.in_(ids))
+                )
+            }
+        for obj in changed:
+            new_values = tuple(getattr(obj, name) for name in TRACKED)
+            if obj.id in old and old[obj.id] != new_values:
+                apply(old[obj.id], -1)
+                apply(new_values, 1)
+        for obj in deleted:
+            if obj.id in old:
+                apply(old[obj.id], -1)
+        if deltas:
+            upsert_counters(session, ComplaintFrequencyCount.__table__, {
+                key: {"count": delta} for key, delta in deltas.items()
+            })
+
+    def rebuild(self, db: Session) -> int:
+        """Recompute every counter from the complaints table (backfill / repair)."""
+        db.query(ComplaintFrequencyCount).delete()
+        rows: Dict[CounterKey, int] = defaultdict(int)
+        query = db.query(*[getattr(Complaint, name) for name in TRACKED]).filter(
+            Complaint.category.isnot(None), Complaint.area.isnot(None)
+        )
+        for values in query.yield_per(5000):
+            key = self._counter(*values)
+            if key:
+                rows[key] += 1
+        db.bulk_insert_mappings(ComplaintFrequencyCount, [
+            dict(category=k[0], area=k[1], day=k[2], count=v) for k, v in rows.items()
+        ])
+        db.commit()
+        return len(rows)
+
+    # ---- read path ----
+
+    def _since(self, query, since_days: Optional[int]):
+        if since_days:
+            query = query.filter(ComplaintFrequencyCount.day >= datetime.utcnow().date() - timedelta(days=since_days - 1))
+        return query
+
+    def count(self, db: Session, category: str, area: str, since_days: Optional[int] = None) -> int:
+        """Complaints of this category in this area, optionally in the last since_days days (today included)."""
+        if not category or not area:
+            return 0
+        query = db.query(func.sum(ComplaintFrequencyCount.count)).filter(
+            ComplaintFrequencyCount.category == category,
+            ComplaintFrequencyCount.area == area,
+        )
+        return int(self._since(query, since_days).scalar() or 0)
+
+    def counts(self, db: Session, since_days: Optional[int] = None) -> Dict[Tuple[str, str], int]:
+        """{(category, area): count} for every pair, for batch scoring."""
+        query = db.query(
+            ComplaintFrequencyCount.category, ComplaintFrequencyCount.area, func.sum(ComplaintFrequencyCount.count)
+        )
+        query = self._since(query, since_days).group_by(ComplaintFrequencyCount.category, ComplaintFrequencyCount.area)
+        return {(category, area): int(n or 0) for category, area, n in query}
+
+frequency_repository = FrequencyRepository()
+
+# Keep counters in the same transaction as every complaint write
+event.listen(Session, "before_flush", frequency_repository.track_changes)
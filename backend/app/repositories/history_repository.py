@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from ..models.complaint import Complaint
+from ..models.complaint_history import ComplaintHistory
+
+# Complaint columns whose changes are kept
+HISTORY_FIELDS = ("status", "assigned_to")
+
+# (complaint_id, field, old value, new value)
+Change = Tuple[int, str, Any, Any]
+
+def _text(value) -> Optional[str]:
+    return None if value is None else str(value)
+
+class HistoryRepository:
+    """
+    Status / assignee change log. ORM writes are recorded from a
+    before_flush hook, crediting the session's bound user (see
+    core.db_routing.bind_user); set-based updates call record_many.
+    """
+
+    def track_changes(self, session: Session, flush_context, instances):
+        changes = []
+        for obj in session.dirty:
+            if not isinstance(obj, Complaint) or obj.id is None:
+                continue
+            for field in HISTORY_FIELDS:
+                history = get_history(obj, field)
+                if history.added and history.added[0] != (history.deleted[0] if history.deleted else None):
+                    changes.append((obj.id, field, history.deleted[0] if history.deleted else None, history.added[0]))
+        if changes:
+            self.record_many(session, changes, session.info.get("user_id"))
+
+    def record_many(self, db: Session, changes: Iterable[Change], changed_by: Optional[int] = None):
+        """Insert the change rows with one executemany."""
+        now = datetime.utcnow()
+        rows = [
+            {"complaint_id": complaint_id, "field": field, "old_value": _text(old), "new_value": _text(new),
+             "changed_by": changed_by, "changed_at": now}
+            for complaint_id, field, old, new in changes
+        ]
+        if rows:
+            db.connection().execute(insert(ComplaintHistory.__table__), rows)
+
+    def for_complaint(self, db: Session, complaint_id: int) -> List[ComplaintHistory]:
+        return (
+            db.query(ComplaintHistory)
+            .filter(ComplaintHistory.complaint_id == complaint_id)
+            .order_by(ComplaintHistory.changed_at, ComplaintHistory.id)
+            .all()
+        )
+
+history_repository = HistoryRepository()
+
+# History commits or rolls back together with the change
+event.listen(Session, "before_flush", history_repository.track_changes)
@@ -0,0 +1,162 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.db_routing import read_only
+from ..models.complaint import Complaint
+from ..models.complaint_history import ComplaintHistory
+from ..models.complaint_stats import ComplaintResolutionBucket, ComplaintStatusCount
+
+# Upper bounds (hours) of the time-to-resolve buckets; one more bucket holds everything slower
+RESOLVE_BUCKET_HOURS = (1, 2, 4, 8, 12, 24, 36, 48, 72, 96, 120, 168, 240, 336, 504, 720)
+# Same targets as the AI pipeline's SLA labels, for suggested_sla text without a number
+PRIORITY_SLA_HOURS = {"CRITICAL": 4, "HIGH": 24, "MEDIUM": 48, "LOW": 72}
+RESOLVED_STATUS = "RESOLVED"
+
+_SLA_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(h|hr|hrs|hours?|d|days?)\b", re.IGNORECASE)
+
+@lru_cache(maxsize=256)
+def sla_hours(suggested_sla: Optional[str], priority: Optional[str]) -> float:
+    """
+    SLA target of a complaint: the duration in its suggested_sla label
+    ("High Priority (24 Hrs)", "2 days"), else its priority's target.
+    """
+    match = _SLA_PATTERN.search(suggested_sla or "")
+    if match:
+        value = float(match.group(1))
+        return value * 24 if match.group(2).lower().startswith("d") else value
+    return PRIORITY_SLA_HOURS.get((priority or "").upper(), settings.STATS_DEFAULT_SLA_HOURS)
+
+def resolve_bucket(hours: float) -> int:
+    return bisect_left(RESOLVE_BUCKET_HOURS, hours)
+
+def bucket_percentile(counts: Sequence[int], q: float) -> Optional[float]:
+    """
+    q-quantile (0..1) of a RESOLVE_BUCKET_HOURS histogram, interpolated
+    linearly inside its bucket; the overflow bucket reports its lower bound.
+    """
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(counts):
+        if count and seen + count >= rank:
+            if index == len(RESOLVE_BUCKET_HOURS):
+                return float(RESOLVE_BUCKET_HOURS[-1])
+            low = RESOLVE_BUCKET_HOURS[index - 1] if index else 0
+            return round(low + (RESOLVE_BUCKET_HOURS[index] - low) * (rank - seen) / count, 2)
+        seen += count
+    return float(RESOLVE_BUCKET_HOURS[-1])
+
+class StatsRepository:
+    """
+    Dashboard rollups. refresh() rebuilds the status counts and brings the
+    hourly resolution buckets up to date; the read methods only touch the
+    rollup tables, whose size depends on areas x categories (and the hour
+    window), never on how many complaints there are.
+    """
+
+    # ---- write path (scheduler) ----
+
+    def refresh_status_counts(self, db: Session, now: datetime) -> int:
+        rows = db.execute(
+            select(Complaint.area, Complaint.category, Complaint.status, Complaint.priority, func.count())
+            .group_by(Complaint.area, Complaint.category, Complaint.status, Complaint.priority)
+        ).all()
+        counts: Dict[tuple, int] = defaultdict(int)
+        for area, category, status, priority, count in rows:
+            counts[(area or "", category or "", status or "", priority or "")] += count
+        db.execute(delete(ComplaintStatusCount))
+        if counts:
+            db.execute(insert(ComplaintStatusCount), [
+                dict(area=k[0], category=k[1], status=k[2], priority=k[3], count=v, refreshed_at=now)
+                for k, v in counts.items()
+            ])
+        return len(counts)
+
+    def refresh_resolutions(self, db: Session) -> int:
+        """
+        Re-aggregate resolutions from the newest rolled-up hour on (the hour
+        before it too, for transactions that committed late); the first run
+        rolls up all of complaint_history.
+        """
+        last_hour = db.execute(select(func.max(ComplaintResolutionBucket.hour))).scalar()
+        since = last_hour - timedelta(hours=1) if last_hour else None
+        query = (
+            select(
+                ComplaintHistory.changed_at, Complaint.created_at, Complaint.area, Complaint.category,
+                Complaint.suggested_sla, Complaint.priority,
+            )
+            .join(Complaint, Complaint.id == ComplaintHistory.complaint_id)
+            .where(ComplaintHistory.field == "status", ComplaintHistory.new_value == RESOLVED_STATUS)
+        )
+        if since is not None:
+            query = query.where(ComplaintHistory.changed_at >= since)
+            db.execute(delete(ComplaintResolutionBucket).where(ComplaintResolutionBucket.hour >= since))
+
+        buckets: Dict[tuple, list] = defaultdict(lambda: [0, 0])
+        for changed_at, created_at, area, category, suggested_sla, priority in db.execute(query):
+            hours = max((changed_at - (created_at or changed_at)).total_seconds() / 3600, 0.0)
+            key = (changed_at.replace(minute=0, second=0, microsecond=0), area or "", category or "", resolve_bucket(hours))
+            buckets[key][0] += 1
+            buckets[key][1] += hours <= sla_hours(suggested_sla, priority)
+        if buckets:
+            db.execute(insert(ComplaintResolutionBucket), [
+                dict(hour=k[0], area=k[1], category=k[2], bucket=k[3], resolved_count=v[0], within_sla_count=v[1])
+                for k, v in buckets.items()
+            ])
+        return len(buckets)
+
+    def refresh(self, db: Session) -> Tuple[int, int]:
+        """Bring both rollups up to date in one transaction; returns their row counts."""
+        now = datetime.utcnow()
+        try:
+            counts = self.refresh_status_counts(db, now)
+            buckets = self.refresh_resolutions(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return counts, buckets
+
+    # ---- read path ----
+
+    @read_only
+    def status_counts(self, db: Session, area: Optional[str] = None) -> List[tuple]:
+        """(area, category, status, priority, count) rows, optionally for one area."""
+        query = select(
+            ComplaintStatusCount.area, ComplaintStatusCount.category, ComplaintStatusCount.status,
+            ComplaintStatusCount.priority, ComplaintStatusCount.count,
+        )
+        if area is not None:
+            query = query.where(ComplaintStatusCount.area == area)
+        return db.execute(query).all()
+
+    @read_only
+    def refreshed_at(self, db: Session) -> Optional[datetime]:
+        return db.execute(select(func.max(ComplaintStatusCount.refreshed_at))).scalar()
+
+    @read_only
+    def resolution_buckets(self, db: Session, since: datetime, area: Optional[str] = None) -> List[tuple]:
+        """(area, category, bucket, resolved, within SLA) summed over the hours from since."""
+        query = (
+            select(
+                ComplaintResolutionBucket.area, ComplaintResolutionBucket.category, ComplaintResolutionBucket.bucket,
+                func.sum(ComplaintResolutionBucket.resolved_count), func.sum(ComplaintResolutionBucket.within_sla_count),
+            )
+            .where(ComplaintResolutionBucket.hour >= since)
+            .group_by(ComplaintResolutionBucket.area, ComplaintResolutionBucket.category, ComplaintResolutionBucket.bucket)
+        )
+        if area is not None:
+            query = query.where(ComplaintResolutionBucket.area == area)
+        return db.execute(query).all()
+
+stats_repository = StatsRepository()
@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import and_, event, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from ..core.pagination import CursorKey
+from ..models.complaint import Complaint
+from ..models.complaint_tombstone import ComplaintAreaExit, ComplaintTombstone
+
+def _in_window(query, time_column, id_column, after: Optional[CursorKey], until: Optional[CursorKey]):
+    """Rows after the `after` watermark, up to and including `until`."""
+    if after:
+        at, last_id = after
+        query = query.filter(or_(time_column > at, and_(time_column == at, id_column > last_id)))
+    if until:
+        at, last_id = until
+        query = query.filter(or_(time_column < at, and_(time_column == at, id_column <= last_id)))
+    return query
+
+class TombstoneRepository:
+    """
+    Records deleted complaints, and complaints re-routed out of an area,
+    for GET /complaints/changes. Written from before_flush hooks, like the
+    counter repositories, so every delete / move path leaves its record in
+    its own transaction.
+    """
+
+    def track_deletes(self, session: Session, flush_context, instances):
+        now = datetime.utcnow()
+        for obj in session.deleted:
+            if isinstance(obj, Complaint) and obj.id is not None:
+                session.merge(ComplaintTombstone(
+                    complaint_id=obj.id, user_id=obj.user_id, area=obj.area, deleted_at=now
+                ))
+
+    def track_area_exits(self, session: Session, flush_context, instances):
+        moved = [
+            obj for obj in session.dirty
+            if isinstance(obj, Complaint) and obj.id is not None and get_history(obj, "area").added
+        ]
+        if not moved:
+            return
+        # Old areas come from the database (still pre-flush), so expired attributes are fine
+        old_areas = dict(session.connection().execute(
+            select(Complaint.id, Complaint.area).where(Complaint.id.in_([obj.id for obj in moved]))
+        ).all())
+        now = datetime.utcnow()
+        for obj in moved:
+            old_area = old_areas.get(obj.id)
+            if old_area is not None and old_area != obj.area:
+                session.merge(ComplaintAreaExit(
+                    complaint_id=obj.id, area=old_area, user_id=obj.user_id, exited_at=now
+                ))
+
+    def deleted_between(
+        self, db: Session, after: Optional[CursorKey], until: Optional[CursorKey],
+        user_id: Optional[int] = None, area: Optional[str] = None
+    ) -> List[int]:
+        """
+        Ids deleted after the `after` watermark, up to and including `until`;
+        for an area scope, also ids re-routed out of that area.
+        """
+        query = db.query(ComplaintTombstone.deleted_at, ComplaintTombstone.complaint_id)
+        if user_id is not None:
+            query = query.filter(ComplaintTombstone.user_id == user_id)
+        if area is not None:
+            query = query.filter(ComplaintTombstone.area == area)
+        rows = _in_window(query, ComplaintTombstone.deleted_at, ComplaintTombstone.complaint_id, after, until).all()
+        if area is not None:
+            exits = db.query(ComplaintAreaExit.exited_at, ComplaintAreaExit.complaint_id).filter(
+                ComplaintAreaExit.area == area
+            )
+            if user_id is not None:
+                exits = exits.filter(ComplaintAreaExit.user_id == user_id)
+            rows += _in_window(exits, ComplaintAreaExit.exited_at, ComplaintAreaExit.complaint_id, after, until).all()
+        return list(dict.fromkeys(id for _, id in sorted(rows)))
+
+tombstone_repository = TombstoneRepository()
+
+# Tombstones and area exits commit or roll back together with the delete / move
+event.listen(Session, "before_flush", tombstone_repository.track_deletes)
+event.listen(Session, "before_flush", tombstone_repository.track_area_exits)
@@ -1,5 +1,8 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from .base_repository import BaseRepository
+from typing import Dict, List, Optional, Tuple
+from .base_repository import BaseRepository, AsyncBaseRepository
 from ..models.user import User
 
 class UserRepository(BaseRepository[User]):
@@ -12,4 +15,21 @@ class UserRepository(BaseRepository[User]):
     def get_by_email(self, db: Session, email: str) -> User:
         return db.query(User).filter(User.email == email).first()
 
+    def get_contacts(self, db: Session, user_ids: List[int]) -> Dict[int, Tuple[str, Optional[str]]]:
+        """user id -> (email, phone) for many users in one query."""
+        rows = db.query(User.id, User.email, User.phone).filter(User.id.in_(set(user_ids))).all()
+        return {id: (email, phone) for id, email, phone in rows}
+
 user_repository = UserRepository()
+
+class AsyncUserRepository(AsyncBaseRepository[User]):
+    def __init__(self):
+        super().__init__(User)
+
+    async def get_by_username(self, db: AsyncSession, username: str) -> User:
+        return (await db.execute(select(User).where(User.username == username))).scalars().first()
+
+    async def get_by_email(self, db: AsyncSession, email: str) -> User:
+        return (await db.execute(select(User).where(User.email == email))).scalars().first()
+
+async_user_repository = AsyncUserRepository()
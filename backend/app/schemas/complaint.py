@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class ComplaintBase(BaseModel):
@@ -11,6 +11,46 @@ class ComplaintBase(BaseModel):
 class ComplaintCreate(ComplaintBase):
     pass
 
+class ComplaintBatchItem(BaseModel):
+    client_ref: Optional[str] = None # Echoed back so offline clients can match results
+    description: str = ""
+    location: Optional[str] = None # Required, checked per item
+    area: Optional[str] = None # Required, checked per item
+    image_url: Optional[str] = None
+    audio_url: Optional[str] = None
+
+class ComplaintBatch(BaseModel):
+    items: List[ComplaintBatchItem]
+
+class ComplaintBatchResult(BaseModel):
+    index: int # Position in the submitted items
+    client_ref: Optional[str] = None
+    id: Optional[int] = None # Set when created
+    status: str # "created" or "rejected"
+    error: Optional[str] = None
+
+class ComplaintBatchResponse(BaseModel):
+    created: int
+    rejected: int
+    results: List[ComplaintBatchResult]
+
+class ComplaintSelection(BaseModel):
+    ids: Optional[List[int]] = None # Explicit complaints, and/or filters below
+    area: Optional[str] = None # Area admins are always limited to their zone
+    status: Optional[str] = None # Current status e.g. 'IN_PROGRESS'
+    priority: Optional[str] = None
+    category: Optional[str] = None
+
+class BulkStatusUpdate(ComplaintSelection):
+    new_status: str
+
+class BulkAssign(ComplaintSelection):
+    worker_id: int
+
+class BulkUpdateResult(BaseModel):
+    updated: int
+    ids: List[int] # Complaints changed (already-matching ones are skipped)
+
 class ComplaintUpdate(BaseModel):
     status: Optional[str] = None
     priority: Optional[str] = None
@@ -41,3 +81,29 @@ class ComplaintResponse(ComplaintBase):
 
     class Config:
         from_attributes = True
+
+class ReporterName(BaseModel):
+    id: int
+    username: str
+
+class ComplaintSummary(BaseModel):
+    """List row of GET /complaints; GET /complaints/{id} has the full complaint."""
+    id: int
+    user_id: Optional[int] = None
+    reporter_user: Optional[ReporterName] = None
+    description: str # First 160 characters
+    location: Optional[str] = None
+    area: Optional[str] = None
+    category: Optional[str] = None
+    status: str
+    priority: str
+    priority_score: Optional[int] = None
+    suggested_sla: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+class ComplaintChanges(BaseModel):
+    items: List[ComplaintResponse] # Created or modified since the watermark, oldest change first
+    deleted: List[int] # Ids deleted since the watermark
+    watermark: str # Pass back as ?since= on the next poll
+    has_more: bool # Poll again right away for the rest
@@ -1,25 +1,36 @@
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Any, Dict, List
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, BackgroundTasks
 from ..repositories.complaint_repository import complaint_repository
 from ..repositories.user_repository import user_repository
 from ..models.user import User
-from ..services.notification_service import notify_status_change
+from ..services.notification_service import notify_status_change, notify_status_changes
+from ..core.events import complaint_events
+from ..core.config import settings
+from ..core.security import admin_area_scope
+from ..schemas.complaint import BulkAssign, BulkStatusUpdate, ComplaintSelection
+from ..core.database import pool_stats, async_pool_stats, replica_engines
+from ..services.reprioritization_service import reprioritization_service
+from ..services.stats_service import stats_service
 
 class AdminService:
     def update_status(self, db: Session, complaint_id: int, status: str, admin: User, background_tasks: BackgroundTasks):
-        if admin.role not in ["admin", "area_admin"]:
-             raise HTTPException(status_code=403, detail="Not authorized")
+        area = admin_area_scope(admin)
         
         complaint = complaint_repository.get_by_id(db, complaint_id)
         if not complaint:
             raise HTTPException(status_code=404, detail="Complaint not found")
         
-        if admin.role == "area_admin" and complaint.area != admin.area:
+        if area is not None and complaint.area != area:
             raise HTTPException(status_code=403, detail="Not authorized for this area")
 
         complaint.status = status
         db.commit()
         db.refresh(complaint)
+        complaint_events.publish("status_changed", complaint)
+        stats_service.invalidate()
 
         # Enqueue the notification to be sent in the background
         user_email = complaint.reporter_user.email if complaint.reporter_user else None
@@ -36,14 +47,13 @@ class AdminService:
         return complaint
 
     def assign_complaint(self, db: Session, complaint_id: int, worker_id: int, admin: User):
-        if admin.role not in ["admin", "area_admin"]:
-             raise HTTPException(status_code=403, detail="Not authorized")
+        area = admin_area_scope(admin)
         
         complaint = complaint_repository.get_by_id(db, complaint_id)
         if not complaint:
             raise HTTPException(status_code=404, detail="Complaint not found")
         
-        if admin.role == "area_admin" and complaint.area != admin.area:
+        if area is not None and complaint.area != area:
             raise HTTPException(status_code=403, detail="Not authorized for this area")
 
         worker = user_repository.get_by_id(db, worker_id)
@@ -53,6 +63,78 @@ class AdminService:
         complaint.assigned_to = worker_id
         db.commit()
         db.refresh(complaint)
+        complaint_events.publish("assigned", complaint, assigned_to=worker_id)
         return complaint
 
+    def _bulk_filters(self, admin: User, selection: ComplaintSelection) -> Dict[str, Any]:
+        # Area admins are pinned to their own area; one without an area is refused, never city-wide
+        area = admin_area_scope(admin, selection.area)
+        filters = selection.model_dump(include={"ids", "area", "status", "priority", "category"})
+        if filters["ids"] is None and not any(filters.values()):
+            raise HTTPException(status_code=400, detail="Select complaints by ids or at least one filter")
+        filters["area"] = area
+        return filters
+
+    def _bulk_apply(self, db: Session, admin: User, selection: ComplaintSelection, changes: Dict[str, Any]) -> List[Any]:
+        """One locked SELECT and one UPDATE for the whole selection; returns the changed rows (old values)."""
+        limit = settings.ADMIN_BULK_MAX_ROWS
+        rows = complaint_repository.lock_selection(db, changes, limit, **self._bulk_filters(admin, selection))
+        if len(rows) > limit:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=f"Selection matches more than {limit} complaints; narrow it")
+        complaint_repository.bulk_update(db, rows, changes, changed_by=admin.id)
+        return rows
+
+    def bulk_update_status(
+        self, db: Session, update: BulkStatusUpdate, admin: User, background_tasks: BackgroundTasks
+    ):
+        rows = self._bulk_apply(db, admin, update, {"status": update.new_status})
+        complaint_ids_by_reporter = defaultdict(list)
+        for row in rows:
+            complaint_events.publish(
+                "status_changed", SimpleNamespace(**{**row._asdict(), "status": update.new_status})
+            )
+            if row.user_id is not None:
+                complaint_ids_by_reporter[row.user_id].append(row.id)
+        if rows:
+            stats_service.invalidate()
+
+        # One background task for every affected reporter
+        contacts = user_repository.get_contacts(db, list(complaint_ids_by_reporter))
+        reporters = [
+            {"complaint_ids": complaint_ids, "user_email": contacts[user_id][0], "user_phone": contacts[user_id][1]}
+            for user_id, complaint_ids in complaint_ids_by_reporter.items() if user_id in contacts
+        ]
+        if reporters:
+            background_tasks.add_task(notify_status_changes, new_status=update.new_status, reporters=reporters)
+        return {"updated": len(rows), "ids": [row.id for row in rows]}
+
+    def bulk_assign(self, db: Session, assign: BulkAssign, admin: User):
+        self._bulk_filters(admin, assign)
+        if not user_repository.get_by_id(db, assign.worker_id):
+             raise HTTPException(status_code=404, detail="Worker not found")
+        rows = self._bulk_apply(db, admin, assign, {"assigned_to": assign.worker_id})
+        for row in rows:
+            complaint_events.publish(
+                "assigned", SimpleNamespace(**row._asdict()), assigned_to=assign.worker_id
+            )
+        return {"updated": len(rows), "ids": [row.id for row in rows]}
+
+    def reprioritize_open_complaints(self, admin: User, background_tasks: BackgroundTasks):
+        if admin.role != "admin":
+             raise HTTPException(status_code=403, detail="Not authorized")
+
+        # Rescoring touches every open complaint, so it never runs on the request
+        background_tasks.add_task(reprioritization_service.run_in_background)
+        return {"status": "queued"}
+
+    def database_pool_metrics(self, admin: User):
+        if admin.role != "admin":
+             raise HTTPException(status_code=403, detail="Not authorized")
+        return {
+            **pool_stats(),
+            "async": async_pool_stats(),
+            "replicas": [pool_stats(replica) for replica in replica_engines],
+        }
+
 admin_service = AdminService()
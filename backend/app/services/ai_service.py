@@ -1,9 +1,11 @@
 import os
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from ..models.complaint import Complaint
 from ..repositories.complaint_repository import complaint_repository
 from ..core.database import SessionLocal
+from ..core.config import settings
+from ..core.events import complaint_events
 
 # Import AI System
 try:
@@ -24,6 +26,11 @@ class AIService:
                 print(f"[ERROR] Failed to initialize AI Agents: {e}")
         return cls._agent_system
 
+    @classmethod
+    def loaded_agent_system(cls) -> Optional[CivicAIAgentSystem]:
+        """The agent system if it is already built; never starts the (slow) build."""
+        return cls._agent_system
+
     def process_complaint_ai(self, complaint_id: int):
         """
         Background task: opens its OWN DB session (the request session
@@ -31,6 +38,34 @@ class AIService:
         pipeline and writes AI results back to the database.
         """
         db: Session = SessionLocal()
+        try:
+            self._sync_spatial_index(db)
+            self._process(db, complaint_id)
+        finally:
+            db.close()   # Always close our own session
+
+    def process_complaints_ai(self, complaint_ids: List[int]):
+        """
+        Background task for a batch submission: one job and one session
+        for the whole batch, processed in order. Each complaint commits
+        on its own, so one failure never holds back the rest.
+        """
+        db: Session = SessionLocal()
+        try:
+            self._sync_spatial_index(db)
+            for complaint_id in complaint_ids:
+                self._process(db, complaint_id)
+        finally:
+            db.close()
+
+    def _sync_spatial_index(self, db: Session):
+        # Density lookups read the in-memory index; pull other workers' writes once per job
+        try:
+            complaint_repository.sync_spatial_state_if_due(db)
+        except Exception as e:
+            print(f"[BG] Spatial index sync failed: {e}")
+
+    def _process(self, db: Session, complaint_id: int):
         try:
             complaint = complaint_repository.get_by_id(db, complaint_id)
             if not complaint:
@@ -56,10 +91,14 @@ class AIService:
             try:
                 if gps_raw and ',' in gps_raw:
                     lat_str, lon_str = gps_raw.split(',')
-                    density = complaint_repository.get_nearby_complaints(db, float(lat_str), float(lon_str))
+                    density = complaint_repository.get_nearby_complaints(
+                        db, float(lat_str), float(lon_str), since_days=settings.DENSITY_WINDOW_DAYS
+                    )
                 
                 if complaint.category and complaint.area:
-                    frequency = complaint_repository.get_historical_frequency(db, complaint.category, complaint.area)
+                    frequency = complaint_repository.get_historical_frequency(
+                        db, complaint.category, complaint.area, since_days=settings.FREQUENCY_WINDOW_DAYS
+                    )
             except Exception as e:
                 print(f"[BG] Quick metric calculation failed: {e}")
 
@@ -93,6 +132,7 @@ class AIService:
             complaint.description = updated_desc
             complaint.category    = analysis.issue_type
             complaint.priority    = analysis.priority
+            complaint.base_priority = analysis.priority
             complaint.priority_score = int(analysis.priority_score)
             complaint.suggested_sla = analysis.sla
             complaint.ai_insight  = analysis.location_insight
@@ -102,6 +142,7 @@ class AIService:
                 complaint.area = analysis.detected_zone
 
             db.commit()
+            complaint_events.publish("ai_completed", complaint)
             print(
                 f"[BG] ✅ AI Complete for #{complaint_id} → "
                 f"{analysis.issue_type} | {analysis.priority} | {analysis.department}"
@@ -112,7 +153,5 @@ class AIService:
             import traceback
             traceback.print_exc()
             db.rollback()
-        finally:
-            db.close()   # Always close our own session
 
 ai_service = AIService()
@@ -1,8 +1,9 @@
 import os
 import google.generativeai as genai
-from sqlalchemy.orm import Session
-from ..models.complaint import Complaint
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..repositories.complaint_repository import async_complaint_repository
 from ..models.user import User
+from ..core.security import complaint_scope
 from typing import List, Optional
 
 class ChatbotService:
@@ -23,18 +24,12 @@ class ChatbotService:
         else:
             print("[WARNING] Chatbot Service: No GEMINI_API_KEY found")
 
-    def get_user_context(self, db: Session, user_id: int, role: str, area: Optional[str] = None) -> str:
+    async def get_user_context(self, db: AsyncSession, user: User) -> str:
         """Fetch relevant complaint data for context."""
+        scope = complaint_scope(user)  # Outside the try: a 403 must not turn into an empty context
         try:
-            from sqlalchemy.orm import joinedload
-            query = db.query(Complaint).options(joinedload(Complaint.reporter_user))
-            
-            if role == "admin":
-                complaints = query.order_by(Complaint.created_at.desc()).limit(20).all()
-            elif role == "area_admin":
-                complaints = query.filter(Complaint.area == area).order_by(Complaint.created_at.desc()).limit(15).all()
-            else:
-                complaints = query.filter(Complaint.user_id == user_id).order_by(Complaint.created_at.desc()).limit(10).all()
+            limit = 20 if user.role == "admin" else 15 if user.role == "area_admin" else 10
+            complaints, _ = await async_complaint_repository.list_page(db, limit, **scope)
 
             if not complaints:
                 return "The system has no complaints recorded yet."
@@ -51,11 +46,11 @@ class ChatbotService:
             traceback.print_exc()
             return "Error retrieving complaint history context."
 
-    async def get_response(self, db: Session, user: User, message: str) -> str:
+    async def get_response(self, db: AsyncSession, user: User, message: str) -> str:
         if not self.model:
             return "Chatbot is currently unavailable due to missing API key."
 
-        context = self.get_user_context(db, user.id, user.role, user.area)
+        context = await self.get_user_context(db, user)
         
         system_prompt = f"""
         You are 'CivicAssist', an AI chatbot for the Civic Issue Management System of Chennai.
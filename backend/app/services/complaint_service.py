@@ -1,13 +1,45 @@
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import BackgroundTasks, UploadFile, File, Form, HTTPException
 import shutil
 import os
 from ..models.complaint import Complaint
 from ..models.user import User
-from ..repositories.complaint_repository import complaint_repository
+from ..repositories.complaint_repository import complaint_repository, async_complaint_repository, summary_items
+from ..core.geo import location_columns
+from ..core.events import complaint_events
+from ..core.config import settings
+from ..core.pagination import InvalidCursor, decode_cursor, encode_cursor
+from ..core.security import complaint_scope
+from ..schemas.complaint import ComplaintBatchItem
 from .ai_service import ai_service
+from datetime import datetime, timedelta
 from typing import List, Optional
 
+try:
+    from ai_agents.keyword_matcher import KeywordMatcher
+except ImportError:
+    from ...ai_agents.keyword_matcher import KeywordMatcher
+
+# Keyword table for the rule-based category used until the AI pipeline finishes
+FALLBACK_KEYWORDS = {
+    "Stray Dogs": ["stray dog", "street dog", "dog bite", "dog attack", "dog menace",
+                   "dog thollai", "dog tholaya", "naai thollai", "naai tholaya",
+                   "naai iruku", "dogs", "stray", "dog"],
+    "Road Maintenance": ["pothole", "road", "maintenance", "crack", "asphalt", "bump"],
+    "Waste Management": ["garbage", "trash", "waste", "bin", "dump", "dirty", "rubbish"],
+    "Electricity": ["street light", "lamp", "electric", "power", "outage", "wire", "pole"],
+    "Water Supply": ["water", "leak", "pipe", "supply", "no water", "pressure"],
+    "Sanitation": ["drainage", "sewage", "clogged", "smell", "overflow", "gutter"],
+    "Mosquito Menace": ["mosquito", "dengue", "malaria", "insects", "breeding", "kosu"],
+    "Public Safety": ["unsafe", "crime", "vandalism", "noise", "accident"],
+    "Traffic": ["traffic", "jam", "parking", "signal"],
+    "Dead Animals": ["dead animal", "dead dog", "dead cat", "carcass", "dead cow", "animal carcass"],
+}
+
+fallback_matcher = KeywordMatcher(FALLBACK_KEYWORDS)
+
 UPLOAD_DIR = "uploads"
 if not os.path.exists(UPLOAD_DIR):
     os.makedirs(UPLOAD_DIR)
@@ -15,57 +47,20 @@ if not os.path.exists(UPLOAD_DIR):
 class ComplaintService:
     def determine_fallback_category(self, description: str):
         if not description: return "General"
-        desc_lower = description.lower()
-        
-        keywords = {
-            "Stray Dogs": ["stray dog", "street dog", "dog bite", "dog attack", "dog menace",
-                           "dog thollai", "dog tholaya", "naai thollai", "naai tholaya",
-                           "naai iruku", "naai iruku", "dogs", "stray", "dog"],
-            "Road Maintenance": ["pothole", "road", "maintenance", "crack", "asphalt", "bump"],
-            "Waste Management": ["garbage", "trash", "waste", "bin", "dump", "dirty", "rubbish"],
-            "Electricity": ["street light", "lamp", "electric", "power", "outage", "wire", "pole"],
-            "Water Supply": ["water", "leak", "pipe", "supply", "no water", "pressure"],
-            "Sanitation": ["drainage", "sewage", "clogged", "smell", "overflow", "gutter"],
-            "Mosquito Menace": ["mosquito", "dengue", "malaria", "insects", "breeding", "kosu"],
-            "Public Safety": ["unsafe", "crime", "vandalism", "noise", "accident"],
-            "Traffic": ["traffic", "jam", "parking", "signal"],
-            "Dead Animals": ["dead animal", "dead dog", "dead cat", "carcass", "dead cow", "animal carcass"],
-        }
-        
-        for category, terms in keywords.items():
-            if any(term in desc_lower for term in terms):
-                return category
-                
-        return "General"
+        return fallback_matcher.classify(description, default="General")
 
-    def create_complaint(
-        self,
-        db: Session,
-        background_tasks: BackgroundTasks,
-        user_id: int,
-        description: str,
-        location: str,
-        area: str,
-        image: Optional[UploadFile] = None,
-        audio: Optional[UploadFile] = None,
-        image_path: Optional[str] = None
-    ):
-        image_url = None
-        if image_path:
-            image_url = image_path
-        elif image:
-            file_path = f"{UPLOAD_DIR}/{image.filename}"
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(image.file, buffer)
-            image_url = file_path
-
-        audio_url = None
-        if audio:
-            file_path = f"{UPLOAD_DIR}/{audio.filename}"
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(audio.file, buffer)
-            audio_url = file_path
+    def _save_upload(self, upload: Optional[UploadFile]) -> Optional[str]:
+        if not upload:
+            return None
+        file_path = f"{UPLOAD_DIR}/{upload.filename}"
+        with open(file_path, "wb") as buffer:
+            shutil.copyfileobj(upload.file, buffer)
+        return file_path
 
+    def _new_complaint(
+        self, user_id: int, description: str, location: str, area: str,
+        image_url: Optional[str], audio_url: Optional[str]
+    ) -> Complaint:
         category = self.determine_fallback_category(description)
         
         # --- NEW: Optimized Submission (Heavy logic moved to background) ---
@@ -77,9 +72,10 @@ class ComplaintService:
         # We don't do Overpass or Priority Boosting here anymore (too slow)
         # Just initialize with defaults and let the background task handle it.
 
-        new_complaint = Complaint(
+        return Complaint(
             description=description,
             location=location,
+            **location_columns(location), # lat / lon / geohash for proximity queries
             area=area,
             image_url=image_url,
             audio_url=audio_url,
@@ -91,20 +87,132 @@ class ComplaintService:
             suggested_sla=sla,
             ai_insight=insight
         )
+
+    def create_complaint(
+        self,
+        db: Session,
+        background_tasks: BackgroundTasks,
+        user_id: int,
+        description: str,
+        location: str,
+        area: str,
+        image: Optional[UploadFile] = None,
+        audio: Optional[UploadFile] = None,
+        image_path: Optional[str] = None
+    ):
+        image_url = image_path or self._save_upload(image)
+        audio_url = self._save_upload(audio)
+        new_complaint = self._new_complaint(user_id, description, location, area, image_url, audio_url)
         complaint = complaint_repository.create(db, new_complaint)
+        complaint_events.publish("created", complaint)
 
         # Queue AI Task for full analysis (Transcriptions, OCR, LLM Reasoning)
         background_tasks.add_task(ai_service.process_complaint_ai, complaint.id)
 
         return complaint
 
-    def get_user_complaints(self, db: Session, user: User, skip: int = 0, limit: int = 100):
-        if user.role == "admin":
-             return complaint_repository.get_all(db, skip, limit)
-        elif user.role == "area_admin":
-             return complaint_repository.get_by_area(db, user.area)
-        else:
-             return complaint_repository.get_by_user_id(db, user.id)
+    async def create_complaint_async(
+        self,
+        db: AsyncSession,
+        background_tasks: BackgroundTasks,
+        user_id: int,
+        description: str,
+        location: str,
+        area: str,
+        image: Optional[UploadFile] = None,
+        audio: Optional[UploadFile] = None,
+        image_path: Optional[str] = None
+    ):
+        """create_complaint for async endpoints: file copies run off the event loop, queries are awaited."""
+        image_url = image_path or await asyncio.to_thread(self._save_upload, image)
+        audio_url = await asyncio.to_thread(self._save_upload, audio)
+        new_complaint = self._new_complaint(user_id, description, location, area, image_url, audio_url)
+        complaint = await async_complaint_repository.create(db, new_complaint)
+        complaint_events.publish("created", complaint)
+        background_tasks.add_task(ai_service.process_complaint_ai, complaint.id)
+        return complaint
+
+    async def create_complaints_batch_async(
+        self, db: AsyncSession, background_tasks: BackgroundTasks, user_id: int, items: List[ComplaintBatchItem]
+    ):
+        """
+        Batch submission (call-centre operators, field apps syncing offline
+        queues): valid items are inserted in one transaction, invalid ones
+        are reported per item, and AI analysis is queued as one job.
+        """
+        if len(items) > settings.COMPLAINTS_BATCH_MAX_ITEMS:
+            raise HTTPException(
+                status_code=413, detail=f"At most {settings.COMPLAINTS_BATCH_MAX_ITEMS} complaints per batch"
+            )
+        results, accepted = [], []
+        for index, item in enumerate(items):
+            result = {"index": index, "client_ref": item.client_ref}
+            missing = [field for field in ("location", "area") if not getattr(item, field)]
+            if missing:
+                results.append({**result, "status": "rejected", "error": f"Missing {', '.join(missing)}"})
+                continue
+            complaint = self._new_complaint(
+                user_id, item.description, item.location, item.area, item.image_url, item.audio_url
+            )
+            results.append(result)
+            accepted.append((result, complaint))
+
+        complaints = await async_complaint_repository.bulk_create(db, [c for _, c in accepted])
+        for result, complaint in accepted:
+            result.update(id=complaint.id, status="created")
+            complaint_events.publish("created", complaint)
+        if complaints:
+            background_tasks.add_task(ai_service.process_complaints_ai, [c.id for c in complaints])
+        return {"created": len(complaints), "rejected": len(items) - len(complaints), "results": results}
+
+    def get_user_complaints(
+        self, db: Session, user: User, cursor: Optional[str] = None, limit: Optional[int] = None,
+        status: Optional[str] = None, priority: Optional[str] = None, category: Optional[str] = None
+    ):
+        """One newest-first page for the user's role; returns (items, next_cursor or None)."""
+        after, limit = self._page_args(cursor, limit)
+        items, last = complaint_repository.list_page(
+            db, limit, after, status=status, priority=priority, category=category, **complaint_scope(user)
+        )
+        return items, encode_cursor(*last) if last else None
+
+    def get_user_complaint_summaries(
+        self, db: Session, user: User, cursor: Optional[str] = None, limit: Optional[int] = None,
+        status: Optional[str] = None, priority: Optional[str] = None, category: Optional[str] = None
+    ):
+        """
+        get_user_complaints as ComplaintSummary-shaped dicts built straight
+        from projected rows, ready for FastJSONResponse.
+        """
+        after, limit = self._page_args(cursor, limit)
+        rows, last = complaint_repository.list_summary_page(
+            db, limit, after, status=status, priority=priority, category=category, **complaint_scope(user)
+        )
+        return summary_items(rows), encode_cursor(*last) if last else None
+
+    def _page_args(self, cursor: Optional[str], limit: Optional[int]):
+        try:
+            after = decode_cursor(cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return after, min(max(limit or settings.COMPLAINTS_PAGE_SIZE, 1), settings.COMPLAINTS_MAX_PAGE_SIZE)
+
+    def get_changes(self, db: Session, user: User, since: Optional[str] = None, limit: Optional[int] = None):
+        """
+        Complaints created/modified and ids deleted after the `since`
+        watermark (everything when omitted), plus the watermark to send next.
+        """
+        after, limit = self._page_args(since, limit)
+        settled_at = datetime.utcnow() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+        items, deleted, watermark, has_more = complaint_repository.list_changes(
+            db, limit, after, settled_at, **complaint_scope(user)
+        )
+        return {
+            "items": items,
+            "deleted": deleted,
+            "watermark": encode_cursor(*watermark),
+            "has_more": has_more,
+        }
 
     def get_complaint_by_id(self, db: Session, complaint_id: int, user_id: int, role: str):
         complaint = complaint_repository.get_by_id(db, complaint_id)
@@ -8,6 +8,7 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import logging
+from typing import List
 
 # Conditionally import twilio - server won't crash if not installed
 try:
@@ -91,6 +92,18 @@ def send_sms(to_phone: str, body: str):
         logger.error(f"Failed to send SMS to {to_phone}: {str(e)}")
         return False
 
+def format_phone(user_phone: str) -> str:
+    # Clean the phone number (remove spaces, hyphens, parentheses)
+    clean_phone = "".join(filter(str.isdigit, user_phone))
+
+    # If it doesn't already have the + prefix, handle it
+    if user_phone.startswith('+'):
+        return user_phone.replace(" ", "").replace("-", "")
+    # Assume India (+91) if no country code provided, but handle 10-digit vs full
+    if len(clean_phone) == 10:
+        return f"+91{clean_phone}"
+    return f"+{clean_phone}"
+
 def notify_status_change(complaint_id: int, new_status: str, user_email: str, user_phone: str = None):
     """
     Constructs the message payload and dispatches both Email and SMS notifications.
@@ -120,22 +133,44 @@ def notify_status_change(complaint_id: int, new_status: str, user_email: str, us
         
     # 2. Dispatch SMS
     if user_phone:
-        # Clean the phone number (remove spaces, hyphens, parentheses)
-        clean_phone = "".join(filter(str.isdigit, user_phone))
-        
-        # If it doesn't already have the + prefix, handle it
-        if user_phone.startswith('+'):
-            formatted_phone = user_phone.replace(" ", "").replace("-", "")
-        else:
-            # Assume India (+91) if no country code provided, but handle 10-digit vs full
-            if len(clean_phone) == 10:
-                formatted_phone = f"+91{clean_phone}"
-            else:
-                formatted_phone = f"+{clean_phone}"
-                
-        send_sms(formatted_phone, sms_body)
+        send_sms(format_phone(user_phone), sms_body)
     else:
         logger.warning(f"No phone number on file for Complaint #{complaint_id}. Skipping real SMS and printing mock.")
         print(f"\n--- [MOCK NOTIFICATION: SMS] ---\nTo: (No Phone Provided in Profile)\nBody: {sms_body}\n--------------------------------\n")
     
     return True
+
+def notify_status_changes(new_status: str, reporters: List[dict]):
+    """
+    Background task for a bulk status change: one message per reporter
+    covering all of their affected complaints. Each reporter is
+    {"complaint_ids": [...], "user_email": ..., "user_phone": ...}.
+    """
+    for reporter in reporters:
+        complaint_ids = reporter["complaint_ids"]
+        if len(complaint_ids) == 1:
+            notify_status_change(complaint_ids[0], new_status, reporter["user_email"], reporter["user_phone"])
+            continue
+
+        label = ", ".join(f"#{complaint_id}" for complaint_id in complaint_ids)
+        subject = f"CivicApp Update: {len(complaint_ids)} of your complaints are now {new_status}"
+        email_body = f"""
+    <html>
+        <body>
+            <h3>CivicApp Notification</h3>
+            <p>Your civic issue complaints (<strong>{label}</strong>) have a new status update.</p>
+            <p>Current Status: <strong style="color: #2e7d32;">{new_status}</strong></p>
+            <br/>
+            <p>You can track the full progress of your complaints on your <a href="http://localhost:5173/track">Dashboard Timeline</a>.</p>
+            <p><em>- The Civic Issue Management Team</em></p>
+        </body>
+    </html>
+    """
+        sms_body = f"CivicApp Update: Your complaints {label} are now '{new_status}'. Check your dashboard for details."
+
+        user_email, user_phone = reporter["user_email"], reporter["user_phone"]
+        if user_email and "@" in user_email:
+            send_email(user_email, subject, email_body)
+        if user_phone:
+            send_sms(format_phone(user_phone), sms_body)
+    return True
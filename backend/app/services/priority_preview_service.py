@@ -0,0 +1,228 @@
+import asyncio
+import time
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.heatmap import priority_heatmap
+from ..core.singleflight import SingleFlight
+from ..core.spatial_index import complaint_index
+from ..repositories.complaint_repository import complaint_repository
+
+try:
+    from ai_agents.geo_agent import FeatureExtractionAgent, SmartPriorityBooster
+except ImportError:
+    from ...ai_agents.geo_agent import FeatureExtractionAgent, SmartPriorityBooster
+
+# Pins are snapped to 4 decimals (~11 m) so a dragged pin shares lookups
+SNAP_DECIMALS = 4
+DENSITY_RADIUS_KM = 2.0
+# How often grid-backed previews pick up complaints written by other workers
+DENSITY_SYNC_S = 5.0
+MAX_HEATMAP_CELLS = 128
+
+SLA_MAP = {
+    "CRITICAL": "Immediate Action (4 Hrs)",
+    "HIGH": "High Priority (24 Hrs)",
+    "MEDIUM": "Standard (48 Hrs)",
+    "LOW": "Low Priority (72 Hrs)"
+}
+
+class PriorityPreviewService:
+    """
+    Live priority preview for a map pin. The POI lookup (Overpass / snapshot)
+    and the complaint density count run concurrently off the event loop,
+    concurrent previews of the same snapped pin share one computation, and
+    each request waits at most PRIORITY_PREVIEW_BUDGET_MS before answering
+    with whatever inputs are ready (flagged as partial).
+
+    When the precomputed heatmap grid covers the pin, none of that is
+    needed: the preview is a cell lookup plus boost_priority.
+    """
+
+    def __init__(self, budget_ms: Optional[int] = None):
+        self.budget_ms = budget_ms if budget_ms is not None else settings.PRIORITY_PREVIEW_BUDGET_MS
+        self.booster = SmartPriorityBooster()
+        self._flights = SingleFlight()
+        self._partials: Dict[Tuple[float, float], Dict[str, Any]] = {}
+        self._synced_at = 0.0
+
+    @staticmethod
+    def snap(lat: float, lon: float) -> Tuple[float, float]:
+        return round(lat, SNAP_DECIMALS), round(lon, SNAP_DECIMALS)
+
+    def _sync_density_soon(self):
+        now = time.monotonic()
+        if not complaint_index.ready or now - self._synced_at < DENSITY_SYNC_S:
+            return
+        self._synced_at = now
+        asyncio.get_running_loop().run_in_executor(None, self._sync_spatial_state)
+
+    def _sync_spatial_state(self):
+        db = SessionLocal()
+        try:
+            complaint_repository.sync_spatial_state(db)
+        except Exception as e:
+            print(f"[Priority Preview Error] density sync failed: {e}")
+        finally:
+            db.close()
+
+    def _density(self, lat: float, lon: float) -> int:
+        # Runs on a worker thread, so it uses its own session
+        db = SessionLocal()
+        try:
+            return complaint_repository.get_nearby_complaints(db, lat, lon, radius_km=DENSITY_RADIUS_KM)
+        finally:
+            db.close()
+
+    async def _agent_system(self):
+        # Imported here: ai_service loads the whole agent stack (embedding models) on import.
+        # First use builds the agent system (models, indexes); keep that off the loop
+        from .ai_service import ai_service
+        return ai_service.loaded_agent_system() or await asyncio.to_thread(ai_service.get_agent_system)
+
+    async def _gather_inputs(self, key: Tuple[float, float]) -> Dict[str, Any]:
+        parts = self._partials.setdefault(key, {})
+        lat, lon = key
+
+        async def location():
+            agent_system = await self._agent_system()
+            if agent_system:
+                parts["location"] = await agent_system.feature_agent.detect_location_type_from_gps_async(f"{lat},{lon}")
+
+        async def density():
+            parts["density"] = await asyncio.to_thread(self._density, lat, lon)
+
+        try:
+            results = await asyncio.gather(location(), density(), return_exceptions=True)
+            for r in results:
+                if isinstance(r, Exception):
+                    print(f"[Priority Preview Error] {r}")
+            return parts
+        finally:
+            self._partials.pop(key, None)
+
+    async def preview(self, lat: float, lon: float, issue_type: Optional[str] = None) -> Dict[str, Any]:
+        started = time.perf_counter()
+        grid = priority_heatmap.grid
+        nearest = grid.nearest(lat, lon) if grid else None
+        if nearest is not None:
+            self._sync_density_soon()
+            result = self._score(FeatureExtractionAgent._location_type(nearest), grid.density_at(lat, lon), issue_type)
+            result["partial"] = False
+            result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return result
+
+        key = self.snap(lat, lon)
+        partial = False
+        try:
+            parts = await self._flights.do(key, lambda: self._gather_inputs(key), timeout=self.budget_ms / 1000)
+        except asyncio.TimeoutError:
+            partial = True
+            parts = dict(self._partials.get(key, {}))
+
+        result = self._score(parts.get("location"), parts.get("density", 0), issue_type)
+        result["partial"] = partial or "location" not in parts or "density" not in parts
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    def _score(self, location: Optional[tuple], density: int, issue_type: Optional[str]) -> Dict[str, Any]:
+        result = {
+            "priority_score": 50,
+            "priority_level": "MEDIUM",
+            "suggested_sla": "Standard (48 Hrs)",
+            "nearby_hospital": None,
+            "hospital_dist_km": None,
+            "nearby_road": None,
+            "major_road_dist_km": None,
+            "complaint_density": 0,
+            "location_type": "Residential",
+            "reasoning": []
+        }
+
+        try:
+            location_type, place_name, metrics = location or FeatureExtractionAgent._location_type(None)
+
+            # Compute priority score using Issue × Location scenario matrix
+            priority_level, reason_str, priority_score = self.booster.boost_priority(
+                base_priority="MEDIUM",
+                location_type=location_type,
+                urgency_found=False,
+                text="",
+                hospital_dist=metrics["hospital_dist"],
+                major_road_dist=metrics["major_road_dist"],
+                density=density,
+                frequency=0,
+                issue_type=issue_type or "General"
+            )
+
+            result.update({
+                "priority_score": round(priority_score, 1),
+                "priority_level": priority_level,
+                "suggested_sla": SLA_MAP.get(priority_level, "Standard (48 Hrs)"),
+                "nearby_hospital": metrics.get("nearby_hospital"),
+                "hospital_dist_km": round(metrics["hospital_dist"], 2) if metrics["hospital_dist"] < 10 else None,
+                "nearby_road": metrics.get("nearby_road"),
+                "major_road_dist_km": round(metrics["major_road_dist"], 2) if metrics["major_road_dist"] < 10 else None,
+                "complaint_density": density,
+                "location_type": location_type,
+                "nearby_place": place_name,
+                "reasoning": [r.strip() for r in reason_str.split(",") if r.strip() and r.strip() != "Standard Assessment"]
+            })
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            print(f"[Priority Preview Error] {e}")
+
+        return result
+
+    def heatmap(self, south: float, west: float, north: float, east: float,
+                issue_type: Optional[str] = None, max_cells: int = 64) -> Optional[Dict[str, Any]]:
+        """
+        Priority scores for the grid cells inside a bounding box (rows go
+        south -> north), sampled down to at most max_cells per side.
+        None until the heatmap grid is loaded.
+        """
+        grid = priority_heatmap.grid
+        if grid is None:
+            return None
+        window = grid.window(south, west, north, east, min(max_cells, MAX_HEATMAP_CELLS))
+        if window is None:
+            return {"bbox": [south, west, north, east], "rows": 0, "cols": 0, "scores": []}
+
+        dists, density = window["dists"], window["density"]
+        # Most cells share their scoring inputs with others; score each distinct combination once
+        inputs = np.column_stack([dists[0].ravel(), dists[1].ravel(), dists[2].ravel(), density.ravel()])
+        unique, inverse = np.unique(inputs, axis=0, return_inverse=True)
+        scores = np.array([self._cell_score(*row, issue_type) for row in unique.tolist()])
+        scores = scores[inverse.ravel()].reshape(density.shape)
+
+        lats, lons = window["lats"], window["lons"]
+        return {
+            "bbox": [
+                float(lats[0] - window["cell_lat"] / 2), float(lons[0] - window["cell_lon"] / 2),
+                float(lats[-1] + window["cell_lat"] / 2), float(lons[-1] + window["cell_lon"] / 2),
+            ],
+            "rows": int(density.shape[0]),
+            "cols": int(density.shape[1]),
+            "cell_lat": float(window["cell_lat"]),
+            "cell_lon": float(window["cell_lon"]),
+            "scores": np.round(scores, 1).tolist(),
+        }
+
+    def _cell_score(self, hospital_dist: float, school_dist: float, road_dist: float, density: float,
+                    issue_type: Optional[str]) -> float:
+        location_type, _, _ = FeatureExtractionAgent._location_type({
+            "Hospital": (hospital_dist, None), "School": (school_dist, None), "Major Road": (road_dist, None)
+        })
+        return self.booster.boost_priority(
+            base_priority="MEDIUM",
+            location_type=location_type,
+            urgency_found=False,
+            hospital_dist=hospital_dist,
+            major_road_dist=road_dist,
+            density=int(density),
+            issue_type=issue_type or "General"
+        )[2]
+
+priority_preview_service = PriorityPreviewService()
@@ -0,0 +1,150 @@
+import numpy as np
+from typing import Any, Dict, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.heatmap import priority_heatmap
+from ..core.spatial_index import ComplaintSpatialIndex, complaint_index
+from ..models.complaint import Complaint
+from ..repositories.complaint_repository import complaint_repository
+from ..repositories.density_repository import density_repository, CLOSED_STATUSES
+from ..repositories.frequency_repository import frequency_repository
+
+try:
+    from ai_agents.geo_agent import FeatureExtractionAgent
+    from ai_agents.priority_engine import priority_engine
+    from ai_agents.poi_features import NO_FEATURE_DIST
+    from ai_agents.priority_grid import GRID_TYPES
+except ImportError:
+    from ...ai_agents.geo_agent import FeatureExtractionAgent
+    from ...ai_agents.priority_engine import priority_engine
+    from ...ai_agents.poi_features import NO_FEATURE_DIST
+    from ...ai_agents.priority_grid import GRID_TYPES
+
+BATCH_SIZE = 1000
+# Same radius get_nearby_complaints counts in for the AI pipeline
+DENSITY_RADIUS_KM = 2.0
+
+class ReprioritizationService:
+    """
+    Rescores every open complaint with the current priority rules in one
+    pass: inputs are loaded as columns (location features from the heatmap
+    grid, density per counter cell, frequency from the rollup table, urgency
+    from one keyword scan), scored by PriorityEngine.score_batch and
+    written back with batched bulk UPDATEs.
+    """
+
+    def _location_dists(self, lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (len(GRID_TYPES), N) nearest hospital / school / major road distances
+        from the heatmap grid, and which pins it covers. Uncovered pins get
+        NO_FEATURE_DIST: a batch job never makes per-pin POI lookups.
+        """
+        grid = priority_heatmap.grid
+        if grid is None:
+            return np.full((len(GRID_TYPES), len(lats)), NO_FEATURE_DIST), np.zeros(len(lats), dtype=bool)
+        return grid.sample(lats, lons)
+
+    def _densities(self, db: Session, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """
+        The AI pipeline's density (get_nearby_complaints), once per density
+        counter cell, from one counter query (rolling window) or one pass
+        over the spatial index (all time).
+        """
+        cells: Dict[tuple, tuple] = {}
+        for lat, lon in zip(lats, lons):
+            cells.setdefault(density_repository.cell(lat, lon), (float(lat), float(lon)))
+        points = list(cells.values())
+        if settings.DENSITY_WINDOW_DAYS:
+            counts = density_repository.count_within_many(
+                db, points, DENSITY_RADIUS_KM, since_days=settings.DENSITY_WINDOW_DAYS
+            )
+        else:
+            if complaint_index.ready:
+                complaint_repository.sync_spatial_state(db)
+                index = complaint_index
+            else:
+                index = ComplaintSpatialIndex()
+                index.build(db.query(Complaint.id, Complaint.lat, Complaint.lon).filter(Complaint.lat.isnot(None)))
+            counts = [index.count_within(lat, lon, DENSITY_RADIUS_KM) for lat, lon in points]
+        by_cell = dict(zip(cells, counts))
+        return np.array([by_cell[density_repository.cell(lat, lon)] for lat, lon in zip(lats, lons)], dtype=np.float64)
+
+    def _frequencies(self, db: Session, categories, areas) -> np.ndarray:
+        counts = frequency_repository.counts(db, since_days=settings.FREQUENCY_WINDOW_DAYS)
+        return np.array([
+            counts.get((c, a), 0) if c and a else 0 for c, a in zip(categories, areas)
+        ], dtype=np.float64)
+
+    def rescore(self, db: Session) -> Dict[str, Any]:
+        """
+        Rescore all open complaints; returns {"rescored", "changed", "skipped"}.
+        Pinned complaints the heatmap grid does not cover keep their priority.
+        """
+        priority_engine.reload()  # pick up edits to the rules file
+        rows = (
+            db.query(
+                Complaint.id, Complaint.lat, Complaint.lon, Complaint.category, Complaint.area,
+                Complaint.description, Complaint.priority, Complaint.base_priority,
+            )
+            .filter(func.upper(func.coalesce(Complaint.status, "")).notin_(CLOSED_STATUSES))
+            .order_by(Complaint.id)
+            .all()
+        )
+        if not rows:
+            return {"rescored": 0, "changed": 0, "skipped": 0}
+
+        ids, lats, lons, categories, areas, descriptions, priorities, bases = zip(*rows)
+        bases = [b or p or "MEDIUM" for b, p in zip(bases, priorities)]
+        has_pin = np.array([lat is not None and lon is not None for lat, lon in zip(lats, lons)])
+        lat_arr = np.array([lat if ok else 0.0 for lat, ok in zip(lats, has_pin)], dtype=np.float64)
+        lon_arr = np.array([lon if ok else 0.0 for lon, ok in zip(lons, has_pin)], dtype=np.float64)
+
+        dists = np.full((len(GRID_TYPES), len(rows)), NO_FEATURE_DIST)
+        density = np.zeros(len(rows))
+        # Complaints without a pin are scored on text alone; pinned ones only where the grid has their location
+        keep = ~has_pin
+        if has_pin.any():
+            dists[:, has_pin], keep[has_pin] = self._location_dists(lat_arr[has_pin], lon_arr[has_pin])
+            density[has_pin] = self._densities(db, lat_arr[has_pin], lon_arr[has_pin])
+        skipped = int((~keep).sum())
+        if skipped:
+            print(f"[WARN] Re-prioritization skipped {skipped} complaints outside the priority heatmap grid")
+        hospital, school, road = (dists[GRID_TYPES.index(t)] for t in ("Hospital", "School", "Major Road"))
+
+        matcher = priority_engine.urgency_matcher()
+        urgency = [bool(hits) for hits in matcher.match_many([d or "" for d in descriptions])]
+
+        levels, scores, _ = priority_engine.score_batch(
+            bases,
+            FeatureExtractionAgent.location_types(hospital, school),
+            hospital, road, density,
+            frequencies=self._frequencies(db, categories, areas),
+            urgency=urgency,
+            issue_types=categories,
+        )
+
+        mappings, changed = [], 0
+        for cid, level, score, base, old, ok in zip(ids, levels, scores, bases, priorities, keep):
+            if ok:
+                mappings.append({"id": cid, "priority": str(level), "priority_score": int(score), "base_priority": base})
+                changed += str(level) != old
+        for start in range(0, len(mappings), BATCH_SIZE):
+            db.bulk_update_mappings(Complaint, mappings[start:start + BATCH_SIZE])
+        db.commit()
+        print(f"[OK] Re-prioritized {len(mappings)} open complaints ({changed} changed level)")
+        return {"rescored": len(mappings), "changed": changed, "skipped": skipped}
+
+    def run_in_background(self):
+        """BackgroundTasks entry point: owns its session like the AI pipeline."""
+        db = SessionLocal()
+        try:
+            self.rescore(db)
+        except Exception as e:
+            print(f"[ERROR] Re-prioritization failed: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+reprioritization_service = ReprioritizationService()
@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.security import admin_area_scope
+from ..models.user import User
+from ..repositories.density_repository import CLOSED_STATUSES
+from ..repositories.stats_repository import RESOLVE_BUCKET_HOURS, bucket_percentile, stats_repository
+
+PERCENTILES = (50, 90, 95)
+# After invalidate() the scheduler waits this long so a burst of status changes shares one refresh
+DIRTY_SETTLE_S = 1.0
+
+def _counts() -> Dict[str, Any]:
+    return {"total": 0, "open": 0, "by_status": defaultdict(int), "by_priority": defaultdict(int)}
+
+def _resolutions() -> Dict[str, Any]:
+    return {"resolved": 0, "within_sla": 0, "buckets": [0] * (len(RESOLVE_BUCKET_HOURS) + 1)}
+
+def _finish_counts(counts: Dict[str, Any]) -> Dict[str, Any]:
+    return {**counts, "by_status": dict(counts["by_status"]), "by_priority": dict(counts["by_priority"])}
+
+def _finish_resolutions(res: Dict[str, Any]) -> Dict[str, Any]:
+    resolved = res["resolved"]
+    return {
+        "resolved": resolved,
+        "within_sla": res["within_sla"],
+        "sla_compliance": round(res["within_sla"] / resolved, 4) if resolved else None,
+        **{f"p{p}_hours": bucket_percentile(res["buckets"], p / 100) for p in PERCENTILES},
+    }
+
+class StatsService:
+    """
+    Admin dashboard numbers, assembled from the stats_repository rollups
+    (kept current by start_scheduler) and cached per role / area / window
+    for STATS_CACHE_SECONDS. Status changes call invalidate(), so on the
+    scheduler's worker the numbers catch up within a second or two; other
+    workers can lag by up to STATS_REFRESH_SECONDS + STATS_CACHE_SECONDS.
+    """
+
+    def __init__(self):
+        self._cache: Dict[tuple, Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._stop: Optional[threading.Event] = None
+        self._dirty = threading.Event()
+
+    def dashboard(self, db: Session, user: User, area: Optional[str] = None, days: Optional[int] = None) -> Dict[str, Any]:
+        area = admin_area_scope(user, area)
+        days = days or settings.STATS_WINDOW_DAYS
+        key = (user.role, area, days)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        stats = self.compute(db, area, days)
+        with self._lock:
+            self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+            self._cache[key] = (now + settings.STATS_CACHE_SECONDS, stats)
+        return stats
+
+    def invalidate(self):
+        """Drop the cached dashboards and have the scheduler refresh the rollups now, not at its next tick."""
+        self._clear_cache()
+        self._dirty.set()
+
+    def _clear_cache(self):
+        with self._lock:
+            self._cache = {}
+
+    def compute(self, db: Session, area: Optional[str], days: int) -> Dict[str, Any]:
+        """
+        Per-area and per-category counts, SLA compliance and time-to-resolve
+        percentiles for resolutions in the last days days.
+        """
+        totals, by_area, by_category = _counts(), defaultdict(_counts), defaultdict(_counts)
+        for row_area, category, status, priority, count in stats_repository.status_counts(db, area):
+            is_open = status.upper() not in CLOSED_STATUSES
+            for counts in (totals, by_area[row_area], by_category[category]):
+                counts["total"] += count
+                counts["open"] += count * is_open
+                counts["by_status"][status or None] += count
+                counts["by_priority"][priority or None] += count
+
+        since = datetime.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(days=days)
+        resolved, resolved_by_area, resolved_by_category = _resolutions(), defaultdict(_resolutions), defaultdict(_resolutions)
+        for row_area, category, bucket, count, within_sla in stats_repository.resolution_buckets(db, since, area):
+            for res in (resolved, resolved_by_area[row_area], resolved_by_category[category]):
+                res["resolved"] += int(count or 0)
+                res["within_sla"] += int(within_sla or 0)
+                res["buckets"][bucket] += int(count or 0)
+
+        def rows(name, counts, resolutions):
+            keys = sorted(set(counts) | set(resolutions), key=lambda k: (-counts[k]["total"] if k in counts else 0, k))
+            return [
+                {name: key or None, **_finish_counts(counts.get(key) or _counts()),
+                 "resolution": _finish_resolutions(resolutions.get(key) or _resolutions())}
+                for key in keys
+            ]
+
+        refreshed_at = stats_repository.refreshed_at(db)
+        return {
+            "area": area,
+            "window_days": days,
+            "generated_at": datetime.utcnow().isoformat(),
+            "rollup_refreshed_at": refreshed_at.isoformat() if refreshed_at else None,
+            **_finish_counts(totals),
+            "resolution": _finish_resolutions(resolved),
+            "by_area": rows("area", by_area, resolved_by_area),
+            "by_category": rows("category", by_category, resolved_by_category),
+        }
+
+    # ---- rollup scheduler ----
+
+    def refresh(self, session_factory=SessionLocal) -> Tuple[int, int]:
+        db = session_factory()
+        try:
+            return stats_repository.refresh(db)
+        finally:
+            db.close()
+
+    def start_scheduler(self, session_factory=SessionLocal, interval: Optional[float] = None) -> bool:
+        """
+        Refresh the rollups every interval seconds, or shortly after
+        invalidate(), on a daemon thread; False if already running.
+        """
+        if self._stop is not None:
+            return False
+        stop = self._stop = threading.Event()
+        interval = interval or settings.STATS_REFRESH_SECONDS
+
+        def run():
+            while True:
+                if self._dirty.wait(interval):
+                    stop.wait(DIRTY_SETTLE_S)
+                if stop.is_set():
+                    return
+                self._dirty.clear()
+                try:
+                    self.refresh(session_factory)
+                except Exception as e:
+                    print(f"[ERROR] Dashboard rollup refresh failed: {e}")
+                # Responses cached from the old rollups would hide the refresh
+                self._clear_cache()
+
+        threading.Thread(target=run, name="stats-rollups", daemon=True).start()
+        return True
+
+    def stop_scheduler(self):
+        if self._stop is not None:
+            self._stop.set()
+            self._dirty.set()  # Wake the thread so it sees stop
+            self._stop = None
+
+stats_service = StatsService()
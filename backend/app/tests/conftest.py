@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+# Make the backend root importable and keep tests off the configured database
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+
+@pytest.fixture(autouse=True)
+def spatial_index(monkeypatch):
+    """A fresh complaint_index per test, swapped into every module holding the global."""
+    from app.core import spatial_index as module
+    shared, index = module.complaint_index, module.ComplaintSpatialIndex()
+    for name, loaded in list(sys.modules.items()):
+        if name.startswith("app.") and getattr(loaded, "complaint_index", None) is shared:
+            monkeypatch.setattr(loaded, "complaint_index", index)
+    return index
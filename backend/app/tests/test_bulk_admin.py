@@ -0,0 +1,156 @@
+"""
+Bulk admin changes must touch only the caller's scope with one UPDATE,
+keep density counters equal to a rebuild, record history, and batch the
+reporter notifications.
+"""
+
+import random
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app import migrations
+from app.core.config import settings
+from app.core.db_routing import bind_user
+from app.core.geo import location_columns
+from app.models.user import User
+from app.models.complaint import Complaint
+from app.models.complaint_density import ComplaintDensityCell
+from app.models.complaint_history import ComplaintHistory
+from app.migrations import add_density_counters
+from app.repositories.complaint_repository import complaint_repository
+from app.repositories.history_repository import history_repository
+from app.schemas.complaint import BulkAssign, BulkStatusUpdate
+from app.services.admin_service import admin_service
+
+
+def density(db):
+    return sorted(
+        (c.cell_y, c.cell_x, c.category, c.day, c.total_count, c.open_count)
+        for c in db.query(ComplaintDensityCell).all()
+        if c.total_count or c.open_count
+    )
+
+
+def seed(db, rng):
+    users = [
+        User(username="admin", email="admin@x", role="admin"),
+        User(username="adyar", email="adyar@x", role="area_admin", area="Adyar"),
+        User(username="worker", email="worker@x", role="worker"),
+        User(username="asha", email="asha@x", phone="9876543210"),
+        User(username="ravi", email="ravi@x"),
+    ]
+    db.add_all(users)
+    db.commit()
+    for i in range(120):
+        location = f"{rng.uniform(13.0, 13.05)},{rng.uniform(80.2, 80.25)} | Chennai"
+        db.add(Complaint(
+            description="x", location=location, **location_columns(location),
+            area=rng.choice(["Adyar", "T Nagar"]), category=rng.choice(["Garbage", "Water Supply"]),
+            status=rng.choice(["SUBMITTED", "IN_PROGRESS", "RESOLVED"]), user_id=rng.choice([users[3].id, users[4].id]),
+        ))
+    db.commit()
+    return {user.username: user for user in users}
+
+
+def test_bulk_status_change_in_area_scope(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk.sqlite'}")
+    migrations.upgrade(engine)
+    updates = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, sql, *args: sql.startswith("UPDATE complaints") and updates.append(sql))
+
+    with Session(engine) as db:
+        users = seed(db, random.Random(8))
+        area_admin = users["adyar"]
+        before = {c.id: (c.area, c.category, c.status, c.updated_at) for c in db.query(Complaint)}
+        selected = [
+            id for id, (area, category, status, _) in before.items()
+            if area == "Adyar" and category == "Garbage" and status != "RESOLVED"
+        ]
+
+        tasks = BackgroundTasks()
+        result = admin_service.bulk_update_status(
+            db, BulkStatusUpdate(category="Garbage", new_status="RESOLVED"), area_admin, tasks
+        )
+        assert len(updates) == 1
+        assert sorted(result["ids"]) == sorted(selected) and result["updated"] == len(selected)
+
+        db.expire_all()
+        for complaint in db.query(Complaint):
+            area, category, status, updated_at = before[complaint.id]
+            if complaint.id in selected:
+                assert complaint.status == "RESOLVED" and complaint.updated_at > updated_at
+            else:
+                assert (complaint.status, complaint.updated_at) == (status, updated_at)
+
+        history = db.query(ComplaintHistory).filter(ComplaintHistory.field == "status").all()
+        assert sorted(h.complaint_id for h in history) == sorted(selected)
+        assert {(h.new_value, h.changed_by) for h in history} == {("RESOLVED", area_admin.id)}
+
+        # One task for the whole batch, one entry per reporter
+        assert len(tasks.tasks) == 1
+        reporters = tasks.tasks[0].kwargs["reporters"]
+        assert sorted(i for r in reporters for i in r["complaint_ids"]) == sorted(selected)
+        assert len(reporters) == len({r["user_email"] for r in reporters})
+
+        # Rerunning changes nothing: matching complaints are already resolved
+        again = admin_service.bulk_update_status(
+            db, BulkStatusUpdate(category="Garbage", new_status="RESOLVED"), area_admin, BackgroundTasks()
+        )
+        assert again["updated"] == 0
+
+        with pytest.raises(HTTPException) as error:
+            admin_service.bulk_update_status(db, BulkStatusUpdate(area="T Nagar", new_status="X"), area_admin, tasks)
+        assert error.value.status_code == 403
+        with pytest.raises(HTTPException) as error:
+            admin_service.bulk_update_status(db, BulkStatusUpdate(new_status="X"), users["admin"], tasks)
+        assert error.value.status_code == 400
+        # An area admin without an area must not turn into a city-wide UPDATE
+        unassigned = User(username="nowhere", email="nowhere@x", role="area_admin", area=None)
+        for selection in (BulkStatusUpdate(category="Garbage", new_status="X"), BulkStatusUpdate(new_status="X")):
+            with pytest.raises(HTTPException) as error:
+                admin_service.bulk_update_status(db, selection, unassigned, tasks)
+            assert error.value.status_code == 403
+        with pytest.raises(HTTPException) as error:
+            admin_service.update_status(db, selected[0], "X", unassigned, tasks)
+        assert error.value.status_code == 403
+        monkeypatch.setattr(settings, "ADMIN_BULK_MAX_ROWS", 2)
+        with pytest.raises(HTTPException) as error:
+            admin_service.bulk_update_status(db, BulkStatusUpdate(area="T Nagar", new_status="X"), users["admin"], tasks)
+        assert error.value.status_code == 400
+        assert db.query(Complaint).filter(Complaint.status == "X").count() == 0
+        live = density(db)
+
+    add_density_counters.upgrade(engine, rebuild=True)
+    with Session(engine) as db:
+        assert density(db) == live
+
+
+def test_bulk_assign_and_single_updates_record_history(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'assign.sqlite'}")
+    migrations.upgrade(engine)
+    with Session(engine) as db:
+        users = seed(db, random.Random(3))
+        admin, worker = users["admin"], users["worker"]
+        ids = [id for id, in db.query(Complaint.id).order_by(Complaint.id).limit(5)]
+
+        result = admin_service.bulk_assign(db, BulkAssign(ids=ids, worker_id=worker.id), admin)
+        assert result["ids"] == ids
+        db.expire_all()
+        assert {c.assigned_to for c in db.query(Complaint).filter(Complaint.id.in_(ids))} == {worker.id}
+        assert [h.new_value for h in history_repository.for_complaint(db, ids[0])] == [str(worker.id)]
+
+        with pytest.raises(HTTPException) as error:
+            admin_service.bulk_assign(db, BulkAssign(ids=ids, worker_id=999), admin)
+        assert error.value.status_code == 404
+
+        # Single-complaint writes are logged by the flush hook, credited to the bound user
+        bind_user(db, admin.id)
+        complaint = complaint_repository.get_by_id(db, ids[0])
+        old_status = complaint.status
+        admin_service.update_status(db, ids[0], "CLOSED", admin, BackgroundTasks())
+        last = history_repository.for_complaint(db, ids[0])[-1]
+        assert (last.field, last.old_value, last.new_value, last.changed_by) == ("status", old_status, "CLOSED", admin.id)
@@ -0,0 +1,77 @@
+"""
+bulk_create must store a batch in one transaction, keep the flush-hook counters equal to a rebuild, and hand
+back complaints that need no reload after the commit.
+"""
+
+import asyncio
+import random
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app import migrations
+from app.core.database import build_async_engine
+from app.models.complaint import Complaint
+from app.models.complaint_density import ComplaintDensityCell
+from app.migrations import add_density_counters, add_frequency_counters
+from app.repositories.complaint_repository import complaint_repository, async_complaint_repository
+from app.repositories.frequency_repository import frequency_repository
+
+
+def batch(rng, n):
+    return [
+        Complaint(
+            description=f"bulk {i}", area=rng.choice(["Adyar", "T Nagar"]), category="Garbage",
+            lat=13.0 + rng.random() / 10, lon=80.2 + rng.random() / 10, status="SUBMITTED",
+        )
+        for i in range(n)
+    ]
+
+
+def test_bulk_create_batches_inserts_and_keeps_counters(tmp_path):
+    url = f"sqlite:///{tmp_path / 'bulk.sqlite'}"
+    engine = create_engine(url)
+    migrations.upgrade(engine)
+    rng = random.Random(4)
+    statements, commits = [], []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+
+    with Session(engine) as db:
+        created = complaint_repository.bulk_create(db, batch(rng, 300))
+        assert len(commits) == 1
+        statements.clear()
+        ids = [c.id for c in created]
+        assert [c.created_at is not None for c in created] == [True] * 300
+        assert statements == []  # no refresh after the commit
+        assert sorted(ids) == ids and len(set(ids)) == 300
+        assert db.query(Complaint).count() == 300
+        live = frequency_repository.counts(db)
+
+    async def async_batch():
+        async_engine = build_async_engine(url)
+        sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+        async with sessions() as db:
+            created = await async_complaint_repository.bulk_create(db, batch(rng, 50))
+        await async_engine.dispose()
+        return created
+
+    assert all(c.id for c in asyncio.run(async_batch()))
+    with Session(engine) as db:
+        assert db.query(Complaint).count() == 350
+        adyar = db.query(Complaint).filter(Complaint.area == "Adyar").count()
+        assert frequency_repository.count(db, "Garbage", "Adyar") == adyar
+        assert sum(live.values()) == 300
+
+    # Counters maintained during the bulk insert equal a full rebuild
+    def density_cells(db):
+        return sorted(tuple(row) for row in db.query(ComplaintDensityCell.__table__))
+
+    with Session(engine) as db:
+        before = frequency_repository.counts(db), density_cells(db)
+        assert before[1]
+    add_frequency_counters.upgrade(engine, rebuild=True)
+    add_density_counters.upgrade(engine, rebuild=True)
+    with Session(engine) as db:
+        assert (frequency_repository.counts(db), density_cells(db)) == before
@@ -0,0 +1,181 @@
+"""
+/admin/stats numbers come from the rollups: counts must equal a GROUP BY
+over complaints, resolutions and SLA compliance must follow the status
+history, incremental refreshes must match a full rebuild, and area
+admins only ever see their own area.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app import migrations
+from app.migrations import add_stats_rollups
+from app.core.config import settings
+from app.models.user import User
+from app.models.complaint import Complaint
+from app.models.complaint_history import ComplaintHistory
+from app.models.complaint_stats import ComplaintResolutionBucket
+from app.repositories.stats_repository import bucket_percentile, resolve_bucket, sla_hours, stats_repository
+from app.services import stats_service as stats_module
+from app.services.stats_service import StatsService, stats_service
+
+
+def test_sla_hours_and_percentiles():
+    assert sla_hours("High Priority (24 Hrs)", "HIGH") == 24
+    assert sla_hours("2 days", None) == 48
+    assert sla_hours("Standard", "CRITICAL") == 4
+    assert sla_hours("Processing...", None) == settings.STATS_DEFAULT_SLA_HOURS
+
+    counts = [0] * 17
+    counts[resolve_bucket(3)] = 50 # (2, 4]
+    counts[resolve_bucket(30)] = 50 # (24, 36]
+    assert bucket_percentile(counts, 0.5) == 4
+    assert 24 < bucket_percentile(counts, 0.9) <= 36
+    assert bucket_percentile([0] * 17, 0.5) is None
+    assert bucket_percentile([0] * 16 + [3], 0.5) == 720
+
+
+def seed(db, rng, now):
+    users = [
+        User(username="admin", email="admin@x", role="admin"),
+        User(username="adyar", email="adyar@x", role="area_admin", area="Adyar"),
+        User(username="asha", email="asha@x"),
+    ]
+    db.add_all(users)
+    db.commit()
+    for _ in range(200):
+        db.add(Complaint(
+            description="x", area=rng.choice(["Adyar", "T Nagar", None]),
+            category=rng.choice(["Garbage", "Water Supply", None]),
+            priority=rng.choice(["LOW", "HIGH"]), suggested_sla=rng.choice(["High Priority (24 Hrs)", "Standard"]),
+            created_at=now - timedelta(hours=rng.uniform(1, 200)), user_id=users[2].id,
+        ))
+    db.commit()
+    return {user.username: user for user in users}
+
+
+def resolve(db, complaints):
+    for complaint in complaints:
+        complaint.status = "RESOLVED"
+    db.commit()
+
+
+def test_dashboard_matches_complaints_and_history(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.sqlite'}")
+    migrations.upgrade(engine)
+    now = datetime.utcnow()
+    monkeypatch.setattr(settings, "STATS_CACHE_SECONDS", 0)
+
+    with Session(engine) as db:
+        users = seed(db, random.Random(5), now)
+        complaints = db.query(Complaint).order_by(Complaint.id).all()
+        resolve(db, complaints[:60])
+        stats_repository.refresh(db)
+        # A later batch lands through the incremental path
+        resolve(db, complaints[60:90])
+        stats_repository.refresh(db)
+        live = sorted(tuple(row) for row in db.query(ComplaintResolutionBucket.__table__))
+
+        stats = stats_service.dashboard(db, users["admin"])
+        assert stats["total"] == 200 and stats["open"] == 110
+        assert stats["by_status"] == {"RESOLVED": 90, "SUBMITTED": 110}
+        expected = dict(db.query(Complaint.area, func.count()).group_by(Complaint.area).all())
+        assert {row["area"]: row["total"] for row in stats["by_area"]} == expected
+
+        resolved = db.query(Complaint).filter(Complaint.status == "RESOLVED").all()
+        changed_at = {
+            h.complaint_id: h.changed_at for h in db.query(ComplaintHistory).filter(ComplaintHistory.field == "status")
+        }
+        hours = [(changed_at[c.id] - c.created_at).total_seconds() / 3600 for c in resolved]
+        within = sum(h <= sla_hours(c.suggested_sla, c.priority) for c, h in zip(resolved, hours))
+        assert stats["resolution"]["resolved"] == 90
+        assert stats["resolution"]["within_sla"] == within
+        assert stats["resolution"]["sla_compliance"] == round(within / 90, 4)
+        assert stats["resolution"]["p50_hours"] <= stats["resolution"]["p90_hours"] <= stats["resolution"]["p95_hours"]
+        garbage = next(row for row in stats["by_category"] if row["category"] == "Garbage")
+        assert garbage["resolution"]["resolved"] == sum(c.category == "Garbage" for c in resolved)
+
+        scoped = stats_service.dashboard(db, users["adyar"])
+        assert scoped["area"] == "Adyar" and [row["area"] for row in scoped["by_area"]] == ["Adyar"]
+        assert scoped["total"] == sum(c.area == "Adyar" for c in complaints)
+        with pytest.raises(HTTPException) as error:
+            stats_service.dashboard(db, users["adyar"], area="T Nagar")
+        assert error.value.status_code == 403
+        with pytest.raises(HTTPException) as error:
+            stats_service.dashboard(db, User(username="nowhere", role="area_admin", area=None))
+        assert error.value.status_code == 403
+        with pytest.raises(HTTPException) as error:
+            stats_service.dashboard(db, users["asha"])
+        assert error.value.status_code == 403
+
+        # Incremental refreshes match a rollup rebuilt from scratch
+        db.query(ComplaintResolutionBucket).delete()
+        stats_repository.refresh(db)
+        assert sorted(tuple(row) for row in db.query(ComplaintResolutionBucket.__table__)) == live
+
+
+def test_dashboard_is_cached_per_scope(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.sqlite'}")
+    migrations.upgrade(engine)
+    monkeypatch.setattr(settings, "STATS_CACHE_SECONDS", 60)
+    monkeypatch.setattr(stats_service, "_cache", {})
+
+    with Session(engine) as db:
+        users = seed(db, random.Random(2), datetime.utcnow())
+        stats_repository.refresh(db)
+        first = stats_service.dashboard(db, users["admin"])
+        resolve(db, db.query(Complaint).limit(10).all())
+        stats_repository.refresh(db)
+        assert stats_service.dashboard(db, users["admin"]) is first
+        assert stats_service.dashboard(db, users["admin"], days=7) is not first
+        assert stats_service.dashboard(db, users["adyar"])["area"] == "Adyar"
+
+
+def test_status_changes_refresh_the_rollups_without_waiting_for_the_tick(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dirty.sqlite'}")
+    migrations.upgrade(engine)
+    monkeypatch.setattr(settings, "STATS_CACHE_SECONDS", 3600)
+    monkeypatch.setattr(stats_module, "DIRTY_SETTLE_S", 0)
+    service = StatsService()
+
+    with Session(engine) as db:
+        users = seed(db, random.Random(3), datetime.utcnow())
+        stats_repository.refresh(db)
+        assert service.dashboard(db, users["admin"])["resolution"]["resolved"] == 0
+        assert service.start_scheduler(lambda: Session(engine), interval=3600)
+        try:
+            resolve(db, db.query(Complaint).limit(10).all())
+            service.invalidate()
+            deadline = time.monotonic() + 10
+            while service.dashboard(db, users["admin"])["resolution"]["resolved"] != 10:
+                assert time.monotonic() < deadline, "invalidate() did not refresh the rollups"
+                time.sleep(0.05)
+        finally:
+            service.stop_scheduler()
+
+
+def test_incremental_refresh_seeks_on_history_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plan.sqlite'}")
+    migrations.upgrade(engine)
+    # Databases that already had complaint_history get the index from 0009
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_complaint_history_field_value_changed_at"))
+    add_stats_rollups.upgrade(engine)
+    add_stats_rollups.upgrade(engine)
+    names = {index["name"] for index in inspect(engine).get_indexes("complaint_history")}
+    assert "ix_complaint_history_field_value_changed_at" in names
+
+    query = select(ComplaintHistory.changed_at).where(
+        ComplaintHistory.field == "status", ComplaintHistory.new_value == "RESOLVED",
+        ComplaintHistory.changed_at >= datetime(2026, 1, 1),
+    )
+    sql = query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        plan = " | ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+    assert "ix_complaint_history_field_value_changed_at" in plan, plan
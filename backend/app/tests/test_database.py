@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+
+from app.core import database
+from app.core.config import settings
+
+
+def test_sqlite_connections_get_wal_and_pragmas(tmp_path):
+    engine = database.build_engine(f"sqlite:///{tmp_path / 'wal.sqlite'}")
+    with engine.connect() as conn:
+        pragma = lambda name: conn.execute(text(f"PRAGMA {name}")).scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert pragma("cache_size") == -settings.SQLITE_CACHE_SIZE_KB
+    engine.dispose()
+
+
+def test_pool_metrics_count_checkouts_waits_and_timeouts(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 1)
+    engine = database.build_engine(f"sqlite:///{tmp_path / 'pool.sqlite'}")
+
+    held = engine.connect()
+    released = threading.Timer(0.2, held.close)
+    released.start()
+    with engine.connect():  # waits for the held connection
+        stats = database.pool_stats(engine)
+    assert stats["checkouts"] == 2 and stats["connects"] == 1
+    assert stats["wait_max_ms"] >= 150
+    assert stats["size"] == 1 and stats["checked_out"] == 1
+
+    held = engine.connect()
+    engine.pool._timeout = 0.05
+    with pytest.raises(PoolTimeout):
+        engine.connect()
+    held.close()
+    assert database.pool_stats(engine)["timeouts"] == 1
+    engine.dispose()
+
+
+def test_memory_sqlite_is_not_pooled():
+    engine = database.build_engine("sqlite://")
+    assert database.pool_stats(engine) == {"pool": type(engine.pool).__name__}
@@ -0,0 +1,115 @@
+"""
+Read routing with a primary and a lagging replica (two SQLite files):
+@read_only repository reads go to the replica, writes, the change feed
+and everything a user reads right after their own write stay on the primary.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import migrations
+from app.core.database import build_async_engine
+from app.core.db_routing import ReadRouter, RoutingSession, bind_user, replica_reads
+from app.models.complaint import Complaint
+from app.repositories.complaint_repository import complaint_repository, async_complaint_repository
+
+
+def descriptions(items):
+    return sorted(c.description for c in items)
+
+
+def test_reads_follow_replica_until_own_write(tmp_path):
+    primary_url, replica_url = (f"sqlite:///{tmp_path / name}" for name in ("primary.sqlite", "replica.sqlite"))
+    primary, replica = create_engine(primary_url), create_engine(replica_url)
+    for engine in (primary, replica):
+        migrations.upgrade(engine)
+        with Session(engine) as db:
+            complaint_repository.create(db, Complaint(description="replicated", area="Adyar"))
+
+    router = ReadRouter(primary, [replica], sticky_seconds=0.3)
+    sessions = sessionmaker(class_=RoutingSession, autoflush=False, bind=primary, info={"router": router})
+
+    with sessions() as db:
+        bind_user(db, 1)
+        assert descriptions(complaint_repository.list_page(db, 10)[0]) == ["replicated"]
+        # Writes go to the primary even inside a read-only block
+        with replica_reads(db):
+            fresh = complaint_repository.create(db, Complaint(
+                description="fresh", user_id=1, area="Adyar", category="Garbage"
+            ))
+        # ...and this session now reads its own write
+        assert descriptions(complaint_repository.list_page(db, 10)[0]) == ["fresh", "replicated"]
+
+    with Session(replica) as db:
+        assert db.query(Complaint).count() == 1  # the replica lags
+
+    with sessions() as db:
+        # Unmarked reads (lookups before a write) always use the primary
+        assert complaint_repository.get_by_id(db, fresh.id).description == "fresh"
+
+    with sessions() as db:
+        bind_user(db, 1)  # the writer's next request sticks to the primary
+        assert descriptions(complaint_repository.list_page(db, 10)[0]) == ["fresh", "replicated"]
+
+    with sessions() as db:
+        bind_user(db, 2)  # everyone else reads the replica
+        assert descriptions(complaint_repository.list_page(db, 10)[0]) == ["replicated"]
+        assert complaint_repository.get_historical_frequency(db, "Garbage", "Adyar") == 0
+
+    async def async_reads(expected):
+        async_primary, async_replica = build_async_engine(primary_url), build_async_engine(replica_url)
+        async_sessions = async_sessionmaker(
+            async_primary, sync_session_class=RoutingSession, expire_on_commit=False,
+            info={"router": router.with_engines(async_primary.sync_engine, [async_replica.sync_engine])},
+        )
+        async with async_sessions() as db:
+            bind_user(db, 1)
+            items, _ = await async_complaint_repository.list_page(db, 10)
+        await async_primary.dispose()
+        await async_replica.dispose()
+        assert descriptions(items) == expected
+
+    # Async sessions share the stickiness of the sync ones
+    asyncio.run(async_reads(["fresh", "replicated"]))
+    time.sleep(0.35)
+    asyncio.run(async_reads(["replicated"]))
+
+    with sessions() as db:
+        bind_user(db, 1)
+        assert descriptions(complaint_repository.list_page(db, 10)[0]) == ["replicated"]
+
+
+def test_without_replicas_everything_uses_primary(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.sqlite'}")
+    migrations.upgrade(primary)
+    sessions = sessionmaker(class_=RoutingSession, bind=primary, info={"router": ReadRouter(primary, [], 5)})
+    with sessions() as db:
+        complaint_repository.create(db, Complaint(description="only"))
+        assert descriptions(complaint_repository.list_page(db, 10)[0]) == ["only"]
+
+
+def test_change_feed_reads_the_primary(tmp_path):
+    primary, replica = (create_engine(f"sqlite:///{tmp_path / name}") for name in ("primary.sqlite", "replica.sqlite"))
+    for engine in (primary, replica):
+        migrations.upgrade(engine)
+    with Session(primary) as db:
+        kept, gone = Complaint(description="kept", area="Adyar"), Complaint(description="gone", area="Adyar")
+        db.add_all([kept, gone])
+        db.commit()
+        complaint_repository.remove(db, gone.id)
+    # The replica has not caught up with either complaint (or the deletion)
+
+    router = ReadRouter(primary, [replica], sticky_seconds=0)
+    sessions = sessionmaker(class_=RoutingSession, bind=primary, info={"router": router})
+    with sessions() as db:
+        # Even inside a replica block, the watermark is never advanced past rows the replica lacks
+        with replica_reads(db):
+            items, deleted, _, _ = complaint_repository.list_changes(db, 10, None, datetime.utcnow())
+            assert complaint_repository.list_page(db, 10)[0] == []  # other reads still use the replica
+        assert [c.description for c in items] == ["kept"]
+        assert deleted == [gone.id]
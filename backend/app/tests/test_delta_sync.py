@@ -0,0 +1,117 @@
+"""
+Delta sync: replaying /complaints/changes from any watermark must leave a
+client with exactly the complaints on the server, whatever the page size,
+including complaints re-routed out of (or back into) its area.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app import migrations
+from app.models.user import User
+from app.models.complaint import Complaint
+from app.repositories.complaint_repository import complaint_repository
+
+
+def sync(db, mirror, watermark, limit, **scope):
+    """Poll until caught up, applying changes to mirror {id: status}."""
+    while True:
+        items, deleted, watermark, has_more = complaint_repository.list_changes(
+            db, limit, watermark, datetime.utcnow(), **scope
+        )
+        for id in deleted:
+            mirror.pop(id, None)
+        mirror.update({c.id: c.status for c in items})
+        if not has_more:
+            return watermark
+
+
+def server_state(db, **scope):
+    return {c.id: c.status for c in complaint_repository._scoped(db.query(Complaint), **scope)}
+
+
+def test_mirror_follows_creates_updates_and_deletes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.sqlite'}")
+    migrations.upgrade(engine)
+    rng = random.Random(4)
+
+    with Session(engine) as db:
+        scopes = [{}, {"area": "Adyar"}, {"user_id": 1}]
+        clients = [({}, None, limit, scope) for scope in scopes for limit in (1, 3, 100)]
+        for step in range(6):
+            for _ in range(15):
+                db.add(Complaint(description="x", user_id=rng.choice([1, 2]), area=rng.choice(["Adyar", "T Nagar"])))
+            db.commit()
+            existing = db.query(Complaint).all()
+            for c in rng.sample(existing, 5):
+                c.status = rng.choice(["IN_PROGRESS", "RESOLVED"])  # ORM update bumps updated_at
+            db.commit()
+            for c in rng.sample(existing, 4):
+                c.area = "T Nagar" if c.area == "Adyar" else "Adyar"
+            db.commit()
+            for c in rng.sample(existing, 3):
+                complaint_repository.remove(db, c.id)
+            clients = [
+                (mirror, sync(db, mirror, watermark, limit, **scope), limit, scope)
+                for mirror, watermark, limit, scope in clients
+            ]
+            for mirror, _, _, scope in clients:
+                assert mirror == server_state(db, **scope)
+
+
+def test_rerouted_complaint_leaves_old_area_feed(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'move.sqlite'}")
+    migrations.upgrade(engine)
+    with Session(engine) as db:
+        complaint = Complaint(description="x", user_id=1, area="Adyar")
+        db.add(complaint)
+        db.commit()
+        adyar = {}
+        watermark = sync(db, adyar, None, 50, area="Adyar")
+        assert list(adyar) == [complaint.id]
+
+        complaint.area = "T Nagar"
+        db.commit()
+        items, deleted, _, _ = complaint_repository.list_changes(db, 50, watermark, datetime.utcnow(), area="Adyar")
+        assert (items, deleted) == ([], [complaint.id])
+        items, deleted, _, _ = complaint_repository.list_changes(db, 50, None, datetime.utcnow(), area="T Nagar")
+        assert ([c.id for c in items], deleted) == ([complaint.id], [])
+        # Unscoped and per-user feeds still see it as an update, not a deletion
+        _, deleted, _, _ = complaint_repository.list_changes(db, 50, watermark, datetime.utcnow(), user_id=1)
+        assert deleted == []
+
+
+def test_watermark_scan_uses_updated_at_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plan.sqlite'}")
+    migrations.upgrade(engine)
+    with Session(engine) as db:
+        watermark = (datetime(2026, 1, 1), 5)
+        query = complaint_repository._scoped(db.query(Complaint.id), None, None).filter(
+            (Complaint.updated_at > watermark[0]) |
+            ((Complaint.updated_at == watermark[0]) & (Complaint.id > watermark[1]))
+        ).order_by(Complaint.updated_at, Complaint.id).limit(50)
+        sql = query.statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+        plan = " | ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+        assert "ix_complaints_updated_at_id" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+
+
+def test_late_commits_inside_settle_window_are_resent(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'late.sqlite'}")
+    migrations.upgrade(engine)
+    with Session(engine) as db:
+        now = datetime.utcnow()
+        db.add(Complaint(description="x", user_id=1))
+        db.commit()
+        _, _, watermark, _ = complaint_repository.list_changes(db, 50, None, now - timedelta(seconds=60))
+        # A writer that stamped updated_at before our poll but committed after it
+        late = Complaint(description="late", user_id=1)
+        db.add(late)
+        db.commit()
+        late.updated_at = now - timedelta(seconds=30)
+        db.commit()
+        items, _, _, _ = complaint_repository.list_changes(db, 50, watermark, now)
+        assert late.id in {c.id for c in items}
@@ -0,0 +1,95 @@
+"""
+Density counters must stay equal to a rebuild from the complaints table,
+whatever path the complaint writes take.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.core.geo import location_columns, haversine
+from app.models.user import User
+from app.models.complaint import Complaint
+from app.models.complaint_density import ComplaintDensityCell
+from app.migrations import add_density_counters
+from app.repositories.complaint_repository import complaint_repository
+from app.repositories.density_repository import density_repository, DENSITY_CELL_DEG
+
+
+def counters(db):
+    return sorted(
+        (c.cell_y, c.cell_x, c.category, c.day, c.total_count, c.open_count)
+        for c in db.query(ComplaintDensityCell).all()
+        if c.total_count or c.open_count
+    )
+
+
+def new_complaint(rng, days_ago=0, category=None):
+    lat, lon = rng.uniform(13.0, 13.06), rng.uniform(80.2, 80.26)
+    location = f"{lat},{lon} | Chennai"
+    return Complaint(
+        description="x", location=location, category=category,
+        created_at=datetime.utcnow() - timedelta(days=days_ago), **location_columns(location)
+    )
+
+
+def test_counters_follow_every_write_path(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'density.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(3)
+    categories = [None, "Road Maintenance", "Water Supply"]
+
+    with Session(engine) as db:
+        created = [
+            complaint_repository.create(db, new_complaint(rng, rng.randint(0, 40), rng.choice(categories)))
+            for _ in range(60)
+        ]
+        # Background AI pipeline style: mutate and commit directly
+        created[0].category = "Stray Dogs"
+        created[1].status = "RESOLVED"
+        db.commit()
+        # Admin style: on an expired (post-commit) instance
+        created[2].status = "resolved"
+        db.commit()
+        complaint_repository.update(db, created[3], {"location": "13.059,80.259 | Moved"})
+        complaint_repository.remove(db, created[4].id)
+        live = counters(db)
+
+    with Session(engine) as db:
+        density_repository.rebuild(db)
+        assert counters(db) == live
+
+
+def test_radius_window_and_category_counts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'density.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(8)
+
+    with Session(engine) as db:
+        for i in range(120):
+            db.add(new_complaint(rng, days_ago=i % 45, category="Water Supply" if i % 3 == 0 else "Traffic"))
+        db.commit()
+        assert add_density_counters.upgrade(engine) == 0  # already maintained on insert
+        complaints = db.query(Complaint).all()
+
+        def expected(lat, lon, radius, since_days=None, category=None):
+            cutoff = (datetime.utcnow() - timedelta(days=since_days - 1)).date() if since_days else None
+            total = 0
+            for c in complaints:
+                cy, cx = density_repository.cell(c.lat, c.lon)
+                center = ((cy + 0.5) * DENSITY_CELL_DEG, (cx + 0.5) * DENSITY_CELL_DEG)
+                if haversine(lat, lon, *center) > radius: continue
+                if cutoff and c.created_at.date() < cutoff: continue
+                if category and c.category != category: continue
+                total += 1
+            return total
+
+        for lat, lon in [(13.03, 80.23), (13.0, 80.2), (13.05, 80.25)]:
+            for radius in (0.5, 2.0):
+                assert density_repository.count_within(db, lat, lon, radius) == expected(lat, lon, radius)
+                assert complaint_repository.get_nearby_complaints(db, lat, lon, radius, since_days=7) == expected(lat, lon, radius, 7)
+                assert density_repository.count_within(db, lat, lon, radius, category="Water Supply", since_days=30) == \
+                    expected(lat, lon, radius, 30, "Water Supply")
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import BACKEND_DIR, data_path, settings
+from app.core.security import (
+    STREAM_TOKEN_SCOPE, RedactQueryTokens, _username_for_token, complaint_scope, create_access_token, create_stream_token,
+)
+from app.core.events import ComplaintEventHub, MemoryBackend, SQLiteBrokerBackend, backend_from_settings
+
+
+def complaint(id, user_id, area, status="SUBMITTED"):
+    return SimpleNamespace(id=id, user_id=user_id, area=area, status=status, priority="HIGH", category="Traffic")
+
+
+async def drain(sub, timeout=0.05):
+    events = []
+    while (event := await sub.next(timeout)) is not None:
+        events.append(event)
+    return events
+
+
+def test_events_are_scoped_by_role():
+    async def scenario():
+        hub = ComplaintEventHub(MemoryBackend())
+        hub.start()
+        admin = hub.subscribe("admin", 1, None)
+        zone = hub.subscribe("area_admin", 2, "Adyar")
+        citizen = hub.subscribe("citizen", 7, None)
+
+        def publish():  # services publish from worker threads
+            hub.publish("created", complaint(10, 7, "Adyar"))
+            hub.publish("status_changed", complaint(11, 8, "Adyar", "RESOLVED"))
+            hub.publish("assigned", complaint(12, 7, "T Nagar"), assigned_to=3)
+
+        thread = threading.Thread(target=publish)
+        thread.start()
+        thread.join()
+
+        assert [e["complaint_id"] for e in await drain(admin)] == [10, 11, 12]
+        assert [e["complaint_id"] for e in await drain(zone)] == [10, 11]
+        citizen_events = await drain(citizen)
+        assert [(e["type"], e["complaint_id"]) for e in citizen_events] == [("created", 10), ("assigned", 12)]
+        assert citizen_events[1]["assigned_to"] == 3
+
+        hub.unsubscribe(admin)
+        hub.publish("created", complaint(13, 7, "Adyar"))
+        assert await drain(admin) == []
+
+    asyncio.run(scenario())
+
+
+def test_area_admin_without_area_gets_no_stream():
+    async def scenario():
+        hub = ComplaintEventHub(MemoryBackend())
+        hub.start()
+        unassigned = SimpleNamespace(id=5, role="area_admin", area=None)
+        # The endpoint resolves the scope first and answers 403...
+        with pytest.raises(HTTPException) as error:
+            complaint_scope(unassigned)
+        assert error.value.status_code == 403
+        # ...and the hub itself never subscribes it to unrouted (area=None) events
+        with pytest.raises(ValueError):
+            hub.subscribe("area_admin", unassigned.id, None)
+        admin = hub.subscribe("admin", 1, None)
+        hub.publish("created", complaint(30, 7, None))
+        assert [e["complaint_id"] for e in await drain(admin)] == [30]
+        assert len(hub._subs) == 1
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_gets_resync():
+    async def scenario():
+        hub = ComplaintEventHub(MemoryBackend(), queue_size=3)
+        hub.start()
+        sub = hub.subscribe("admin", 1, None)
+        for i in range(10):
+            hub.publish("created", complaint(i, 1, "Adyar"))
+        await asyncio.sleep(0)  # let the loop run the queued offers
+        assert await sub.next(0.05) == {"type": "resync"}
+        assert await drain(sub) == []
+
+    asyncio.run(scenario())
+
+
+def test_sqlite_broker_fans_out_across_workers(tmp_path):
+    async def scenario():
+        path = str(tmp_path / "broker.sqlite")
+        # Two hubs sharing one broker file stand in for two uvicorn workers
+        worker_a = ComplaintEventHub(SQLiteBrokerBackend(path, poll_interval=0.01))
+        worker_b = ComplaintEventHub(SQLiteBrokerBackend(path, poll_interval=0.01))
+        worker_a.start()
+        worker_b.start()
+        try:
+            on_a = worker_a.subscribe("area_admin", 2, "Adyar")
+            on_b = worker_b.subscribe("citizen", 7, None)
+            worker_a.publish("ai_completed", complaint(20, 7, "Adyar"))
+            worker_b.publish("status_changed", complaint(21, 9, "Adyar"))
+            assert sorted(e["complaint_id"] for e in await drain(on_a, 0.5)) == [20, 21]
+            assert [e["complaint_id"] for e in await drain(on_b, 0.5)] == [20]
+        finally:
+            worker_a.close()
+            worker_b.close()
+
+    asyncio.run(scenario())
+
+
+def test_relative_broker_path_is_anchored_to_data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EVENTS_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "EVENTS_BROKER_PATH", "broker.sqlite")
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    backend = backend_from_settings()
+    try:
+        assert backend.path == str(tmp_path / "broker.sqlite")
+        assert (tmp_path / "broker.sqlite").exists()
+    finally:
+        backend.close()
+    # An empty DATA_DIR (as in .env.example) means the backend directory
+    monkeypatch.setenv("DATA_DIR", "")
+    assert data_path("broker.sqlite") == f"{BACKEND_DIR}/broker.sqlite"
+
+
+def test_stream_tokens_are_scoped_and_redacted_from_access_log():
+    user = SimpleNamespace(username="asha")
+    stream_token = create_stream_token(user)
+    account_token = create_access_token({"sub": "asha"})
+    assert _username_for_token(stream_token, STREAM_TOKEN_SCOPE) == "asha"
+    # Neither token stands in for the other
+    with pytest.raises(HTTPException):
+        _username_for_token(stream_token)
+    with pytest.raises(HTTPException):
+        _username_for_token(account_token, STREAM_TOKEN_SCOPE)
+
+    record = logging.LogRecord(
+        "uvicorn.access", logging.INFO, __file__, 0, '%s - "%s %s HTTP/%s" %d',
+        ("127.0.0.1:5000", "GET", f"/complaints/events?access_token={stream_token}&x=1", "1.1", 200), None,
+    )
+    assert RedactQueryTokens().filter(record)
+    assert stream_token not in record.getMessage()
+    assert "/complaints/events?access_token=[redacted]&x=1" in record.getMessage()
@@ -0,0 +1,74 @@
+"""
+Frequency counters must answer the same as counting complaints rows, and
+stay equal to a rebuild after inserts, reclassification and deletes.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.user import User
+from app.models.complaint import Complaint
+from app.models.complaint_frequency import ComplaintFrequencyCount
+from app.migrations import add_frequency_counters
+from app.repositories.complaint_repository import complaint_repository
+from app.repositories.frequency_repository import frequency_repository
+
+CATEGORIES = [None, "Road Maintenance", "Water Supply", "Garbage"]
+AREAS = [None, "Adyar", "T Nagar"]
+
+
+def counters(db):
+    return sorted(
+        (c.category, c.area, c.day, c.count)
+        for c in db.query(ComplaintFrequencyCount).all()
+        if c.count
+    )
+
+
+def expected(db, category, area, since_days=None):
+    query = db.query(Complaint).filter(Complaint.category == category, Complaint.area == area)
+    if since_days:
+        cutoff = datetime.combine(datetime.utcnow().date() - timedelta(days=since_days - 1), datetime.min.time())
+        query = query.filter(Complaint.created_at >= cutoff)
+    return query.count()
+
+
+def test_frequency_follows_inserts_and_reclassification(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'frequency.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(5)
+
+    with Session(engine) as db:
+        created = [
+            complaint_repository.create(db, Complaint(
+                description="x", category=rng.choice(CATEGORIES), area=rng.choice(AREAS),
+                created_at=datetime.utcnow() - timedelta(days=rng.randint(0, 60)),
+            ))
+            for _ in range(80)
+        ]
+        # AI pipeline style: reclassify and route, then commit directly
+        created[0].category, created[0].area = "Stray Dogs", "Adyar"
+        created[1].area = "Velachery"
+        db.commit()
+        complaint_repository.update(db, created[2], {"category": "Water Supply"})
+        complaint_repository.remove(db, created[3].id)
+
+        for category in CATEGORIES[1:] + ["Stray Dogs"]:
+            for area in AREAS[1:] + ["Velachery"]:
+                for since_days in (None, 7, 30):
+                    assert complaint_repository.get_historical_frequency(db, category, area, since_days) == \
+                        expected(db, category, area, since_days)
+        assert complaint_repository.get_historical_frequency(db, None, "Adyar") == 0
+
+        pairs = frequency_repository.counts(db, since_days=30)
+        assert pairs[("Water Supply", "Adyar")] == expected(db, "Water Supply", "Adyar", 30)
+        live = counters(db)
+
+    assert add_frequency_counters.upgrade(engine) == 0  # already maintained on insert
+    add_frequency_counters.upgrade(engine, rebuild=True)
+    with Session(engine) as db:
+        assert counters(db) == live
@@ -0,0 +1,50 @@
+"""
+Heatmap density layer must follow complaint writes made through the repository.
+"""
+
+import random
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.core.geo import location_columns
+from app.core.heatmap import priority_heatmap
+from app.models.user import User
+from app.models.complaint import Complaint
+from app.repositories.complaint_repository import complaint_repository
+from ai_agents.priority_grid import PriorityGrid
+
+
+def density_matches_table(db, grid, rng):
+    for _ in range(30):
+        row, col = rng.randrange(grid.rows), rng.randrange(grid.cols)
+        lat, lon = float(grid.center_lats[row]), float(grid.center_lons[col])
+        assert grid.density_at(lat, lon) == len(complaint_repository.list_nearby_complaints(db, lat, lon, 2.0))
+
+
+def test_density_follows_repository_writes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'heatmap.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    grid_path = str(tmp_path / "grid.npz")
+    PriorityGrid((13.0, 80.2, 13.1, 80.3), cell_m=400).save(grid_path)
+
+    rng = random.Random(12)
+    try:
+        with Session(engine) as db:
+            def add(lat, lon):
+                location = f"{lat},{lon} | Chennai"
+                return complaint_repository.create(db, Complaint(description="x", location=location, **location_columns(location)))
+
+            for _ in range(40):
+                add(rng.uniform(13.01, 13.09), rng.uniform(80.21, 80.29))
+            assert priority_heatmap.load(grid_path, lambda: complaint_repository.complaint_points(db))
+            grid = priority_heatmap.grid
+            density_matches_table(db, grid, rng)
+
+            added = [add(rng.uniform(13.01, 13.09), rng.uniform(80.21, 80.29)) for _ in range(10)]
+            complaint_repository.update(db, added[0], {"location": "13.095,80.295 | Moved"})
+            complaint_repository.remove(db, added[1].id)
+            density_matches_table(db, grid, rng)
+    finally:
+        priority_heatmap.grid = None
@@ -0,0 +1,88 @@
+"""
+Summary list rows must page exactly like full ones and carry the same
+values for their columns; FastJSONResponse must round-trip through each
+content encoding.
+"""
+
+import gzip
+import json
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import migrations
+from app.core import json_response
+from app.core.json_response import FastJSONResponse, pick_encoding
+from app.models.user import User
+from app.models.complaint import Complaint
+from app.repositories.complaint_repository import complaint_repository, summary_items, SUMMARY_DESCRIPTION_CHARS
+
+
+def test_summary_pages_match_full_pages(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'summary.sqlite'}")
+    migrations.upgrade(engine)
+    rng = random.Random(6)
+    with Session(engine) as db:
+        reporter = User(username="asha", email="asha@x")
+        db.add(reporter)
+        db.commit()
+        db.add_all([
+            Complaint(
+                description="d" * rng.randint(1, 400), area=rng.choice(["Adyar", "T Nagar"]),
+                user_id=rng.choice([reporter.id, None]), ai_insight="long insight " * 50, status="SUBMITTED",
+                priority="HIGH", created_at=datetime(2026, 1, 1) + timedelta(minutes=rng.randint(0, 30)),
+            )
+            for _ in range(90)
+        ])
+        db.commit()
+
+        for scope in ({}, {"area": "Adyar"}, {"user_id": reporter.id}):
+            full_cursor = summary_cursor = None
+            while True:
+                items, full_cursor = complaint_repository.list_page(db, 13, full_cursor, **scope)
+                rows, summary_cursor = complaint_repository.list_summary_page(db, 13, summary_cursor, **scope)
+                assert full_cursor == summary_cursor
+                for item, row in zip(items, rows):
+                    assert (row.id, row.area, row.status, row.created_at) == \
+                        (item.id, item.area, item.status, item.created_at)
+                    assert row.description == item.description[:SUMMARY_DESCRIPTION_CHARS]
+                    assert row.reporter_username == (item.reporter_user.username if item.reporter_user else None)
+                    assert "ai_insight" not in row._fields
+                assert len(items) == len(rows)
+                for item, summary in zip(items, summary_items(rows)):
+                    reporter = item.reporter_user
+                    assert summary["reporter_user"] == ({"id": reporter.id, "username": "asha"} if reporter else None)
+                if not full_cursor:
+                    break
+
+
+def test_fast_json_response_encodings(monkeypatch):
+    payload = [{"id": i, "created_at": datetime(2026, 1, 1, 9, 30, 0, 123456), "area": None} for i in range(200)]
+    expected = [{**item, "created_at": "2026-01-01T09:30:00.123456"} for item in payload]
+
+    plain = FastJSONResponse(payload)
+    assert "content-encoding" not in plain.headers
+    assert json.loads(plain.body) == expected
+
+    zipped = FastJSONResponse(payload, accept_encoding="gzip, deflate")
+    assert zipped.headers["content-encoding"] == "gzip" and zipped.headers["vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(zipped.body)) == expected
+    assert len(zipped.body) < len(plain.body) / 5
+
+    small = FastJSONResponse(payload[:1], accept_encoding="gzip")
+    assert "content-encoding" not in small.headers
+
+    assert pick_encoding("gzip;q=0, identity") is None
+    assert pick_encoding("GZIP") == "gzip"
+    if json_response.brotli is not None:
+        import brotli
+        compressed = FastJSONResponse(payload, accept_encoding="gzip, br")
+        assert compressed.headers["content-encoding"] == "br"
+        assert json.loads(brotli.decompress(compressed.body)) == expected
+    monkeypatch.setattr(json_response, "brotli", None)
+    assert pick_encoding("br, gzip") == "gzip"
+
+    monkeypatch.setattr(json_response, "orjson", None)  # stdlib fallback renders the same JSON
+    assert json.loads(FastJSONResponse(payload).body) == expected
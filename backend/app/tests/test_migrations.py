@@ -0,0 +1,76 @@
+"""
+Versioned migrations run once per database, and the hot complaint queries
+are planned on the composite indexes they add.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, inspect, text
+from sqlalchemy.orm import Session, joinedload
+
+from app import migrations
+from app.models.user import User
+from app.models.complaint import Complaint, QUERY_INDEXES
+from app.migrations import add_complaint_indexes
+
+
+def query_plan(engine, query) -> str:
+    sql = query.statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        return " | ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+
+def test_upgrade_is_versioned_and_repeatable(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.sqlite'}")
+    applied = migrations.upgrade(engine)
+    assert applied == [module.__name__.rsplit(".", 1)[-1] for _, module in migrations.MIGRATIONS]
+    assert migrations.applied_versions(engine) == [version for version, _ in migrations.MIGRATIONS]
+    assert migrations.upgrade(engine) == []
+    assert {"users", "complaints", "complaint_density_cells", "complaint_frequency_counts"} <= \
+        set(inspect(engine).get_table_names())
+
+
+def test_indexes_added_to_existing_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.sqlite'}")
+    migrations.upgrade(engine)
+    with engine.begin() as conn:
+        for name in QUERY_INDEXES:
+            conn.execute(text(f"DROP INDEX {name}"))
+    assert add_complaint_indexes.upgrade(engine) == len(QUERY_INDEXES)
+    assert add_complaint_indexes.upgrade(engine) == 0
+    names = {index["name"] for index in inspect(engine).get_indexes("complaints")}
+    assert set(QUERY_INDEXES) <= names
+
+
+def test_hot_queries_use_composite_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.sqlite'}")
+    migrations.upgrade(engine)
+    with Session(engine) as db:
+        now = datetime.utcnow()
+        db.add_all(
+            Complaint(
+                description="x", user_id=i % 7, area=("Adyar", "T Nagar")[i % 2],
+                category=("Water Supply", "Garbage")[i % 2], status="SUBMITTED",
+                priority="HIGH", created_at=now - timedelta(hours=i),
+            )
+            for i in range(50)
+        )
+        db.commit()
+        listing = db.query(Complaint).options(joinedload(Complaint.reporter_user))
+
+        plans = {
+            "ix_complaints_user_id_created_at":
+                listing.filter(Complaint.user_id == 3).order_by(Complaint.created_at.desc()).limit(10),
+            "ix_complaints_area_created_at":
+                listing.filter(Complaint.area == "Adyar").order_by(Complaint.created_at.desc()).limit(15),
+            "ix_complaints_created_at":
+                listing.order_by(Complaint.created_at.desc()).limit(20),
+            "ix_complaints_status_priority":
+                db.query(Complaint.status, Complaint.priority, func.count()).group_by(Complaint.status, Complaint.priority),
+            "ix_complaints_category_area":
+                db.query(func.count(Complaint.id)).filter(Complaint.category == "Garbage", Complaint.area == "Adyar"),
+        }
+        for index, query in plans.items():
+            plan = query_plan(engine, query)
+            assert index in plan, plan
+            assert "TEMP B-TREE FOR ORDER BY" not in plan, plan
@@ -0,0 +1,65 @@
+"""
+The priority preview must answer within its latency budget: a slow POI
+lookup yields a partial result scored from the inputs that are ready,
+and concurrent previews of the same pin share one lookup.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from app.core.heatmap import priority_heatmap
+from app.services.priority_preview_service import PriorityPreviewService
+
+
+class SlowFeatureAgent:
+    """Location lookup standing in for a slow Overpass fetch."""
+
+    def __init__(self, delay_s):
+        self.delay_s = delay_s
+        self.calls = 0
+
+    async def detect_location_type_from_gps_async(self, gps_coordinates):
+        self.calls += 1
+        await asyncio.sleep(self.delay_s)
+        return "Hospital Zone", "General Hospital", {
+            "hospital_dist": 0.2, "major_road_dist": 5.0, "nearby_hospital": "General Hospital", "nearby_road": None,
+        }
+
+
+def make_service(monkeypatch, budget_ms, delay_s):
+    monkeypatch.setattr(priority_heatmap, "grid", None)
+    service = PriorityPreviewService(budget_ms=budget_ms)
+    agent = SlowFeatureAgent(delay_s)
+
+    async def agent_system():
+        return SimpleNamespace(feature_agent=agent)
+
+    monkeypatch.setattr(service, "_agent_system", agent_system)
+    monkeypatch.setattr(service, "_density", lambda lat, lon: 3)
+    return service, agent
+
+
+def test_slow_lookup_returns_partial_within_budget(monkeypatch):
+    service, agent = make_service(monkeypatch, budget_ms=50, delay_s=0.5)
+
+    async def run():
+        started = time.perf_counter()
+        results = await asyncio.gather(*[service.preview(13.0827, 80.2707) for _ in range(5)])
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(run())
+    assert elapsed < 0.4
+    assert agent.calls == 1
+    for result in results:
+        assert result["partial"] is True
+        assert result["complaint_density"] == 3
+        assert result["location_type"] == "Residential"  # Location not ready: scored without it
+
+
+def test_lookup_within_budget_is_complete(monkeypatch):
+    service, agent = make_service(monkeypatch, budget_ms=1000, delay_s=0.01)
+    result = asyncio.run(service.preview(13.0827, 80.2707))
+    assert result["partial"] is False
+    assert result["location_type"] == "Hospital Zone"
+    assert result["nearby_hospital"] == "General Hospital"
@@ -0,0 +1,101 @@
+"""
+Batch re-prioritization must match single-complaint scoring and be safe to rerun.
+"""
+
+import random
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import Base
+from app.core.geo import location_columns
+from app.core.heatmap import priority_heatmap
+from app.models.user import User
+from app.models.complaint import Complaint
+from app.migrations import add_base_priority
+from app.repositories.complaint_repository import complaint_repository
+from app.repositories.density_repository import density_repository
+from app.services.reprioritization_service import reprioritization_service
+from ai_agents.priority_engine import priority_engine
+from ai_agents.priority_grid import PriorityGrid, GRID_TYPES
+
+
+def test_rescore_open_complaints(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'rescore.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    grid_path = str(tmp_path / "grid.npz")
+    grid = PriorityGrid((13.0, 80.2, 13.1, 80.3), cell_m=400)
+    grid.dists[GRID_TYPES.index("Hospital")] = 3.0
+    grid.dists[GRID_TYPES.index("Hospital"), :5, :5] = 0.2  # hospital near the south-west corner
+    grid.save(grid_path)
+
+    def add(db, lat, lon, category, description="x", status="SUBMITTED", priority="MEDIUM"):
+        location = f"{lat},{lon} | Chennai"
+        return complaint_repository.create(db, Complaint(
+            description=description, location=location, category=category, status=status,
+            priority=priority, **location_columns(location)
+        ))
+
+    try:
+        with Session(engine) as db:
+            assert priority_heatmap.load(grid_path, lambda: complaint_repository.complaint_points(db))
+            near = add(db, 13.001, 80.201, "Water Stagnation")
+            urgent = add(db, 13.08, 80.28, "Traffic", description="Urgent: accident risk at the junction", priority="LOW")
+            closed = add(db, 13.001, 80.201, "Water Stagnation", status="RESOLVED", priority="LOW")
+            outside = add(db, 12.5, 79.9, "Water Stagnation", priority="LOW")  # Not covered by the grid
+
+            assert reprioritization_service.rescore(db) == {"rescored": 2, "changed": 2, "skipped": 1}
+            db.expire_all()
+            expected = priority_engine.score("MEDIUM", "Hospital", hospital_dist=0.2, density=2, issue_type="Water Stagnation")
+            assert (near.priority, near.priority_score) == (expected[0], int(expected[2]))
+            assert near.priority == "CRITICAL" and urgent.priority == "MEDIUM"
+            assert (closed.priority, closed.base_priority) == ("LOW", None)
+            assert (outside.priority, outside.base_priority) == ("LOW", None)
+
+            # Reruns score from base_priority, so boosts never compound
+            assert reprioritization_service.rescore(db)["changed"] == 0
+            db.expire_all()
+            assert (near.base_priority, urgent.base_priority, urgent.priority) == ("MEDIUM", "LOW", "MEDIUM")
+    finally:
+        priority_heatmap.grid = None
+
+
+def test_rolling_window_densities_match_single_counts(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'window.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(settings, "DENSITY_WINDOW_DAYS", 30)
+    rng = random.Random(4)
+    with Session(engine) as db:
+        for _ in range(200):
+            location = f"{rng.uniform(13.0, 13.04)},{rng.uniform(80.2, 80.24)} | Chennai"
+            db.add(Complaint(description="x", location=location, **location_columns(location)))
+        db.commit()
+        lats = np.array([rng.uniform(13.0, 13.04) for _ in range(40)])
+        lons = np.array([rng.uniform(80.2, 80.24) for _ in range(40)])
+
+        queries = []
+        event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+        densities = reprioritization_service._densities(db, lats, lons)
+        assert len(queries) == 1
+        for lat, lon, density in zip(lats, lons, densities):
+            cell = density_repository.cell(lat, lon)
+            first = next((a, b) for a, b in zip(lats, lons) if density_repository.cell(a, b) == cell)
+            assert density == complaint_repository.get_nearby_complaints(db, *first, since_days=30)
+
+
+def test_base_priority_seed_keeps_updated_at(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    stamped = datetime(2025, 2, 2, 10)
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO complaints (id, description, priority, updated_at) VALUES (1, 'x', 'HIGH', :at)"),
+            {"at": stamped},
+        )
+    assert add_base_priority.upgrade(engine) == 1
+    with Session(engine) as db:
+        complaint = db.get(Complaint, 1)
+        assert (complaint.base_priority, complaint.updated_at) == ("HIGH", stamped)
@@ -0,0 +1,48 @@
+import asyncio
+
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_computation():
+    async def scenario():
+        flights = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+
+        results = await asyncio.gather(*(flights.do("pin", compute) for _ in range(20)))
+        assert results == ["done"] * 20
+        assert len(calls) == 1 and len(flights) == 0
+
+        # A finished flight is not cached
+        assert await flights.do("pin", compute) == "done"
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_timeout_leaves_shared_task_running():
+    async def scenario():
+        flights = SingleFlight()
+        progress = {}
+
+        async def compute():
+            progress["first"] = True
+            await asyncio.sleep(0.1)
+            progress["second"] = True
+            return progress
+
+        try:
+            await flights.do("pin", compute, timeout=0.02)
+            assert False, "expected timeout"
+        except asyncio.TimeoutError:
+            pass
+        assert progress == {"first": True}
+
+        # A caller with a bigger budget joins the same flight and sees it finish
+        assert await flights.do("pin", compute, timeout=1) == {"first": True, "second": True}
+
+    asyncio.run(scenario())
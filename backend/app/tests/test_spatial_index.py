@@ -0,0 +1,166 @@
+"""
+Spatial index tests: the grid index must agree with a brute-force scan.
+"""
+
+import random
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.geo import parse_location, haversine, geohash_encode
+from app import migrations
+from app.core.spatial_index import ComplaintSpatialIndex
+from app.core.database import Base
+from app.models.user import User
+from app.models.complaint import Complaint
+from app.migrations import add_complaint_coordinates, add_base_priority
+from app.repositories.complaint_repository import complaint_repository
+
+
+def brute_force(rows, lat, lon, radius_km):
+    hits = []
+    for complaint_id, location in rows:
+        coords = parse_location(location)
+        if coords and haversine(lat, lon, *coords) <= radius_km:
+            hits.append(complaint_id)
+    return sorted(hits)
+
+
+def make_rows(n=2000, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(1, n + 1):
+        lat = rng.uniform(12.85, 13.25)
+        lon = rng.uniform(80.10, 80.32)
+        rows.append((i, f"{lat},{lon} | Somewhere, Chennai"))
+    rows.append((n + 1, None))
+    rows.append((n + 2, "not a coordinate"))
+    return rows
+
+
+def test_parse_location_handles_address_suffix():
+    assert parse_location("13.08, 80.27 | Chennai Central") == (13.08, 80.27)
+    assert parse_location("Anna Nagar") is None
+    assert parse_location("") is None
+
+
+def index_rows(rows):
+    return [(complaint_id, *(parse_location(location) or (None, None))) for complaint_id, location in rows]
+
+
+def test_radius_queries_match_full_scan():
+    rows = make_rows()
+    index = ComplaintSpatialIndex()
+    index.build(index_rows(rows))
+
+    rng = random.Random(11)
+    for _ in range(50):
+        lat = rng.uniform(12.85, 13.25)
+        lon = rng.uniform(80.10, 80.32)
+        radius = rng.choice([0.2, 0.5, 2.0, 5.0])
+        expected = brute_force(rows, lat, lon, radius)
+        assert sorted(index.query_ids(lat, lon, radius)) == expected
+        assert index.count_within(lat, lon, radius) == len(expected)
+
+
+def test_upsert_moves_and_remove_drops_points():
+    index = ComplaintSpatialIndex()
+    index.build([(1, 13.0827, 80.2707)])
+    assert index.count_within(13.0827, 80.2707, 0.1) == 1
+
+    index.upsert(1, 12.9915, 80.2337)
+    assert index.count_within(13.0827, 80.2707, 0.1) == 0
+    assert index.query_ids(12.9915, 80.2337, 0.1) == [1]
+
+    index.remove(1)
+    assert len(index) == 0
+    assert index.max_id == 1
+
+
+def test_geohash_encode_known_value():
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+def test_backfill_and_sql_prefilter_match_full_scan(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.sqlite'}")
+    # Legacy schema: coordinates only exist inside the location string
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE complaints (id INTEGER PRIMARY KEY, user_id INTEGER, description TEXT NOT NULL, "
+            "location VARCHAR(255), area VARCHAR(100), image_url VARCHAR(255), audio_url VARCHAR(255), "
+            "category VARCHAR(50), status VARCHAR(50), priority VARCHAR(20), priority_score INTEGER, "
+            "suggested_sla VARCHAR(50), ai_insight TEXT, assigned_to INTEGER, created_at DATETIME, updated_at DATETIME)"
+        ))
+        rows = make_rows(n=300)
+        for complaint_id, location in rows:
+            conn.execute(
+                text("INSERT INTO complaints (id, description, location, updated_at) VALUES (:id, 'x', :loc, :at)"),
+                {"id": complaint_id, "loc": location, "at": "2025-02-02 10:00:00.000000"},
+            )
+    Base.metadata.create_all(bind=engine)
+
+    assert add_complaint_coordinates.upgrade(engine) == 300
+    assert add_complaint_coordinates.upgrade(engine) == 0
+    assert add_base_priority.upgrade(engine) == 0  # legacy rows have no priority to seed from
+
+    with Session(engine) as db:
+        c = db.get(Complaint, 1)
+        assert (c.lat, c.lon) == parse_location(c.location)
+        assert c.geohash == geohash_encode(c.lat, c.lon)
+        assert {u for u, in db.query(Complaint.updated_at)} == {datetime(2025, 2, 2, 10)}
+
+        for lat, lon, radius in [(13.0, 80.2, 2.0), (13.1, 80.25, 5.0), (12.9, 80.15, 0.5)]:
+            expected = brute_force(rows, lat, lon, radius)
+            nearby = complaint_repository.list_nearby_complaints(db, lat, lon, radius)
+            assert sorted(c.id for c in nearby) == expected
+
+
+def test_sync_applies_other_workers_moves_and_deletes(tmp_path, spatial_index):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.sqlite'}")
+    migrations.upgrade(engine)
+    with Session(engine) as db:
+        db.add_all([Complaint(description="x", lat=13.0 + i / 1000, lon=80.2) for i in range(5)])
+        db.commit()
+        complaint_repository.warm_spatial_index(db)
+
+    # Another worker moves, deletes and adds complaints behind this index's back
+    with Session(engine) as other:
+        moved, gone = other.get(Complaint, 1), other.get(Complaint, 2)
+        moved.lat, moved.lon = 12.9, 80.1
+        other.delete(gone)
+        other.add(Complaint(description="x", lat=12.9, lon=80.1))
+        other.commit()
+
+    with Session(engine) as db:
+        complaint_repository.sync_spatial_state(db)
+        expected = sorted(
+            id for id, lat, lon in db.query(Complaint.id, Complaint.lat, Complaint.lon)
+            if haversine(12.9, 80.1, lat, lon) <= 1.0
+        )
+        assert sorted(spatial_index.query_ids(12.9, 80.1, 1.0)) == expected == [1, 6]
+        assert len(spatial_index) == 5
+        # Already applied: a second sync changes nothing
+        complaint_repository.sync_spatial_state(db)
+        assert len(spatial_index) == 5
+
+
+def test_density_lookups_do_not_sync_and_jobs_sync_when_due(tmp_path, spatial_index, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'due.sqlite'}")
+    migrations.upgrade(engine)
+    with Session(engine) as db:
+        db.add_all([Complaint(description="x", lat=13.0, lon=80.2) for _ in range(3)])
+        db.commit()
+        complaint_repository.warm_spatial_index(db)
+    with Session(engine) as other:
+        other.add(Complaint(description="x", lat=13.0, lon=80.2))
+        other.commit()
+
+    with Session(engine) as db:
+        # Lookups read the index as it stands; no query per lookup
+        assert complaint_repository.get_nearby_complaints(db, 13.0, 80.2) == 3
+        assert complaint_repository.sync_spatial_state_if_due(db) is False  # Just warmed
+        monkeypatch.setattr(settings, "SPATIAL_SYNC_SECONDS", 0)
+        assert complaint_repository.sync_spatial_state_if_due(db) is True
+        assert complaint_repository.get_nearby_complaints(db, 13.0, 80.2) == 4
@@ -0,0 +1,119 @@
+"""
+Requests per worker on an async endpoint that queries through the sync
+session (blocks the event loop) against one using get_async_db and the
+async repositories. Both serve the chatbot-context style listing query.
+
+SQLite answers in-process, so each request also pays one simulated
+database round trip (--rtt-ms, a SQL function that sleeps on the
+driver's thread) the way a Postgres/MySQL server would.
+
+Concurrency stays within the pool: above it, the sync variant deadlocks
+(the blocked loop cannot run the teardowns that return connections).
+
+Run from backend/:
+    python -m benchmarks.async_endpoints [--rows 20000] [--requests 400] [--concurrency 20] [--rtt-ms 5]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import migrations
+from app.core.database import build_async_engine, build_engine
+from app.models.user import User
+from app.models.complaint import Complaint
+from app.repositories.complaint_repository import complaint_repository, async_complaint_repository
+
+AREAS = ["Adyar", "T Nagar", "Velachery", "Anna Nagar"]
+
+ROUND_TRIP = text("SELECT net_delay(:ms)")
+
+def _add_net_delay(dbapi_conn, connection_record):
+    dbapi_conn.create_function("net_delay", 1, lambda ms: time.sleep(ms / 1000) or 0)
+
+def make_app(url: str, rtt_ms: float) -> FastAPI:
+    engine = build_engine(url)
+    async_engine = build_async_engine(url)
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "connect", _add_net_delay)
+    sync_sessions = sessionmaker(bind=engine)
+    async_sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+    app = FastAPI()
+
+    def get_db():
+        db = sync_sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with async_sessions() as db:
+            yield db
+
+    @app.get("/sync/{area}")
+    async def sync_listing(area: str, db: Session = Depends(get_db)):
+        db.execute(ROUND_TRIP, {"ms": rtt_ms})
+        items, _ = complaint_repository.list_page(db, 15, area=area, status="SUBMITTED")
+        return len(items)
+
+    @app.get("/async/{area}")
+    async def async_listing(area: str, db: AsyncSession = Depends(get_async_db)):
+        await db.execute(ROUND_TRIP, {"ms": rtt_ms})
+        items, _ = await async_complaint_repository.list_page(db, 15, area=area, status="SUBMITTED")
+        return len(items)
+
+    return app
+
+async def load(app: FastAPI, path: str, requests: int, concurrency: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        queue = list(range(requests))
+
+        async def worker():
+            while queue:
+                n = queue.pop()
+                (await client.get(f"/{path}/{AREAS[n % len(AREAS)]}")).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rtt-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{tmp}/bench.sqlite"
+        engine = build_engine(url)
+        migrations.upgrade(engine)
+        with Session(engine) as db:
+            # Mostly resolved complaints, so the SUBMITTED filter has to walk the area index
+            db.bulk_insert_mappings(Complaint, [
+                dict(description="bench", area=AREAS[i % len(AREAS)], status="SUBMITTED" if i % 50 == 0 else "RESOLVED")
+                for i in range(args.rows)
+            ])
+            db.commit()
+        app = make_app(url, args.rtt_ms)
+        for path in ("sync", "async"):
+            rate = asyncio.run(load(app, path, args.requests, args.concurrency))
+            print(f"{path:6s} {rate:7.0f} req/s")
+
+if __name__ == "__main__":
+    main()
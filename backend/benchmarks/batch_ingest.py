@@ -0,0 +1,68 @@
+"""
+Complaint ingestion rate: the single-item path (ComplaintRepository.create,
+one commit + refresh per complaint) against bulk_create (one transaction
+per batch), on an engine from app.core.database.build_engine. Flush hooks
+(density / frequency counters) run in both.
+
+Run from backend/:
+    python -m benchmarks.batch_ingest [--rows 2000] [--batch 100] [--url sqlite:///...]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy.orm import sessionmaker
+
+from app import migrations
+from app.core.database import build_engine
+from app.core.geo import location_columns
+from app.models.complaint import Complaint
+from app.repositories.complaint_repository import complaint_repository
+
+def complaints(rng, n):
+    for i in range(n):
+        location = f"{13 + rng.random() / 5:.6f},{80.2 + rng.random() / 5:.6f} | Chennai"
+        yield Complaint(
+            description=f"bench {i}", location=location, **location_columns(location),
+            area=rng.choice(["Adyar", "T Nagar", "Velachery"]), category="Garbage",
+            status="SUBMITTED", priority="MEDIUM", priority_score=50,
+        )
+
+def single(Session, rng, rows, batch):
+    with Session() as db:
+        for complaint in complaints(rng, rows):
+            complaint_repository.create(db, complaint)
+
+def bulk(Session, rng, rows, batch):
+    items = list(complaints(rng, rows))
+    with Session() as db:
+        for start in range(0, rows, batch):
+            complaint_repository.bulk_create(db, items[start:start + batch])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--url", help="Database to write into (default: fresh SQLite files)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, run in (("single", single), ("bulk", bulk)):
+            engine = build_engine(args.url or f"sqlite:///{tmp}/{name}.sqlite")
+            migrations.upgrade(engine)
+            Session = sessionmaker(bind=engine)
+            start = time.perf_counter()
+            run(Session, random.Random(1), args.rows, args.batch)
+            elapsed = time.perf_counter() - start
+            print(f"{name:7s} {args.rows / elapsed:8.0f} rows/s  ({args.rows} rows, batch {args.batch})")
+            engine.dispose()
+
+if __name__ == "__main__":
+    main()
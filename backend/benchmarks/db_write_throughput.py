@@ -0,0 +1,74 @@
+"""
+Concurrent complaint-write throughput on SQLite: a default engine
+(rollback journal, default pool) against app.core.database.build_engine
+(WAL, synchronous=NORMAL, busy_timeout, tuned pool).
+
+Run from backend/:
+    python -m benchmarks.db_write_throughput [--threads 16] [--writes 200]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, build_engine, pool_stats
+from app.models.user import User
+from app.models.complaint import Complaint
+
+def run(engine, threads: int, writes: int):
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    errors = []
+
+    def worker(n):
+        for i in range(writes):
+            # One short transaction per write, like admin updates / AI writeback
+            db = Session()
+            try:
+                db.add(Complaint(description=f"bench {n}-{i}", area="Adyar", status="SUBMITTED"))
+                db.commit()
+            except OperationalError as e:
+                errors.append(e)
+                db.rollback()
+            finally:
+                db.close()
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    done = threads * writes - len(errors)
+    return done / elapsed, len(errors)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        default = create_engine(
+            f"sqlite:///{tmp}/default.sqlite", connect_args={"check_same_thread": False}
+        )
+        tuned = build_engine(f"sqlite:///{tmp}/tuned.sqlite")
+        for name, engine in (("default", default), ("tuned", tuned)):
+            rate, failed = run(engine, args.threads, args.writes)
+            print(f"{name:8s} {rate:8.0f} writes/s  ({failed} failed with 'database is locked')")
+            engine.dispose()
+        print("tuned pool:", pool_stats(tuned))
+
+if __name__ == "__main__":
+    main()
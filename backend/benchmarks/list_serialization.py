@@ -0,0 +1,97 @@
+"""
+GET /complaints list cost for a large page: full ORM objects (joined
+reporter) validated into ComplaintResponse and dumped by Pydantic, against
+the projected summary rows dumped with orjson by FastJSONResponse. Prints
+query and serialization time and the payload size raw / gzip / br.
+
+Run from backend/:
+    python -m benchmarks.list_serialization [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import gzip
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import sessionmaker
+
+from app import migrations
+from app.core.database import build_engine
+from app.core.json_response import FastJSONResponse, brotli
+from app.models.user import User
+from app.models.complaint import Complaint
+from app.repositories.complaint_repository import complaint_repository, summary_items
+from app.schemas.complaint import ComplaintResponse
+
+WORDS = "pothole garbage overflow near bus stop water leak street light broken drainage clogged since last week".split()
+
+def seed(Session, rows: int):
+    rng = random.Random(3)
+    with Session() as db:
+        users = [User(username=f"user{i}", email=f"user{i}@x") for i in range(200)]
+        db.add_all(users)
+        db.flush()
+        db.add_all([
+            Complaint(
+                description=" ".join(rng.choices(WORDS, k=rng.randint(40, 120))),
+                location=f"{13 + rng.random() / 5:.6f},{80.2 + rng.random() / 5:.6f} | Some Street, Chennai",
+                area=rng.choice(["Adyar", "T Nagar", "Velachery"]), category="Garbage", status="PENDING",
+                priority="HIGH", priority_score=rng.randint(0, 100), suggested_sla="48 hours",
+                ai_insight=" ".join(rng.choices(WORDS, k=150)), image_url="uploads/photo.jpg",
+                user_id=rng.choice(users).id, created_at=datetime(2026, 1, 1) + timedelta(minutes=i),
+            )
+            for i in range(rows)
+        ])
+        db.commit()
+
+def full(db, rows: int, adapter=TypeAdapter(List[ComplaintResponse])):
+    start = time.perf_counter()
+    items, _ = complaint_repository.list_page(db, rows)
+    queried = time.perf_counter()
+    body = adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+    return queried - start, time.perf_counter() - queried, body
+
+def summary(db, rows: int):
+    start = time.perf_counter()
+    items, _ = complaint_repository.list_summary_page(db, rows)
+    queried = time.perf_counter()
+    body = FastJSONResponse(summary_items(items)).body
+    return queried - start, time.perf_counter() - queried, body
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite:///{tmp}/list.sqlite")
+        migrations.upgrade(engine)
+        Session = sessionmaker(bind=engine)
+        seed(Session, args.rows)
+        for name, run in (("full", full), ("summary", summary)):
+            query_s = serialize_s = 0.0
+            for _ in range(args.repeat):
+                with Session() as db:
+                    q, s, body = run(db, args.rows)
+                query_s, serialize_s = query_s + q, serialize_s + s
+            sizes = f"{len(body) / 1024:7.0f} KiB raw {len(gzip.compress(body, 6)) / 1024:6.0f} KiB gzip"
+            if brotli is not None:
+                sizes += f" {len(brotli.compress(body, quality=5)) / 1024:6.0f} KiB br"
+            print(
+                f"{name:8s} query {1000 * query_s / args.repeat:7.1f} ms  "
+                f"serialize {1000 * serialize_s / args.repeat:7.1f} ms  {sizes}"
+            )
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -12,4 +12,47 @@ api.interceptors.request.use((config) => {
     return config;
 });
 
+// GET /complaints/ is keyset-paginated: one page per call; pass nextCursor back only when more is wanted
+export const fetchComplaintPage = async (params = {}, cursor = null) => {
+    const response = await api.get('/complaints/', {
+        params: { ...params, ...(cursor ? { cursor } : {}) },
+    });
+    return { items: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+};
+
+// Server push of complaint events (SSE). EventSource cannot send headers, so the query string
+// carries a short-lived stream-only token (POST /complaints/events/token), never the login token
+const EVENT_TYPES = ['created', 'ai_completed', 'status_changed', 'assigned', 'resync'];
+
+export const subscribeComplaintEvents = (onEvent) => {
+    let source = null;
+    let closed = false;
+    const connect = async () => {
+        try {
+            const { data } = await api.post('/complaints/events/token');
+            if (closed) return;
+            source = new EventSource(
+                `${api.defaults.baseURL}/complaints/events?access_token=${encodeURIComponent(data.access_token)}`
+            );
+            EVENT_TYPES.forEach(type =>
+                source.addEventListener(type, (e) => onEvent(JSON.parse(e.data)))
+            );
+            // The browser would retry with the same, by then expired, token: reconnect with a fresh one
+            source.onerror = () => {
+                source.close();
+                if (closed) return;
+                onEvent({ type: 'resync' }); // events may have been missed while disconnected
+                setTimeout(connect, 3000);
+            };
+        } catch (error) {
+            if (!closed) setTimeout(connect, 30000);
+        }
+    };
+    connect();
+    return () => {
+        closed = true;
+        if (source) source.close();
+    };
+};
+
 export default api;
@@ -1,5 +1,5 @@
-import { useEffect, useState } from 'react';
-import api from '../api';
+import { useEffect, useRef, useState } from 'react';
+import api, { subscribeComplaintEvents } from '../api';
 import {
     Loader2, Filter, AlertCircle, CheckCircle2,
     Search, Download, ExternalLink, RefreshCw,
@@ -28,6 +28,10 @@ function AdminDashboard() {
     const { t } = useTranslation();
 
     const [adminArea, setAdminArea] = useState(null);
+    // Delta sync watermark: polls only fetch complaints changed since the last response
+    const watermark = useRef(null);
+    // Counters and chart totals come from the server-side rollups (GET /admin/stats)
+    const [dashboardStats, setDashboardStats] = useState(null);
 
     useEffect(() => {
         const token = localStorage.getItem('token');
@@ -40,20 +44,39 @@ function AdminDashboard() {
             }
         }
         fetchComplaints();
+        fetchStats();
 
-        // Auto-poll every 10 seconds to keep the dashboard live
+        // Pushed complaint events trigger a delta sync; the slow poll only covers a dropped stream
+        const unsubscribe = subscribeComplaintEvents(() => fetchComplaints(false));
         const pollInterval = setInterval(() => {
             fetchComplaints(false); // pass flag to hide loading spinner on poll
-        }, 10000);
+            fetchStats();
+        }, 60000);
 
-        return () => clearInterval(pollInterval);
+        return () => {
+            unsubscribe();
+            clearInterval(pollInterval);
+        };
     }, []);
 
     const fetchComplaints = async (showLoading = true) => {
         try {
             if (showLoading) setLoading(true);
-            const response = await api.get('/complaints/');
-            setComplaints(response.data);
+            let hasMore = true;
+            while (hasMore) {
+                const response = await api.get('/complaints/changes', {
+                    params: watermark.current ? { since: watermark.current } : {}
+                });
+                const { items, deleted, has_more } = response.data;
+                setComplaints(prev => {
+                    const byId = new Map(prev.map(c => [c.id, c]));
+                    deleted.forEach(id => byId.delete(id));
+                    items.forEach(c => byId.set(c.id, c));
+                    return [...byId.values()];
+                });
+                watermark.current = response.data.watermark;
+                hasMore = has_more;
+            }
         } catch (error) {
             showNotification(t('common.error'), 'error');
         } finally {
@@ -61,10 +84,22 @@ function AdminDashboard() {
         }
     };
 
+    const fetchStats = async () => {
+        try {
+            const response = await api.get('/admin/stats');
+            setDashboardStats(response.data);
+        } catch (error) {
+            // Keep the last numbers; counters fall back to the synced list until stats load
+        }
+    };
+
     const handleStatusUpdate = async (id, newStatus) => {
         try {
             await api.put(`/admin/complaints/${id}/status`, null, { params: { status: newStatus } });
             fetchComplaints();
+            // The server refreshes the rollups a moment after a status change; fetch again once they have landed
+            fetchStats();
+            setTimeout(fetchStats, 3000);
             if (selectedComplaint && selectedComplaint.id === id) {
                 setSelectedComplaint({ ...selectedComplaint, status: newStatus });
             }
@@ -100,19 +135,25 @@ function AdminDashboard() {
     const uniqueZones = [...new Set(complaints.map(c => c.area).filter(Boolean))];
 
     // Chart Data Preparation
-    const categoryData = complaints.reduce((acc, c) => {
-        const cat = c.category || 'General';
-        const existing = acc.find(item => item.name === cat);
-        if (existing) existing.value++;
-        else acc.push({ name: cat, value: 1 });
-        return acc;
-    }, []);
+    const categoryData = dashboardStats
+        ? dashboardStats.by_category.map(row => ({ name: row.category || 'General', value: row.total }))
+        : complaints.reduce((acc, c) => {
+            const cat = c.category || 'General';
+            const existing = acc.find(item => item.name === cat);
+            if (existing) existing.value++;
+            else acc.push({ name: cat, value: 1 });
+            return acc;
+        }, []);
+
+    const countStatus = (status) => dashboardStats
+        ? dashboardStats.by_status[status] || 0
+        : complaints.filter(c => c.status === status).length;
 
     const statusStats = {
-        total: complaints.length,
-        submitted: complaints.filter(c => c.status === 'PENDING').length,
-        inProgress: complaints.filter(c => c.status === 'IN_PROGRESS').length,
-        resolved: complaints.filter(c => c.status === 'RESOLVED').length
+        total: dashboardStats ? dashboardStats.total : complaints.length,
+        submitted: countStatus('PENDING'),
+        inProgress: countStatus('IN_PROGRESS'),
+        resolved: countStatus('RESOLVED')
     };
 
     const COLORS = ['#5E7D32', '#92A64E', '#435929', '#717A44', '#76632B'];
@@ -141,6 +182,10 @@ function AdminDashboard() {
                     </div>
                     <p className="text-earth/50 font-medium ml-1">
                         {t('admin.dashboardSubtitle')} • {new Date().toLocaleDateString('en-GB')}
+                        {dashboardStats?.rollup_refreshed_at && (
+                            // Rollups are periodic, so say how fresh the counters are (UTC timestamp from the server)
+                            <> • {t('admin.countsAsOf')} {new Date(`${dashboardStats.rollup_refreshed_at}Z`).toLocaleTimeString('en-GB')}</>
+                        )}
                     </p>
                 </div>
 
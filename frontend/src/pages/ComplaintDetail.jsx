@@ -1,7 +1,7 @@
 import { useEffect, useState } from 'react';
 import { useParams, useNavigate, useLocation } from 'react-router-dom';
 import { useTranslation } from 'react-i18next';
-import api from '../api';
+import api, { subscribeComplaintEvents } from '../api';
 import {
     Loader2, ArrowLeft, CheckCircle2, MapPin,
     XCircle, AlertTriangle, Sparkles, Navigation,
@@ -41,12 +41,18 @@ function ComplaintDetail() {
 
         fetchComplaint(true);
 
-        // Auto-poll every 5 seconds if the complaint is still in SUBMITTED state
+        // Refetch when this complaint's events are pushed (AI done, status change, ...)
+        const unsubscribe = subscribeComplaintEvents((event) => {
+            if (event.type === 'resync' || String(event.complaint_id) === String(id)) fetchComplaint(false);
+        });
+
+        // Slow fallback poll while the complaint is still in SUBMITTED state
         pollInterval = setInterval(() => {
             fetchComplaint(false);
-        }, 5000);
+        }, 30000);
 
         return () => {
+            unsubscribe();
             if (pollInterval) clearInterval(pollInterval);
         };
     }, [id, navigate]);
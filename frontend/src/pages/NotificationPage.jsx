@@ -1,32 +1,44 @@
 import { useEffect, useState } from 'react';
-import api from '../api';
+import { fetchComplaintPage } from '../api';
 import { Bell, Info, CheckCircle2, AlertCircle } from 'lucide-react';
 import { useTranslation } from 'react-i18next';
 
 function NotificationPage() {
     const [notifications, setNotifications] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const { t } = useTranslation();
 
-    useEffect(() => {
-        const fetchNotifications = async () => {
-            try {
-                const response = await api.get('/complaints/');
-                const notifs = response.data.map(c => ({
-                    id: c.id,
-                    message: `Update: Complaint #${c.id} status is ${c.status}`,
-                    time: c.updated_at,
-                    category: c.category,
-                    status: c.status
-                })).sort((a, b) => new Date(b.time) - new Date(a.time));
+    // One page at a time: the user's whole history is only fetched if they keep asking for more
+    const fetchNotifications = async (cursor = null) => {
+        try {
+            const page = await fetchComplaintPage({}, cursor);
+            const notifs = page.items.map(c => ({
+                id: c.id,
+                message: `Update: Complaint #${c.id} status is ${c.status}`,
+                time: c.updated_at,
+                category: c.category,
+                status: c.status
+            }));
+            setNotifications(prev =>
+                [...(cursor ? prev : []), ...notifs].sort((a, b) => new Date(b.time) - new Date(a.time))
+            );
+            setNextCursor(page.nextCursor);
+        } catch (error) {
+            console.error('Error fetching notifications');
+        }
+    };
 
-                setNotifications(notifs);
-            } catch (error) {
-                console.error('Error fetching notifications');
-            }
-        };
+    useEffect(() => {
         fetchNotifications();
     }, []);
 
+    const loadMore = async () => {
+        setLoadingMore(true);
+        await fetchNotifications(nextCursor);
+        setLoadingMore(false);
+    };
+
     const getStatusIcon = (status) => {
         switch (status) {
             case 'RESOLVED': return <CheckCircle2 className="text-primary" size={20} />;
@@ -65,6 +77,17 @@ function NotificationPage() {
                         </div>
                     </div>
                 ))}
+                {nextCursor && (
+                    <div className="flex justify-center pt-2">
+                        <button
+                            onClick={loadMore}
+                            disabled={loadingMore}
+                            className="px-6 py-2.5 rounded-xl text-xs font-bold uppercase tracking-widest bg-white border border-gray-100 text-gray-400 hover:text-primary shadow-soft transition-all disabled:opacity-50"
+                        >
+                            {loadingMore ? t('common.loading') : t('common.loadMore')}
+                        </button>
+                    </div>
+                )}
                 {notifications.length === 0 && (
                     <div className="py-20 text-center space-y-4 bg-gray-50 rounded-3xl border-2 border-dashed border-gray-100">
                         <div className="w-16 h-16 bg-white rounded-2xl flex items-center justify-center text-gray-200 mx-auto shadow-sm">
@@ -1,5 +1,5 @@
 import { useEffect, useState } from 'react';
-import api from '../api';
+import { fetchComplaintPage } from '../api';
 import {
     Loader2, Search, Filter, ChevronRight,
     Calendar, Tag, MoreHorizontal, LayoutGrid,
@@ -15,11 +15,19 @@ function Tracking() {
     const [activeFilter, setActiveFilter] = useState('ALL');
     const { t } = useTranslation();
 
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+
+    // First page only; the status filter is applied by the server so paging stays consistent
+    const statusParams = () => (activeFilter === 'ALL' ? {} : { status: activeFilter });
+
     useEffect(() => {
         const fetchComplaints = async () => {
+            setLoading(true);
             try {
-                const response = await api.get('/complaints/');
-                setComplaints(response.data);
+                const page = await fetchComplaintPage(statusParams());
+                setComplaints(page.items);
+                setNextCursor(page.nextCursor);
             } catch (error) {
                 console.error('Error fetching complaints:', error);
             } finally {
@@ -27,7 +35,20 @@ function Tracking() {
             }
         };
         fetchComplaints();
-    }, []);
+    }, [activeFilter]);
+
+    const loadMore = async () => {
+        setLoadingMore(true);
+        try {
+            const page = await fetchComplaintPage(statusParams(), nextCursor);
+            setComplaints(prev => [...prev, ...page.items]);
+            setNextCursor(page.nextCursor);
+        } catch (error) {
+            console.error('Error fetching complaints:', error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
 
     const filteredComplaints = complaints.filter(c => {
         const matchesSearch = c.description?.toLowerCase().includes(searchQuery.toLowerCase()) ||
@@ -163,6 +184,19 @@ function Tracking() {
                         </table>
                     </div>
 
+                    {nextCursor && (
+                        <div className="px-8 py-6 border-t border-earth/10 flex justify-center">
+                            <button
+                                onClick={loadMore}
+                                disabled={loadingMore}
+                                className="inline-flex items-center gap-2 px-6 py-2.5 rounded-xl text-xs font-bold uppercase tracking-widest bg-white border border-earth/10 text-earth/60 hover:bg-primary hover:text-white hover:border-primary transition-all shadow-sm disabled:opacity-50"
+                            >
+                                {loadingMore && <Loader2 className="animate-spin" size={14} />}
+                                {t('common.loadMore')}
+                            </button>
+                        </div>
+                    )}
+
                     <div className="bg-accent/30 px-8 py-4 border-t border-earth/10">
                         <p className="text-[0.65rem] text-earth/40 font-bold uppercase tracking-widest flex items-center gap-2">
                             <Clock size={12} /> {t('track.liveSync')}